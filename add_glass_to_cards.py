@@ -1,46 +1,12 @@
 #!/usr/bin/env python3
-"""Add glass morphism to feature cards"""
+"""Add glass morphism to feature cards
 
-import re
-from pathlib import Path
+The rules live in cravelle_tools/rules/add_glass_to_cards.py; this wrapper keeps
+`python add_glass_to_cards.py` working. Prefer one combined pass instead:
+python -m cravelle_tools run <rule sets...>
+"""
 
-service_files = [
-    "services/academy.html",
-    "services/diplomacy.html",
-    "services/translation.html",
-    "services/trade.html",
-    "services/prive.html",
-    "services/digital.html",
-    "services/voice.html",
-    "services/connect.html",
-    "services/edu-connect.html",
-]
+from cravelle_tools.cli import main
 
-for service_file in service_files:
-    file_path = Path(service_file)
-    
-    if not file_path.exists():
-        print(f"❌ File not found: {service_file}")
-        continue
-    
-    try:
-        content = file_path.read_text(encoding='utf-8')
-        original_content = content
-        
-        # Replace feature-card background with glass morphism
-        content = re.sub(
-            r'(\.feature-card\s*\{\s*)(background:\s*var\(--pearl\);)',
-            r'\1background: rgba(245, 245, 247, 0.6);\n      backdrop-filter: blur(10px);\n      -webkit-backdrop-filter: blur(10px);',
-            content
-        )
-        
-        if content != original_content:
-            file_path.write_text(content, encoding='utf-8')
-            print(f"✅ Fixed: {service_file}")
-        else:
-            print(f"ℹ️  No changes needed: {service_file}")
-            
-    except Exception as e:
-        print(f"❌ Error processing {service_file}: {e}")
-
-print("\n✅ All service pages processed!")
+if __name__ == '__main__':
+    main(['run', 'add_glass_to_cards'])
@@ -0,0 +1,17 @@
+"""Cravelle site toolchain: the page rewrite rules and build stages in one place"""
+
+from .engine import REGISTRY, Rule, RuleSet, compare, register, run, run_legacy, select
+from .pages import PageStore, discover_pages
+
+__all__ = [
+    'REGISTRY',
+    'PageStore',
+    'Rule',
+    'RuleSet',
+    'compare',
+    'discover_pages',
+    'register',
+    'run',
+    'run_legacy',
+    'select',
+]
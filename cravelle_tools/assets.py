@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Site-wide asset reference graph
+
+Every HTML page, CSS file and JS module in a site tree (the repository or a
+build output) is parsed for the files it references:
+
+- HTML: src/href/srcset/poster/action/data-* URL attributes and <meta>
+  content (og:image), url() and @import in <style> blocks and style
+  attributes, and the JS rules below for inline scripts;
+- CSS: url() and @import;
+- JS: static and dynamic imports, re-exports, and string literals that
+  look like asset paths ('images/news/news1.jpg').
+
+Edges point from a file to the site paths it references. Pages and the files
+the site serves at fixed or computed URLs (root files, lang/, .well-known/,
+public/) are the roots. Anything under images/ or src/ that no root reaches is
+unused. The graph is generous on purpose: a JS string is resolved against the
+module, the site root and services/, and counts if any of them exists. A
+false "used" costs bytes, while a false "unused" would break the site.
+"""
+
+import json
+import posixpath
+import re
+from collections import deque
+from pathlib import Path
+from urllib.parse import unquote
+
+from .build import site_file
+from .pages import INDEX_PAGE, SERVICES_DIR
+
+# Served at fixed or computed URLs (i18n.js builds lang/<lang>.json at runtime)
+ROOT_DIRS = ('lang', '.well-known', 'public')
+# Only these trees are ever reported unused or pruned
+PRUNABLE_DIRS = ('images', 'src')
+SKIPPED_DIRS = ('node_modules', 'dist', '.git', '.cravelle_cache', 'templates', 'vendor')
+
+# Siblings the precompress stage writes next to text assets
+PRECOMPRESSED_SUFFIXES = ('.gz', '.br')
+
+# Read by vite.config.js to leave unused images out of the static copy
+UNUSED_FILE = 'unused-assets.json'
+
+ASSET_SUFFIXES = (
+    'png', 'jpg', 'jpeg', 'webp', 'avif', 'gif', 'svg', 'ico', 'json', 'css', 'js', 'mjs',
+    'mp4', 'webm', 'woff', 'woff2', 'ttf', 'pdf',
+)
+
+_TAG = re.compile(r'<[a-zA-Z][-\w]*\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>')
+_URL_ATTRIBUTE = re.compile(
+    r'\s(src|href|srcset|poster|action|content|data-src|data-bg|data-lightbox-src)\s*=\s*(["\'])(.*?)\2',
+    re.IGNORECASE | re.DOTALL,
+)
+_STYLE_ATTRIBUTE = re.compile(r'\sstyle\s*=\s*(["\'])(.*?)\1', re.IGNORECASE | re.DOTALL)
+_STYLE_BLOCK = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.IGNORECASE | re.DOTALL)
+_SCRIPT_BLOCK = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_CSS_IMPORT = re.compile(r'@import\s+([\'"])([^\'"]+)\1')
+_JS_IMPORT = re.compile(
+    r'(?:\bimport\s*(?:[\w$*{}\s,]+?\s*from\s*)?|\bexport\s*[\w$*{}\s,]+?\s*from\s*|\bimport\s*\(\s*)([\'"])([^\'"\n]+)\1'
+)
+_PATH_LIKE = re.compile(rf'^[^\s]+\.(?:{"|".join(ASSET_SUFFIXES)}|html)(?:[?#]\S*)?$', re.IGNORECASE)
+_JS_ASSET = re.compile(rf'([\'"`])([^\'"`\s$]+\.(?:{"|".join(ASSET_SUFFIXES)}))(?:[?#][^\'"`\s]*)?\1', re.IGNORECASE)
+
+
+def css_urls(css):
+    return [m.group(2) for m in _CSS_URL.finditer(css)] + [m.group(2) for m in _CSS_IMPORT.finditer(css)]
+
+
+def js_imports(js):
+    return [m.group(2) for m in _JS_IMPORT.finditer(js)]
+
+
+def js_asset_strings(js):
+    return [m.group(2) for m in _JS_ASSET.finditer(js)]
+
+
+def html_urls(content):
+    """(url, kind) pairs in a page; kind 'page' resolves against the page, 'script' like a JS string"""
+    urls = []
+    for tag in _TAG.finditer(content):
+        for match in _URL_ATTRIBUTE.finditer(tag.group()):
+            name, value = match.group(1).lower(), match.group(3).strip()
+            if name == 'srcset':
+                urls += [(candidate.split()[0], 'page') for candidate in value.split(',') if candidate.strip()]
+            else:
+                urls.append((value, 'page'))
+        for match in _STYLE_ATTRIBUTE.finditer(tag.group()):
+            urls += [(url, 'page') for url in css_urls(match.group(2))]
+    for match in _STYLE_BLOCK.finditer(content):
+        urls += [(url, 'page') for url in css_urls(match.group(1))]
+    for match in _SCRIPT_BLOCK.finditer(content):
+        urls += [(url, 'page') for url in js_imports(match.group(1))]
+        urls += [(url, 'script') for url in js_asset_strings(match.group(1))]
+    return urls
+
+
+class AssetGraph:
+    """References between the files of one site tree, keyed by site path"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.files = {}
+        self.edges = {}
+        # (from, url) references that resolve to no file
+        self.broken = []
+
+    @classmethod
+    def scan(cls, root):
+        graph = cls(root)
+        for path in sorted(graph.root.rglob('*')):
+            site_path = path.relative_to(graph.root).as_posix()
+            if not path.is_file() or site_path.split('/')[0] in SKIPPED_DIRS:
+                continue
+            graph.files[site_path] = path
+        for site_path, path in graph.files.items():
+            suffix = path.suffix.lower()
+            if suffix in ('.html', '.css', '.js', '.mjs'):
+                graph.edges[site_path] = graph._references(site_path, suffix, path.read_text(encoding='utf-8'))
+        return graph
+
+    def _resolve(self, site_path, url):
+        url = unquote(url.strip())
+        if not url or url.startswith(('{', '$', 'javascript:', 'tel:')):
+            return None
+        path = site_file(self.root, site_path, url)
+        return path.relative_to(self.root).as_posix() if path is not None else None
+
+    def _references(self, site_path, suffix, text):
+        if suffix == '.html':
+            urls = html_urls(text)
+        elif suffix == '.css':
+            urls = [(url, 'page') for url in css_urls(text)]
+        else:
+            urls = [(url, 'page') for url in js_imports(text)] + [(url, 'script') for url in js_asset_strings(text)]
+        targets = set()
+        for url, kind in urls:
+            if url.startswith(('http:', 'https:', '//', 'data:', 'mailto:', '#')):
+                continue
+            # Scripts build URLs relative to whichever page loads them
+            bases = [site_path] + ([INDEX_PAGE, f'{SERVICES_DIR}/{INDEX_PAGE}'] if kind == 'script' else [])
+            resolved = next(filter(None, (self._resolve(base, url) for base in bases)), None)
+            if resolved is not None:
+                targets.add(resolved)
+            elif kind == 'page' and _PATH_LIKE.match(url):
+                self.broken.append((site_path, url))
+        targets.discard(site_path)
+        return targets
+
+    def roots(self):
+        return sorted(
+            site_path for site_path in self.files
+            if site_path.endswith('.html') or '/' not in site_path or site_path.split('/')[0] in ROOT_DIRS
+        )
+
+    def reachable(self):
+        seen = set(self.roots())
+        queue = deque(seen)
+        while queue:
+            for target in self.edges.get(queue.popleft(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+    def unused(self):
+        """Site paths under PRUNABLE_DIRS that no root reaches
+
+        A .gz/.br sibling (see precompress) is served in place of its file, so it
+        is used exactly when that file is.
+        """
+        reachable = self.reachable()
+
+        def used(site_path):
+            stem, suffix = posixpath.splitext(site_path)
+            if suffix in PRECOMPRESSED_SUFFIXES and stem in self.files:
+                return stem in reachable
+            return site_path in reachable
+
+        return sorted(
+            site_path for site_path in self.files
+            if site_path.split('/')[0] in PRUNABLE_DIRS and not used(site_path)
+        )
+
+    def referrers(self, target):
+        return sorted(source for source, targets in self.edges.items() if target in targets)
+
+
+def unused_report(graph):
+    """Log lines for the unused files and broken references; returns (lines, unused, bytes)"""
+    unused = graph.unused()
+    lines = []
+    total = 0
+    for site_path in unused:
+        size = graph.files[site_path].stat().st_size
+        total += size
+        lines.append(f'🗑️  {site_path} ({size:,} bytes)')
+    for source, url in sorted(set(graph.broken)):
+        lines.append(f'⚠️  {source}: {url} does not exist')
+    return lines, unused, total
+
+
+def write_excludes(root, unused, path=UNUSED_FILE):
+    """Write the unused paths for vite.config.js to leave out of its static copy"""
+    target = Path(root) / path
+    target.write_text(json.dumps(unused, indent=1) + '\n', encoding='utf-8')
+    return target
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Benchmark the rewrite toolchain on synthetic corpora of growing size
+
+For every corpus size this generates a site of cloned service pages (see
+corpus.py), then times each rule set on its own and the whole pipeline. Each
+case runs in a freshly spawned process on its own copy of the corpus, which
+keeps peak RSS per case and keeps one case's rewrites out of the next one's
+input. The copy is not timed.
+
+Results are written as JSON. `compare` lines a run up against an earlier
+one, case by case, so a regression between commits shows up as a ratio.
+"""
+
+import json
+import multiprocessing
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from . import engine
+from .corpus import generate_corpus
+from .pages import discover_pages
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is not reported
+    resource = None
+
+SIZES = (10, 100, 1000, 10000)
+PIPELINE = 'pipeline'
+FORMAT_VERSION = 1
+
+# A case this much slower than the baseline is reported as a regression
+REGRESSION_RATIO = 1.10
+
+
+def _peak_rss():
+    """Peak resident set size in bytes of this process and its finished children"""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _run_case(task):
+    """Worker: copy the corpus, time one rewrite over the copy, return the measurements"""
+    corpus, scratch, names, jobs = task
+    shutil.copytree(corpus, scratch)
+    plan = engine.build_plan(engine.select(names), discover_pages(scratch))
+    size = sum((Path(scratch) / path).stat().st_size for path in plan if (Path(scratch) / path).exists())
+    start = time.perf_counter()
+    report = engine.run(names, scratch, jobs=jobs)
+    wall_time = time.perf_counter() - start
+    shutil.rmtree(scratch)
+    return {
+        'pages': len(report.results) - report.count('missing'),
+        'changed': report.count('changed'),
+        'bytes': size,
+        'wall_time': wall_time,
+        'peak_rss': _peak_rss(),
+    }
+
+
+def measure(corpus, scratch, names, jobs=1, repeat=1):
+    """Best of `repeat` runs of one case, each in a fresh process"""
+    best = None
+    context = multiprocessing.get_context('spawn')
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(_run_case, (str(corpus), str(scratch), names, jobs)).result()
+        if best is None or result['wall_time'] < best['wall_time']:
+            best = result
+    wall_time = best['wall_time'] or 1e-9
+    best['pages_per_s'] = best['pages'] / wall_time
+    best['mb_per_s'] = best['bytes'] / wall_time / 1e6
+    return best
+
+
+def git_commit(root='.'):
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=SIZES, cases=None, root='.', jobs=1, repeat=1, workdir=None, log=print):
+    """Measure every case at every corpus size; returns the JSON-ready result document
+
+    cases are rule set names plus 'pipeline' (all rule sets in one run);
+    None means every registered rule set and the pipeline.
+    """
+    if cases is None:
+        cases = [rule_set.name for rule_set in engine.select()] + [PIPELINE]
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes:
+            corpus = Path(tmp) / f'corpus-{size}'
+            generate_corpus(corpus, size, root)
+            log(f'📦 {size:,} pages')
+            for case in cases:
+                names = None if case == PIPELINE else [case]
+                result = measure(corpus, Path(tmp) / 'scratch', names, jobs, repeat)
+                result.update(size=size, case=case)
+                results.append(result)
+                log(f'   {format_result(result)}')
+            shutil.rmtree(corpus)
+    return {
+        'format': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': git_commit(root),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'jobs': jobs,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def format_result(result):
+    rss = f'{result["peak_rss"] / 2**20:7.1f} MiB' if result['peak_rss'] is not None else '      n/a'
+    return (
+        f'{result["case"]:28} {result["wall_time"] * 1000:10.1f} ms '
+        f'{result["mb_per_s"]:8.2f} MB/s {result["pages_per_s"]:10.1f} pages/s  peak RSS {rss}'
+    )
+
+
+def compare(current, baseline):
+    """Lines comparing two result documents case by case; returns (lines, regressions)"""
+    previous = {(result['size'], result['case']): result for result in baseline['results']}
+    lines = []
+    regressions = 0
+    for result in current['results']:
+        before = previous.get((result['size'], result['case']))
+        if before is None or not before['wall_time']:
+            continue
+        ratio = result['wall_time'] / before['wall_time']
+        slower = ratio > REGRESSION_RATIO
+        regressions += slower
+        lines.append(
+            f'{"❌" if slower else "✅"} {result["size"]:>6,} {result["case"]:28} '
+            f'{before["wall_time"] * 1000:10.1f} → {result["wall_time"] * 1000:10.1f} ms ({ratio:.2f}x)'
+        )
+    return lines, regressions
+
+
+def save(document, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=1), encoding='utf-8')
+    return path
+
+
+def load(path):
+    return json.loads(Path(path).read_text(encoding='utf-8'))
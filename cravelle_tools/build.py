@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Build pipeline: copy the site into an output directory and run post-processing stages on it
+
+Stages never touch the committed sources. `prepare` empties the output
+directory left by an earlier build and copies the files the site serves into
+it (public/ is flattened into its root, as Vite does), then every selected
+stage rewrites the copy in registry order.
+"""
+
+import json
+import posixpath
+import shutil
+import time
+from pathlib import Path
+
+from .cache import CACHE_DIR, StageCache
+from .includes import Partials
+
+DIST_DIR = 'dist'
+ASSETS_DIR = 'assets'
+
+# What the site serves, relative to the repository root (vendor/ is read by the vendor_assets stage)
+SITE_FILES = (
+    'index.html', 'thank-you.html', 'robots.txt', '.well-known', 'services', 'src', 'images', 'lang', 'vendor',
+)
+PUBLIC_DIR = 'public'
+
+# Output directories earlier builds prepared; only these (or empty ones) are ever cleared
+OUTPUTS_FILE = 'build-outputs.json'
+
+# Netlify / Cloudflare Pages per-path response headers, served from the output root
+HEADERS_FILE = '_headers'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+STAGES = {}
+
+
+class Stage:
+    """One post-processing step over a built site"""
+
+    def __init__(self, name, description, apply):
+        self.name = name
+        self.description = description
+        self.apply = apply
+
+
+class StageReport:
+    """Log lines and a one-line summary from one stage"""
+
+    def __init__(self, name, lines=(), summary='', wall_time=0.0):
+        self.name = name
+        self.lines = list(lines)
+        self.summary = summary
+        self.wall_time = wall_time
+
+
+def stage(name, description):
+    """Register a stage function: fn(dist, cache) -> (lines, summary); registration order is build order
+
+    cache is the stage's StageCache; stages that do not cache anything ignore it.
+    """
+    def decorator(fn):
+        if name in STAGES:
+            raise ValueError(f'Duplicate stage: {name}')
+        STAGES[name] = Stage(name, description, fn)
+        return fn
+    return decorator
+
+
+def select_stages(names=None):
+    """Return the named stages in registry order (all of them when names is None)"""
+    from . import stages  # noqa: F401  (importing registers the built-in stages)
+
+    if names is None:
+        return list(STAGES.values())
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise KeyError(f'Unknown stage(s): {", ".join(unknown)}')
+    return [entry for entry in STAGES.values() if entry.name in names]
+
+
+def site_file(dist, page, href):
+    """Path in dist for a same-site href found on `page`, or None for third-party and missing files"""
+    if not href or href.startswith(('http:', 'https:', '//', 'data:', 'mailto:', '#')):
+        return None
+    href = href.split('?')[0].split('#')[0]
+    if href.startswith('/'):
+        site_path = href.lstrip('/')
+    else:
+        site_path = posixpath.normpath(posixpath.join(posixpath.dirname(page), href))
+    path = Path(dist) / site_path
+    return path if path.is_file() else None
+
+
+def add_headers(dist, path, headers):
+    """Append a `path` block with (name, value) headers to the output's _headers file
+
+    Paths that already have a block are left alone, so reruns do not duplicate them.
+    Returns True when a block was added.
+    """
+    target = Path(dist) / HEADERS_FILE
+    existing = target.read_text(encoding='utf-8') if target.exists() else ''
+    if any(line == path for line in existing.splitlines()):
+        return False
+    block = path + '\n' + ''.join(f'  {name}: {value}\n' for name, value in headers)
+    separator = '\n' if existing and not existing.endswith('\n') else ''
+    target.write_text(existing + separator + block, encoding='utf-8')
+    return True
+
+
+def clear_output(root, out):
+    """Empty an earlier build's output, so its precompressed siblings and old hashed files do not carry over
+
+    Refuses a non-empty directory no build prepared: --out may point anywhere.
+    """
+    record = root / CACHE_DIR / OUTPUTS_FILE
+    try:
+        outputs = json.loads(record.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        outputs = []
+    if out.is_dir() and any(out.iterdir()):
+        if str(out) not in outputs and out != root / DIST_DIR:
+            raise ValueError(f'{out} is not empty and no earlier build wrote it; remove it or choose another --out')
+        shutil.rmtree(out)
+    if str(out) not in outputs:
+        record.parent.mkdir(parents=True, exist_ok=True)
+        record.write_text(json.dumps(sorted(outputs + [str(out)]), indent=1) + '\n', encoding='utf-8')
+
+
+def remove_headers(dist, path):
+    """Drop the `path` block from the output's _headers file, e.g. for a file a stage replaced"""
+    target = Path(dist) / HEADERS_FILE
+    if not target.exists():
+        return False
+    kept = []
+    skipping = False
+    for line in target.read_text(encoding='utf-8').splitlines(keepends=True):
+        if not line[:1].isspace():
+            skipping = line.strip() == path
+        if not skipping:
+            kept.append(line)
+    text = ''.join(kept)
+    target.write_text(text, encoding='utf-8')
+    return True
+
+
+def prepare(root='.', out=DIST_DIR):
+    """Copy the served site files into a fresh out; return the output directory"""
+    root = Path(root).resolve()
+    out = Path(out).resolve()
+    if out == root or out in root.parents:
+        raise ValueError('The build output directory must not be the site root or contain it')
+    clear_output(root, out)
+    out.mkdir(parents=True, exist_ok=True)
+    for name in SITE_FILES:
+        source = root / name
+        if source.is_dir():
+            shutil.copytree(source, out / name, dirs_exist_ok=True)
+        elif source.exists():
+            shutil.copy2(source, out / name)
+    public = root / PUBLIC_DIR
+    if public.is_dir():
+        shutil.copytree(public, out, dirs_exist_ok=True)
+    # Pages get the current partials even when `include` was not rerun after an edit
+    Partials(root).update(site=out)
+    return out
+
+
+def run_stages(dist, names=None, root='.', cache=True):
+    """Run the selected stages over an already prepared output directory
+
+    Stage caches live under the site root's .cravelle_cache/; cache=False
+    keeps them in memory for this run only.
+    """
+    reports = []
+    for entry in select_stages(names):
+        start = time.perf_counter()
+        stage_cache = StageCache.load(root, entry.name) if cache else StageCache()
+        lines, summary = entry.apply(Path(dist), stage_cache)
+        stage_cache.save()
+        reports.append(StageReport(entry.name, lines, summary, time.perf_counter() - start))
+    return reports
+
+
+def build(root='.', out=DIST_DIR, names=None, cache=True):
+    """Copy the site into out and run the selected stages over the copy"""
+    return run_stages(prepare(root, out), names, root, cache)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Persistent manifest of pages the selected rules are known to leave unchanged
+
+An entry records that running a given rule list over content with a given
+hash changes nothing. A rerun first compares the file's size and mtime with
+the entry (one stat call, no read). If the stat data moved, it reads and
+hashes the file, and skips the rules when the hash still matches.
+
+The rule-list key hashes each rule's name and the source of the module that
+defines it, plus the shared modules rules build on and the engine and
+scheduler that run them, and the run mode (registry order, scheduled, or
+fixed point with its pass limit). Editing a rule module or the scheduler, or
+switching modes, therefore invalidates every entry that used it.
+"""
+
+import hashlib
+import inspect
+import json
+import shutil
+from pathlib import Path
+
+CACHE_DIR = '.cravelle_cache'
+MANIFEST_NAME = 'manifest.json'
+FORMAT_VERSION = 1
+
+# Modules whose behaviour every rule depends on
+SHARED_SOURCES = (
+    Path(__file__).with_name('css_index.py'),
+    Path(__file__).with_name('engine.py'),
+    Path(__file__).with_name('scheduler.py'),
+    Path(__file__).parent / 'rules' / 'common.py',
+)
+
+_source_hashes = {}
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _source_hash(path):
+    if path not in _source_hashes:
+        _source_hashes[path] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    return _source_hashes[path]
+
+
+def rules_key(rules, mode=''):
+    """Version hash for an ordered rule list run in a given mode, covering the rules' source code"""
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode())
+    digest.update(mode.encode())
+    for path in SHARED_SOURCES:
+        digest.update(_source_hash(path).encode())
+    for rule in rules:
+        digest.update(rule.name.encode())
+        digest.update(_source_hash(inspect.getsourcefile(rule.apply)).encode())
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Fixed-point entries per page: {path: {rules_key: {hash, size, mtime_ns}}}"""
+
+    def __init__(self, path, entries=None):
+        self.path = Path(path)
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, root='.'):
+        path = Path(root) / CACHE_DIR / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get('format') != FORMAT_VERSION:
+            return cls(path)
+        return cls(path, data.get('pages', {}))
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'format': FORMAT_VERSION, 'pages': self.entries}
+        self.path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding='utf-8')
+
+    def _entry(self, path, key):
+        return self.entries.get(path, {}).get(key)
+
+    def stat_fresh(self, path, key, file_path):
+        """True when the file's size and mtime still match a recorded fixed point"""
+        entry = self._entry(path, key)
+        if entry is None:
+            return False
+        try:
+            stat = Path(file_path).stat()
+        except OSError:
+            return False
+        return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+    def expected_hash(self, path, key):
+        """Content hash of the recorded fixed point, or None"""
+        entry = self._entry(path, key)
+        return entry['hash'] if entry is not None else None
+
+    def record(self, path, key, digest, file_path):
+        """Remember that the rules under `key` leave content with this hash unchanged"""
+        stat = Path(file_path).stat()
+        self.entries.setdefault(path, {})[key] = {
+            'hash': digest,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+
+
+class StageCache:
+    """Key -> value store for one build stage, saved as .cravelle_cache/stage-<name>.json
+
+    Stages key entries by the hashes of everything the value was computed
+    from, so stale entries are simply never looked up again. Without a path
+    the cache lives in memory only (build --no-cache).
+
+    Files a stage keeps between builds (encoded images, compressed siblings)
+    go in `files`, .cravelle_cache/stage-<name>/: the output directory is
+    emptied before every build, so nothing kept there survives.
+    """
+
+    def __init__(self, path=None, entries=None):
+        self.path = Path(path) if path is not None else None
+        self.entries = entries or {}
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, root, name):
+        path = Path(root) / CACHE_DIR / f'stage-{name}.json'
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return cls(path)
+        if data.get('format') != FORMAT_VERSION:
+            return cls(path)
+        return cls(path, data.get('entries', {}))
+
+    @property
+    def files(self):
+        """The stage's directory for files kept between builds, or None for an in-memory cache"""
+        return self.path.with_suffix('') if self.path is not None else None
+
+    def prune_files(self, keep):
+        """Delete what the files directory holds besides the names in keep; returns how many went"""
+        if self.files is None or not self.files.is_dir():
+            return 0
+        removed = 0
+        for entry in self.files.iterdir():
+            if entry.name in keep:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+            removed += 1
+        return removed
+
+    def get(self, key):
+        if key in self.entries:
+            self.hits += 1
+            self.used.add(key)
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.used.add(key)
+
+    def save(self):
+        """Write back only the entries this build used, which drops stale ones"""
+        if self.path is None or not (self.used or self.path.exists()):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        entries = {key: self.entries[key] for key in self.used}
+        data = {'format': FORMAT_VERSION, 'entries': entries}
+        self.path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding='utf-8')
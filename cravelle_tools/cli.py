@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Command line entry point: python -m cravelle_tools <command>"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from . import assets, bench, build, corpus, engine, generate, icons, includes, instrument, vendor, watch
+from .cache import CACHE_DIR
+from .pages import discover_pages
+from .scheduler import schedule_for
+
+
+def cmd_list(args):
+    for rule_set in engine.select():
+        print(f'{rule_set.name:24} {len(rule_set.rules):2} rules  {rule_set.description}')
+    return 0
+
+
+def cmd_run(args):
+    names = None if args.all else args.rule_sets
+    if not names and not args.all:
+        print('❌ Name one or more rule sets, or pass --all (see: python -m cravelle_tools list)')
+        return 2
+
+    if args.compare:
+        legacy, single, identical = engine.compare(names, args.root)
+        print(f'📊 Script-by-script: {legacy.summary()}')
+        print(f'📊 Single pass:      {single.summary()}')
+        print(f'{"✅" if identical else "❌"} Output identical: {identical}')
+        return 0 if identical else 1
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.profile and jobs > 1:
+        print('ℹ️  --profile runs serially so every rule executes in the profiled process')
+        jobs = 1
+    stats = bool(args.stats or args.top)
+
+    def rewrite():
+        return engine.run(
+            names, args.root, dry_run=args.dry_run, cache=not args.no_cache, jobs=jobs,
+            schedule=args.schedule, fixed_point=args.fixed_point, max_passes=args.max_passes, stats=stats,
+        )
+
+    if args.profile:
+        out = args.profile_out or Path(args.root) / CACHE_DIR / f'profile-{args.profile}.folded'
+        report = instrument.profile(rewrite, args.profile, out)
+    else:
+        report = rewrite()
+    for line in report.lines():
+        print(line)
+    print('=' * 70)
+    print(f'✨ {report.summary()}{" (dry run)" if args.dry_run else ""}')
+    if args.profile:
+        print(f'📊 Collapsed stacks written to {out}')
+    if args.stats:
+        print(f'📊 {len(report.stats)} rule applications written to {instrument.write_report(report.stats, args.stats)}')
+    if stats:
+        print_slowest(report.stats, args.top or 10)
+    return 0 if not report.count('unsettled') else 1
+
+
+def print_slowest(stats, top):
+    rows = instrument.summarize(stats)
+    print(f'📊 Slowest rules ({min(top, len(rows))} of {len(rows)}):')
+    for rule, calls, wall_time, matches, noops, delta in rows[:top]:
+        print(
+            f'   {wall_time * 1000:9.2f} ms  {rule:48} {calls:5} runs {matches:7} matches '
+            f'{noops:5} no-ops {delta:+9,} bytes'
+        )
+
+
+def cmd_watch(args):
+    watcher = watch.Watcher(
+        args.root, args.rule_sets or None, schedule=args.schedule, fixed_point=args.fixed_point,
+        max_passes=args.max_passes, debounce=args.debounce / 1000,
+    )
+    pages, rules, wall_time = watcher.warm_up()
+    print(f'🔧 {len(watcher.rule_sets)} rule sets warm: {rules} rule applications over {pages} pages '
+          f'in {wall_time * 1000:.1f} ms')
+    for path, growth in watcher.unsettled.items():
+        print(f'⚠️  {path}: the rules change their own output again ({growth:+,} bytes); '
+              f'saves of this page will not be rewritten until they settle')
+    print(f'ℹ️  Watching {", ".join(watch.WATCHED)} (Ctrl+C to stop)')
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print()
+    return 0
+
+
+def cmd_schedule(args):
+    names = args.rule_sets or None
+    plan = engine.build_plan(engine.select(names), discover_pages(args.root))
+    pages = {}
+    for path, rules in plan.items():
+        pages.setdefault(tuple(rules), []).append(path)
+    for rules, paths in pages.items():
+        schedule = schedule_for(list(rules))
+        print(f'📄 {paths[0]}' + (f' (+{len(paths) - 1} more)' if len(paths) > 1 else ''))
+        for rule in schedule.rules:
+            print(f'   {rule.kind:4} {rule.name}')
+        for rule in schedule.skipped:
+            print(f'   skip {rule.name} (overwritten later)')
+        print(f'   {len(schedule.rules)} rules, {len(schedule.skipped)} skipped, {schedule.switches} css/text switches')
+    return 0
+
+
+def cmd_build(args):
+    if args.list:
+        for entry in build.select_stages():
+            print(f'{entry.name:24} {entry.description}')
+        return 0
+    names = args.stages or None
+    try:
+        dist = Path(args.out) if args.no_copy else build.prepare(args.root, args.out)
+    except ValueError as error:
+        print(f'❌ {error}')
+        return 1
+    for report in build.run_stages(dist, names, args.root, cache=not args.no_cache):
+        print(f'🔧 {report.name}')
+        for line in report.lines:
+            print(f'   {line}')
+        print(f'   ✨ {report.summary} ({report.wall_time * 1000:.1f} ms)')
+    return 0
+
+
+def cmd_generate(args):
+    results, wall_time = generate.generate(args.root, args.services or None, check=args.check)
+    for page, status in results:
+        icon = {'written': '✅', 'unchanged': 'ℹ️ ', 'differs': '❌'}[status]
+        print(f'{icon} {page}: {status}')
+    differs = sum(status == 'differs' for _, status in results)
+    print(f'✨ {len(results)} service pages rendered in {wall_time * 1000:.1f} ms'
+          f'{f", {differs} out of date" if args.check else ""}')
+    return 1 if differs else 0
+
+
+def cmd_assets(args):
+    graph = assets.AssetGraph.scan(args.root)
+    lines, unused, total = assets.unused_report(graph)
+    for line in lines:
+        print(line)
+    print(f'✨ {len(unused)} of {len(graph.files)} files unreachable ({total:,} bytes), '
+          f'{len(set(graph.broken))} broken references')
+    if args.write_excludes:
+        target = assets.write_excludes(args.root, unused)
+        print(f'📦 {target}: {len(unused)} paths for vite.config.js to skip')
+    return 0
+
+
+def cmd_include(args):
+    start = time.perf_counter()
+    results = includes.Partials(args.root).update(args.pages or None, check=args.check)
+    for page, blocks, status in results:
+        icon = {'written': '✅', 'unchanged': 'ℹ️ ', 'differs': '❌'}[status]
+        print(f'{icon} {page}: {blocks} blocks, {status}')
+    differs = sum(status == 'differs' for _, _, status in results)
+    print(f'✨ {len(results)} pages resolved in {(time.perf_counter() - start) * 1000:.1f} ms'
+          f'{f", {differs} out of date" if args.check else ""}')
+    return 1 if differs else 0
+
+
+def cmd_vendor(args):
+    root = Path(args.root)
+    groups = discover_pages(root)
+    urls = {}
+    used_icons = set()
+    for page in groups['index'] + groups['services']:
+        content = (root / page).read_text(encoding='utf-8')
+        for _, _, url, kind in vendor.page_resources(content):
+            urls.setdefault(url, kind)
+            base = icons.icon_set(url)
+            if base is not None:
+                used_icons |= {(base, style, name) for _, style, name, _ in icons.markup_icons(content)}
+    scripts = [path.read_text(encoding='utf-8') for path in sorted((root / 'src').rglob('*.js'))]
+    bases = {base for base, _, _ in used_icons}
+    for js in scripts:
+        used_icons |= {(base, style, name) for base in bases for style, name in icons.script_icons(js)[0]}
+
+    def icon_urls():
+        # Aliases come from the Font Awesome stylesheet, so this reads the mirror as it is now
+        icon_sets = {base: icons.IconSet(root, base) for base in bases}
+        return {icon_sets[base].candidates(style, name)[0]: None for base, style, name in sorted(used_icons)}
+
+    if args.fetch:
+        lines, fetched, failed = vendor.fetch(root, urls.items())
+        more = vendor.fetch(root, icon_urls().items())
+        for line in lines + more[0]:
+            print(line)
+        fetched += more[1]
+        failed += more[2]
+        print(f'✨ {fetched} files downloaded into {vendor.VENDOR_DIR}/, {failed} failed')
+        return 1 if failed else 0
+    missing = 0
+    for url in urls:
+        path = f'{vendor.VENDOR_DIR}/{vendor.mirror_path(url)}'
+        present = (root / path).is_file()
+        missing += not present
+        print(f'{"✅" if present else "❌"} {url}\n   {path}')
+    svgs = icon_urls()
+    absent = sum(not (root / vendor.VENDOR_DIR / vendor.mirror_path(url)).is_file() for url in svgs)
+    if svgs:
+        print(f'{"❌" if absent else "✅"} {len(svgs)} Font Awesome icons in use, {absent} SVGs missing')
+    missing += absent
+    print(f'✨ {len(urls)} third-party stylesheets and scripts, {missing} files missing from {vendor.VENDOR_DIR}/'
+          f'{" (run: python -m cravelle_tools vendor --fetch)" if missing else ""}')
+    return 1 if missing else 0
+
+
+def cmd_corpus(args):
+    corpus.generate_corpus(args.dest, args.pages, args.root)
+    print(f'✅ Wrote {args.pages} synthetic service pages to {args.dest}')
+    return 0
+
+
+def cmd_bench(args):
+    jobs = args.jobs or os.cpu_count() or 1
+    document = bench.run_benchmarks(
+        args.sizes, args.cases or None, args.root, jobs=jobs, repeat=args.repeat, workdir=args.workdir,
+    )
+    out = args.out or Path(args.root) / CACHE_DIR / f'bench-{document["commit"] or "local"}.json'
+    print(f'📊 Results written to {bench.save(document, out)}')
+    if not args.baseline:
+        return 0
+    baseline = bench.load(args.baseline)
+    lines, regressions = bench.compare(document, baseline)
+    print(f'📊 Against {args.baseline} ({baseline.get("commit") or "unknown commit"}):')
+    if (baseline.get('jobs'), baseline.get('repeat')) != (document['jobs'], document['repeat']):
+        print(f'ℹ️  Baseline used -j {baseline.get("jobs")} --repeat {baseline.get("repeat")}; ratios are not like for like')
+    for line in lines:
+        print(f'   {line}')
+    print(f'{"❌" if regressions else "✅"} {regressions} cases more than '
+          f'{(bench.REGRESSION_RATIO - 1) * 100:.0f}% slower')
+    return 1 if regressions else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cravelle_tools', description=__doc__)
+    parser.add_argument('--root', default='.', help='site root (default: current directory)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help='list registered rule sets').set_defaults(func=cmd_list)
+
+    run = sub.add_parser('run', help='apply rule sets in a single read/write pass')
+    run.add_argument('rule_sets', nargs='*', help='rule set names, e.g. fix_hero_titles')
+    run.add_argument('--all', action='store_true', help='run every registered rule set')
+    run.add_argument('--dry-run', action='store_true', help='report changes without writing')
+    run.add_argument('-j', '--jobs', type=int, default=1,
+                     help='rewrite pages in N worker processes (0 = one per CPU)')
+    run.add_argument('--no-cache', action='store_true',
+                     help='ignore the manifest of pages already known to be unchanged')
+    run.add_argument('--compare', action='store_true',
+                     help='time the single pass against the old script-by-script flow on scratch copies')
+    run.add_argument('--schedule', action='store_true',
+                     help='skip overwritten rules and order the rest by their declared dependencies')
+    run.add_argument('--fixed-point', action='store_true',
+                     help='with --schedule, repeat the rules until each page stops changing')
+    run.add_argument('--max-passes', type=int, default=None,
+                     help='give up on a page after N fixed-point passes (default: 10)')
+    run.add_argument('--stats', metavar='FILE',
+                     help='write per-page, per-rule timings, matches and byte deltas (.json or .csv)')
+    run.add_argument('--top', type=int, metavar='N', help='print the N slowest rules (default with --stats: 10)')
+    run.add_argument('--profile', choices=('cpu', 'memory'),
+                     help='run under cProfile or tracemalloc and write collapsed stacks for flame graphs')
+    run.add_argument('--profile-out', metavar='FILE',
+                     help='collapsed-stack output (default: .cravelle_cache/profile-<mode>.folded)')
+    run.set_defaults(func=cmd_run)
+
+    live = sub.add_parser('watch', help='reapply the rules to each watched page as it is saved')
+    live.add_argument('rule_sets', nargs='*', help='rule set names (default: all)')
+    live.add_argument('--schedule', action='store_true', help='run the scheduled rule order (see run --schedule)')
+    live.add_argument('--fixed-point', action='store_true', help='repeat the rules until each page settles')
+    live.add_argument('--max-passes', type=int, default=None,
+                      help='give up on a page after N fixed-point passes (default: 10)')
+    live.add_argument('--debounce', type=float, default=watch.DEBOUNCE * 1000,
+                      help=f'quiet time in ms after the last save before rules run (default: {watch.DEBOUNCE * 1000:.0f})')
+    live.set_defaults(func=cmd_watch)
+
+    plan = sub.add_parser('schedule', help='show the scheduled rule order per page')
+    plan.add_argument('rule_sets', nargs='*', help='rule set names (default: all)')
+    plan.set_defaults(func=cmd_schedule)
+
+    dist = sub.add_parser('build', help='copy the site into an output directory and run build stages on it')
+    dist.add_argument('stages', nargs='*', help='stage names (default: all, in order)')
+    dist.add_argument('--out', default=build.DIST_DIR, help='output directory (default: dist)')
+    dist.add_argument('--no-copy', action='store_true',
+                      help='run the stages on the existing output directory, e.g. after vite build')
+    dist.add_argument('--no-cache', action='store_true', help='ignore and do not update the stage caches')
+    dist.add_argument('--list', action='store_true', help='list build stages')
+    dist.set_defaults(func=cmd_build)
+
+    pages = sub.add_parser('generate', help='render services/*.html from the shared layout and per-service data')
+    pages.add_argument('services', nargs='*', help=f'service slugs, e.g. connect (default: every {generate.DATA_DIR}/*.json)')
+    pages.add_argument('--check', action='store_true',
+                       help='report pages that differ from their rendering without writing them')
+    pages.set_defaults(func=cmd_generate)
+
+    parts = sub.add_parser('include', help='splice the shared partials into the pages at their @include directives')
+    parts.add_argument('pages', nargs='*', help='page paths (default: index.html and services/*.html)')
+    parts.add_argument('--check', action='store_true',
+                       help='report pages whose blocks differ from their partials without writing them')
+    parts.set_defaults(func=cmd_include)
+
+    refs = sub.add_parser('assets', help='list images and src/ files no page references, and broken references')
+    refs.add_argument('--write-excludes', action='store_true',
+                       help=f'write the unused paths to {assets.UNUSED_FILE} for vite.config.js')
+    refs.set_defaults(func=cmd_assets)
+
+    mirror = sub.add_parser('vendor', help=f'list the third-party CSS/JS the pages load and whether {vendor.VENDOR_DIR}/ has them')
+    mirror.add_argument('--fetch', action='store_true',
+                        help='download the missing files, the fonts and images their CSS uses, and the icon SVGs')
+    mirror.set_defaults(func=cmd_vendor)
+
+    gen = sub.add_parser('corpus', help='generate a synthetic site of cloned service pages')
+    gen.add_argument('dest', help='output directory')
+    gen.add_argument('--pages', type=int, default=1000, help='number of service pages (default: 1000)')
+    gen.set_defaults(func=cmd_corpus)
+
+    perf = sub.add_parser('bench', help='time the rule sets and the pipeline on synthetic corpora')
+    perf.add_argument('cases', nargs='*', help=f'rule set names and/or {bench.PIPELINE!r} (default: all)')
+    perf.add_argument('--sizes', type=int, nargs='+', default=list(bench.SIZES),
+                      help='corpus sizes in pages (default: 10 100 1000 10000)')
+    perf.add_argument('-j', '--jobs', type=int, default=1,
+                      help='worker processes per run (0 = one per CPU)')
+    perf.add_argument('--repeat', type=int, default=1, help='keep the best of N runs per case')
+    perf.add_argument('--out', help='results JSON (default: .cravelle_cache/bench-<commit>.json)')
+    perf.add_argument('--baseline', help='earlier results JSON to compare against')
+    perf.add_argument('--workdir', help='directory for the temporary corpora (default: system temp)')
+    perf.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
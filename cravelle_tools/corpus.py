@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Synthetic site corpus: many service pages cloned from the real ones"""
+
+import shutil
+from pathlib import Path
+
+from .pages import INDEX_PAGE, SERVICES_DIR
+
+
+def generate_corpus(dest, pages, source='.'):
+    """Write `pages` service pages under dest/services, cycling through the real ones
+
+    Each clone gets its own <title> and hero heading so pages differ, but the
+    markup and inline styles stay exactly as the rules see them on the site.
+    index.html and the stylesheets the rules touch are copied alongside.
+    """
+    source, dest = Path(source), Path(dest)
+    seeds = sorted((source / SERVICES_DIR).glob('*.html'))
+    if not seeds:
+        raise FileNotFoundError(f'No service pages under {source / SERVICES_DIR}')
+    texts = [seed.read_text(encoding='utf-8') for seed in seeds]
+
+    (dest / SERVICES_DIR).mkdir(parents=True, exist_ok=True)
+    width = len(str(pages))
+    for n in range(pages):
+        seed, text = seeds[n % len(seeds)], texts[n % len(seeds)]
+        name = f'{seed.stem}-{n:0{width}d}'
+        text = text.replace('<title>', f'<title>{name} | ', 1)
+        (dest / SERVICES_DIR / f'{name}.html').write_text(text, encoding='utf-8')
+
+    if (source / INDEX_PAGE).exists():
+        shutil.copy2(source / INDEX_PAGE, dest / INDEX_PAGE)
+    if (source / 'src' / 'css').is_dir():
+        shutil.copytree(source / 'src' / 'css', dest / 'src' / 'css', dirs_exist_ok=True)
+    return dest
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""Selector index over the inline <style> blocks of a page (or a whole .css file)
+
+The page is tokenized once into plain-text segments and CssRule objects.
+Lookups go through a selector -> rules dict and edits only touch the rule
+objects, so a chain of "replace rule", "append declaration" and "remove rule"
+edits costs one linear parse plus one join instead of a full-document regex
+scan per edit.
+"""
+
+import bisect
+import itertools
+import posixpath
+import re
+
+STYLE_OPEN = re.compile(r'<style\b[^>]*>', re.IGNORECASE)
+STYLE_CLOSE = '</style>'
+
+# At-rules whose block holds further rules rather than declarations
+GROUP_AT_RULES = ('@media', '@supports', '@container', '@layer', '@document', '@keyframes', '@-webkit-keyframes')
+
+
+_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def normalize_selector(selector):
+    """Collapse whitespace so '.hero  p' and '.hero p' index to the same key"""
+    return ' '.join(selector.split())
+
+
+def absolute_urls(css, path):
+    """Rewrite relative url() references in CSS that lived at site path `path` to root-absolute ones"""
+    base = posixpath.dirname('/' + path)
+
+    def resolve(match):
+        quote, url = match.groups()
+        if url.startswith(('/', 'data:', 'http:', 'https:', '#')):
+            return match.group()
+        return f'url({quote}{posixpath.normpath(posixpath.join(base, url))}{quote})'
+
+    return _URL.sub(resolve, css)
+
+
+# Fast path: a whole plain rule (leading whitespace/comments, selector, flat
+# declaration block) in one regex match. Anything it cannot take -- at-rules
+# with nested blocks, comments inside blocks, stray tokens -- falls back to
+# the token scanner below.
+# A comment must end at its own '*/'; a lazy .*? could run on to a later one
+_LEAD = r'(?:\s|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/)*'
+_PRELUDE = r'[^{}";/\']*(?:(?:"[^"]*"|\'[^\']*\')[^{}";/\']*)*'
+_BODY = r'[^{}"\'/]*(?:(?:"[^"]*"|\'[^\']*\'|/(?!\*))[^{}"\'/]*)*'
+_FAST_RULE = re.compile(f'({_LEAD})({_PRELUDE})\\{{({_BODY})\\}}', re.DOTALL)
+
+_TOKEN = re.compile(r'/\*|["\'{};]')
+_BRACE_TOKEN = re.compile(r'/\*|["\'{}]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'', re.DOTALL)
+
+
+def _pos(rule):
+    return rule.pos
+
+
+def _skip_comment(css, i):
+    end = css.find('*/', i + 2)
+    return len(css) if end < 0 else end + 2
+
+
+def _skip_string(css, i):
+    match = _STRING.match(css, i)
+    return match.end() if match else len(css)
+
+
+def _match_brace(css, i):
+    """Index of the '}' that closes the '{' at i, honouring comments and strings"""
+    depth = 0
+    while True:
+        match = _BRACE_TOKEN.search(css, i)
+        if match is None:
+            return len(css)
+        token, j = match.group(), match.start()
+        if token == '/*':
+            i = _skip_comment(css, j)
+        elif token in '"\'':
+            i = _skip_string(css, j)
+        else:
+            depth += 1 if token == '{' else -1
+            if depth == 0:
+                return j
+            i = j + 1
+
+
+_DECLARATION_TOKEN = re.compile(r'/\*|["\'();]')
+
+
+def split_declarations(body):
+    """The declarations of a rule body, split at semicolons outside strings, comments and parentheses
+
+    calc(var(--a) + 20px), max(env(safe-area-inset-left), 0px) and
+    url(data:...;base64,...) stay whole. Empty declarations are dropped.
+    """
+    declarations = []
+    depth = 0
+    start = i = 0
+    while True:
+        match = _DECLARATION_TOKEN.search(body, i)
+        if match is None:
+            break
+        token, j = match.group(), match.start()
+        if token == '/*':
+            i = _skip_comment(body, j)
+            continue
+        if token in '"\'':
+            i = _skip_string(body, j)
+            continue
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            declarations.append(body[start:j])
+            start = j + 1
+        i = j + 1
+    declarations.append(body[start:])
+    return [declaration for declaration in declarations if declaration.strip()]
+
+
+def _lead_length(prelude):
+    """Length of the whitespace and comments in front of a selector"""
+    i = 0
+    while i < len(prelude):
+        if prelude[i].isspace():
+            i += 1
+        elif prelude.startswith('/*', i):
+            i = _skip_comment(prelude, i)
+        else:
+            break
+    return i
+
+
+class CssRule:
+    """One selector block: leading whitespace/comments, selector text and body"""
+
+    __slots__ = ('lead', 'prelude', 'body', 'selector', 'pos', 'children')
+
+    def __init__(self, lead, prelude, body, pos):
+        self.lead = lead
+        self.prelude = prelude
+        self.body = body
+        self.selector = normalize_selector(prelude)
+        self.pos = pos
+        # Set once the rule has been replaced or removed
+        self.children = None
+
+    @property
+    def live(self):
+        return self.children is None
+
+    @property
+    def comment(self):
+        """Text of the last comment in front of the selector, or ''"""
+        start = self.lead.rfind('/*')
+        if start < 0:
+            return ''
+        end = self.lead.find('*/', start)
+        return self.lead[start + 2:end].strip()
+
+    def render(self):
+        if self.children is None:
+            return f'{self.lead}{self.prelude}{{{self.body}}}'
+        return self.lead + ''.join(
+            part if isinstance(part, str) else part.render() for part in self.children
+        )
+
+
+def tokenize(css, pos=(), rules=None, nested=True):
+    """Split CSS into text segments and CssRule objects; new rules are appended to rules
+
+    With nested=False an at-rule block such as @media stays a single CssRule
+    whose body holds the nested rules, so callers see only top-level items.
+    """
+    if rules is None:
+        rules = []
+    segments = []
+    text_start = start = i = 0
+    count = 0
+    while i < len(css):
+        if i == start:
+            match = _FAST_RULE.match(css, i)
+            if match is not None:
+                segments.append(css[text_start:i])
+                rule = CssRule(match.group(1), match.group(2), match.group(3), pos + (count,))
+                segments.append(rule)
+                rules.append(rule)
+                count += 1
+                text_start = i = start = match.end()
+                continue
+
+        match = _TOKEN.search(css, i)
+        if match is None:
+            break
+        token, j = match.group(), match.start()
+        if token == '/*':
+            i = _skip_comment(css, j)
+        elif token in '"\'':
+            i = _skip_string(css, j)
+        elif token in ';}':
+            i = start = j + 1
+        else:
+            prelude = css[start:j]
+            lead = _lead_length(prelude)
+            close = _match_brace(css, j)
+            if nested and prelude[lead:].lstrip().startswith(GROUP_AT_RULES):
+                segments.append(css[text_start:j + 1])
+                segments.extend(tokenize(css[j + 1:close], pos + (count,), rules))
+                text_start = close
+            else:
+                segments.append(css[text_start:start])
+                rule = CssRule(prelude[:lead], prelude[lead:], css[j + 1:close], pos + (count,))
+                segments.append(rule)
+                rules.append(rule)
+                text_start = close + 1
+            count += 1
+            i = start = close + 1
+    segments.append(css[text_start:])
+    return [part for part in segments if part != '']
+
+
+class StyleIndex:
+    """Editable selector index over a page's inline styles"""
+
+    def __init__(self, segments, rules):
+        self.segments = segments
+        self.dirty = False
+        # Every rule ever indexed, in document order; replaced ones stay in
+        # place with live == False so edits never shift positions.
+        self._order = list(rules)
+        self._by_selector = {}
+        for rule in rules:
+            self._by_selector.setdefault(rule.selector, []).append(rule)
+
+    @classmethod
+    def parse(cls, text, css=False, nested=True):
+        """Index a stylesheet (css=True) or every <style> block of an HTML page
+
+        nested=False indexes top-level items only (see tokenize).
+        """
+        rules = []
+        if css:
+            return cls(tokenize(text, (0,), rules, nested), rules)
+
+        segments = []
+        i = block = 0
+        for match in STYLE_OPEN.finditer(text):
+            if match.start() < i:
+                continue
+            close = text.find(STYLE_CLOSE, match.end())
+            if close < 0:
+                close = len(text)
+            segments.append(text[i:match.end()])
+            segments.extend(tokenize(text[match.end():close], (block,), rules, nested))
+            block += 1
+            i = close
+        segments.append(text[i:])
+        return cls(segments, rules)
+
+    def _add(self, rule):
+        bisect.insort(self._order, rule, key=_pos)
+        bisect.insort(self._by_selector.setdefault(rule.selector, []), rule, key=_pos)
+
+    def render(self):
+        """Join the segments back into page text"""
+        return ''.join(part if isinstance(part, str) else part.render() for part in self.segments)
+
+    @property
+    def rules(self):
+        """Live rules in document order"""
+        return [rule for rule in self._order if rule.live]
+
+    def find(self, selector):
+        """Live rules whose selector is exactly `selector`, in document order"""
+        return [rule for rule in self._by_selector.get(normalize_selector(selector), ()) if rule.live]
+
+    def first(self, selector):
+        rules = self.find(selector)
+        return rules[0] if rules else None
+
+    def following(self, rule):
+        """Iterate the live rules after `rule` in document order"""
+        start = bisect.bisect_right(self._order, rule.pos, key=_pos)
+        return (other for other in itertools.islice(self._order, start, None) if other.live)
+
+    def replace_rule(self, rule, text):
+        """Replace a rule's selector and block with CSS text, keeping its leading whitespace"""
+        new_rules = []
+        rule.children = tokenize(text, rule.pos, new_rules)
+        for new_rule in new_rules:
+            self._add(new_rule)
+        self.dirty = True
+        return new_rules
+
+    def replace(self, selector, text):
+        """Replace every rule for `selector` with CSS text; return how many were replaced"""
+        rules = self.find(selector)
+        for rule in rules:
+            self.replace_rule(rule, text)
+        return len(rules)
+
+    def insert_after(self, rule, text):
+        """Insert CSS text right after a rule"""
+        return self.replace_rule(rule, rule.prelude + '{' + rule.body + '}' + text)
+
+    def set_body(self, rule, body):
+        """Swap a rule's declaration block in place"""
+        rule.body = body
+        self.dirty = True
+
+    def append_declaration(self, selector, declaration, indent='      '):
+        """Add a declaration at the end of every rule for `selector`"""
+        rules = self.find(selector)
+        for rule in rules:
+            body = rule.body.rstrip()
+            closing = rule.body[len(body):]
+            self.set_body(rule, f'{body}\n{indent}{declaration}{closing}')
+        return len(rules)
+
+    def remove_rule(self, rule, comment=False):
+        """Drop a rule, keeping its leading whitespace (and comment unless comment=True)"""
+        if comment and '/*' in rule.lead:
+            rule.lead = rule.lead[:rule.lead.rfind('/*')]
+        self.replace_rule(rule, '')
+
+    def remove(self, selector):
+        """Drop every rule for `selector`; return how many were removed"""
+        rules = self.find(selector)
+        for rule in rules:
+            self.remove_rule(rule)
+        return len(rules)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Minimal HTML element tree and CSS selector matching for the build stages
+
+Only what the stages need: html.parser builds a tree of Element objects
+(tolerating the stray end tags some service pages have), and
+`matches(selector, element)` answers whether a selector could match an
+element. The answer is deliberately generous: pseudo-elements match their
+element, unknown pseudo-classes match, and dynamic states (:hover, :focus,
+...) match unless the caller passes dynamic=False.
+"""
+
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+))
+
+DYNAMIC_PSEUDO_CLASSES = frozenset((
+    'hover', 'focus', 'focus-visible', 'focus-within', 'active', 'visited',
+    'target', 'checked', 'disabled', 'enabled', 'invalid', 'valid', 'placeholder-shown',
+))
+
+_COMPOUND_TOKEN = re.compile(
+    r'\*|[a-zA-Z][-\w]*|#[-\w]+|\.[-\w]+|\[[^\]]*\]|::?[-\w]+(?:\((?:[^()]|\([^()]*\))*\))?'
+)
+_ATTRIBUTE = re.compile(r'\[\s*([-\w:]+)\s*(?:([~|^$*]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s\]]+))\s*([iI])?)?\s*\]')
+_TAG_ATTRIBUTE = re.compile(r'([-\w:]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+_NTH = re.compile(r'^\s*(?:(odd)|(even)|([+-]?\d*)n\s*(?:([+-])\s*(\d+))?|([+-]?\d+))\s*$')
+
+
+class Element:
+    """One element: tag, attributes, parent and children"""
+
+    __slots__ = ('tag', 'attrs', 'parent', 'children', 'classes', 'index')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.parent = parent
+        self.children = []
+        self.classes = frozenset((self.attrs.get('class') or '').split())
+        # Position in document order, set by parse_html
+        self.index = 0
+
+    @property
+    def id(self):
+        return self.attrs.get('id')
+
+    def iter(self):
+        """This element and its descendants in document order"""
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element.children))
+
+    def ancestors(self):
+        element = self.parent
+        while element is not None:
+            yield element
+            element = element.parent
+
+    def __repr__(self):
+        return f'<{self.tag}{" #" + self.id if self.id else ""}{"".join("." + c for c in sorted(self.classes))}>'
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document')
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, attrs, self.current)
+        self.current.children.append(element)
+        if tag not in VOID_ELEMENTS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Element(tag, attrs, self.current))
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; ignore stray end tags
+        for element in [self.current, *self.current.ancestors()]:
+            if element.tag == tag:
+                self.current = element.parent
+                return
+
+
+def parse_html(text):
+    """Parse a page into an Element tree; returns the '#document' root"""
+    builder = _TreeBuilder()
+    builder.feed(text)
+    builder.close()
+    for i, element in enumerate(builder.root.iter()):
+        element.index = i
+    return builder.root
+
+
+def tag_attributes(tag):
+    """Attribute dict of one start tag's source text, in source order"""
+    inner = re.sub(r'^<[-\w]+|/?>$', '', tag)
+    return {
+        name.lower(): next((value for value in values if value), '')
+        for name, *values in _TAG_ATTRIBUTE.findall(inner)
+    }
+
+
+def render_tag(name, attrs):
+    """Start tag text for an attribute dict; empty values render as bare attributes"""
+    parts = [f'{key}="{value}"' if value else key for key, value in attrs.items()]
+    return f'<{name} {" ".join(parts)}>' if parts else f'<{name}>'
+
+
+def split_selector_list(selector):
+    """Split 'a, b:not(.c, .d)' at top-level commas"""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(selector):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(selector[start:i].strip())
+            start = i + 1
+    parts.append(selector[start:].strip())
+    return [part for part in parts if part]
+
+
+@lru_cache(maxsize=None)
+def _split_complex(selector):
+    """((compound, combinator-to-the-left), ...) from left to right"""
+    parts, depth, current, combinator = [], 0, '', ' '
+    pending = None
+    for char in selector.strip():
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if depth == 0 and (char.isspace() or char in '>+~'):
+            if current:
+                parts.append((current, combinator))
+                current = ''
+                combinator = ' '
+            if char in '>+~':
+                combinator = char
+            pending = combinator
+            continue
+        current += char
+    if current:
+        parts.append((current, combinator if pending else ' '))
+    return tuple(parts)
+
+
+def split_complex(selector):
+    """[(compound, combinator to its left)] of one complex selector, left to right"""
+    return list(_split_complex(selector))
+
+
+def _nth_matches(expression, position):
+    match = _NTH.match(expression)
+    if match is None:
+        return True
+    odd, even, a, sign, b, constant = match.groups()
+    if odd:
+        return position % 2 == 1
+    if even:
+        return position % 2 == 0
+    if constant is not None:
+        return position == int(constant)
+    a = int(a + '1') if a in ('', '+', '-') else int(a)
+    b = int(b or 0) * (-1 if sign == '-' else 1)
+    if a == 0:
+        return position == b
+    return (position - b) % a == 0 and (position - b) // a >= 0
+
+
+def _siblings(element):
+    return [child for child in element.parent.children] if element.parent is not None else [element]
+
+
+def _attribute_matches(token, element):
+    match = _ATTRIBUTE.match(token)
+    if match is None:
+        return True
+    name, op, double, single, bare, flag = match.groups()
+    if name not in element.attrs:
+        return False
+    if op is None:
+        return True
+    actual = element.attrs[name] or ''
+    expected = next(value for value in (double, single, bare) if value is not None)
+    if flag:
+        actual, expected = actual.lower(), expected.lower()
+    if op == '=':
+        return actual == expected
+    if op == '~=':
+        return expected in actual.split()
+    if op == '|=':
+        return actual == expected or actual.startswith(expected + '-')
+    if op == '^=':
+        return actual.startswith(expected)
+    if op == '$=':
+        return actual.endswith(expected)
+    return expected in actual
+
+
+def _pseudo_matches(token, element, dynamic):
+    if token.startswith('::') or token[1:] in ('before', 'after', 'first-line', 'first-letter'):
+        return True
+    name, _, argument = token[1:].partition('(')
+    name = name.lower()
+    argument = argument[:-1]
+    if name in DYNAMIC_PSEUDO_CLASSES:
+        return dynamic
+    if name == 'root':
+        return element.tag == 'html'
+    if name == 'not':
+        # Undecidable arguments (states, unknown pseudo-classes) keep the answer generous
+        if ':' in argument:
+            return True
+        return not any(_matches(part, element, dynamic) for part in split_selector_list(argument))
+    if name in ('is', 'where', 'matches'):
+        return any(_matches(part, element, dynamic) for part in split_selector_list(argument))
+    if name in ('first-child', 'last-child', 'only-child', 'nth-child', 'nth-last-child',
+                'first-of-type', 'last-of-type', 'nth-of-type'):
+        siblings = _siblings(element)
+        if name.endswith('of-type'):
+            siblings = [sibling for sibling in siblings if sibling.tag == element.tag]
+        position = siblings.index(element) + 1
+        if name.startswith('first'):
+            return position == 1
+        if name.startswith('last'):
+            return position == len(siblings)
+        if name == 'only-child':
+            return len(siblings) == 1
+        if name == 'nth-last-child':
+            return _nth_matches(argument, len(siblings) - position + 1)
+        return _nth_matches(argument, position)
+    if name == 'empty':
+        return not element.children
+    # :has(), :lang(), vendor pseudo-classes, ...: assume they can match
+    return True
+
+
+@lru_cache(maxsize=None)
+def _compound_tokens(compound):
+    return tuple(_COMPOUND_TOKEN.findall(compound))
+
+
+def _compound_matches(compound, element, dynamic):
+    for token in _compound_tokens(compound):
+        first = token[0]
+        if first == '*':
+            continue
+        if first == '#':
+            if element.id != token[1:]:
+                return False
+        elif first == '.':
+            if token[1:] not in element.classes:
+                return False
+        elif first == '[':
+            if not _attribute_matches(token, element):
+                return False
+        elif first == ':':
+            if not _pseudo_matches(token, element, dynamic):
+                return False
+        elif element.tag != token.lower():
+            return False
+    return True
+
+
+def _matches(selector, element, dynamic=True):
+    parts = _split_complex(selector)
+    if not parts:
+        return False
+    return _match_from(parts, len(parts) - 1, element, dynamic)
+
+
+def _match_from(parts, i, element, dynamic):
+    compound, combinator = parts[i]
+    if not _compound_matches(compound, element, dynamic):
+        return False
+    if i == 0:
+        return True
+    if combinator == '>':
+        parent = element.parent
+        return parent is not None and _match_from(parts, i - 1, parent, dynamic)
+    if combinator in '+~':
+        siblings = _siblings(element)
+        before = siblings[:siblings.index(element)]
+        if combinator == '+':
+            return bool(before) and _match_from(parts, i - 1, before[-1], dynamic)
+        return any(_match_from(parts, i - 1, sibling, dynamic) for sibling in before)
+    return any(_match_from(parts, i - 1, ancestor, dynamic) for ancestor in element.ancestors())
+
+
+def matches(selector, element, dynamic=True):
+    """True when one complex selector (no commas) could match the element"""
+    if element.tag.startswith('#'):
+        return False
+    return _matches(selector, element, dynamic)
+
+
+def select(root, selector, dynamic=True):
+    """Elements under root matching a selector list, in document order"""
+    parts = split_selector_list(selector)
+    return [
+        element for element in root.iter()
+        if any(matches(part, element, dynamic) for part in parts)
+    ]
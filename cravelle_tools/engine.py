@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Single-pass rule engine: read each page once, apply rules in order, write once"""
+
+import contextlib
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from . import instrument
+from .cache import Manifest, content_hash, rules_key
+from .pages import PageStore, discover_pages, resolve_targets
+from .scheduler import ANY, MAX_PASSES, ScheduleError, apply_schedule
+
+REGISTRY = {}
+
+
+class Rule:
+    """One rewrite step
+
+    Text rules map page content to page content. CSS rules receive the page's
+    StyleIndex and edit it in place.
+
+    reads/writes name the parts of the page a rule depends on and changes, for
+    the scheduler: a CSS selector ('.hero p'), '+selector' for whether a rule
+    for that selector exists at all, a markup region ('<nav>', '<h3>',
+    '<scripts>'), 'ws' for blank-line layout, or ANY. overwrites is the subset
+    of writes the rule replaces wholesale, so earlier edits to it are dead;
+    a rule that only declares overwrites writes nothing else. Rules must be
+    idempotent: applied to their own output they change nothing, which is
+    what lets fixed-point runs and the watcher reapply them.
+    """
+
+    def __init__(self, name, apply, targets, exclude=(), kind='text',
+                 reads=(ANY,), writes=None, overwrites=()):
+        self.name = name
+        self.apply = apply
+        self.targets = tuple(targets)
+        self.exclude = tuple(exclude)
+        self.kind = kind
+        self.reads = frozenset(reads)
+        self.overwrites = frozenset(overwrites)
+        if writes is None:
+            writes = () if overwrites else (ANY,)
+        self.writes = frozenset(writes) | self.overwrites
+
+    def run(self, page):
+        if page.stats is not None:
+            instrument.measure(self, page)
+        else:
+            self.apply_to(page)
+
+    def apply_to(self, page):
+        if self.kind == 'css':
+            self.apply(page.styles)
+        else:
+            page.content = self.apply(page.content)
+
+
+class RuleSet:
+    """The rules that used to live in one standalone fix_*/update_* script"""
+
+    def __init__(self, name, description, targets=('services',), exclude=()):
+        self.name = name
+        self.description = description
+        self.targets = tuple(targets)
+        self.exclude = tuple(exclude)
+        self.rules = []
+
+    def rule(self, fn=None, *, targets=None, exclude=None, kind='text', **deps):
+        """Register a rule function; usable as @rules.rule or @rules.rule(targets=..., reads=...)"""
+        def decorator(fn):
+            self.rules.append(Rule(
+                f'{self.name}.{fn.__name__}',
+                fn,
+                targets if targets is not None else self.targets,
+                exclude if exclude is not None else self.exclude,
+                kind,
+                **deps,
+            ))
+            return fn
+        return decorator(fn) if fn is not None else decorator
+
+    def css_rule(self, fn=None, *, targets=None, exclude=None, **deps):
+        """Register a rule that edits the page's StyleIndex instead of its text"""
+        return self.rule(fn, targets=targets, exclude=exclude, kind='css', **deps)
+
+
+def register(rule_set):
+    """Add a rule set to the registry; registration order is run order"""
+    if rule_set.name in REGISTRY:
+        raise ValueError(f'Duplicate rule set: {rule_set.name}')
+    REGISTRY[rule_set.name] = rule_set
+    return rule_set
+
+
+def select(names=None):
+    """Return the named rule sets in registry order (all of them when names is None)"""
+    from . import rules  # noqa: F401  (importing registers the built-in rule sets)
+
+    if names is None:
+        return list(REGISTRY.values())
+    unknown = [name for name in names if name not in REGISTRY]
+    if unknown:
+        raise KeyError(f'Unknown rule set(s): {", ".join(unknown)}')
+    return [rule_set for rule_set in REGISTRY.values() if rule_set.name in names]
+
+
+def build_plan(rule_sets, groups):
+    """Map each target page to the ordered list of rules that apply to it"""
+    plan = {}
+    for rule_set in rule_sets:
+        for rule in rule_set.rules:
+            for path in resolve_targets(rule.targets, groups, rule.exclude):
+                plan.setdefault(path, []).append(rule)
+    return plan
+
+
+class PageResult:
+    """Outcome for one page in a run"""
+
+    def __init__(self, path, status, rules=(), passes=1, error='', stats=None):
+        self.path = path
+        self.status = status
+        self.rules = list(rules)
+        self.passes = passes
+        self.error = error
+        self.stats = stats or []
+
+
+class RunReport:
+    """Per-page outcomes plus the wall time and I/O counts of a run"""
+
+    def __init__(self, results, wall_time, reads, writes, hashed=0):
+        self.results = results
+        self.wall_time = wall_time
+        self.reads = reads
+        self.writes = writes
+        self.hashed = hashed
+
+    def count(self, status):
+        return sum(1 for result in self.results if result.status == status)
+
+    @property
+    def stats(self):
+        """RuleStats of an instrumented run, in page order"""
+        return [stat for result in self.results for stat in result.stats]
+
+    def lines(self):
+        """Log lines in the same emoji format the standalone scripts printed"""
+        labels = {
+            'changed': '✅ Fixed',
+            'unchanged': 'ℹ️  No changes',
+            'cached': 'ℹ️  No changes (cached)',
+            'missing': '❌ Not found',
+            'unsettled': '❌ Not settled',
+        }
+        lines = []
+        for result in self.results:
+            line = f'{labels[result.status]}: {result.path}'
+            if result.passes > 1:
+                line += f' ({result.passes} passes)'
+            if result.error:
+                line += f' - {result.error}'
+            lines.append(line)
+        return lines
+
+    def summary(self):
+        return (
+            f'{self.count("changed")} changed, {self.count("unchanged")} unchanged, '
+            f'{self.count("cached")} cached, {self.count("missing")} missing, '
+            f'{self.count("unsettled")} unsettled | '
+            f'{self.reads} reads, {self.writes} writes, {self.hashed} hash checks, '
+            f'{self.wall_time * 1000:.1f} ms'
+        )
+
+
+def process_page(page, rules):
+    """Apply rules to an in-memory page in order"""
+    for rule in rules:
+        rule.run(page)
+    return page
+
+
+def rewrite_page(root, path, rules, known_hash=None, dry_run=False, cache=False,
+                 schedule=False, fixed_point=False, max_passes=None, stats=False):
+    """Read, rewrite and write back one page
+
+    Returns (PageResult, content hash or None, reads, writes); with cache=True
+    the hash of an unchanged page is returned for the manifest. known_hash is
+    the manifest's fixed-point hash for this page; when the file still hashes
+    to it the rules are skipped. schedule/fixed_point hand the rules to the
+    scheduler instead of applying them in registry order. stats=True records
+    a RuleStat per rule application on the PageResult. Serial and parallel
+    runs both go through here, which is what keeps their output identical.
+    """
+    store = PageStore(root)
+    page = store.get(path)
+    if page is None:
+        return PageResult(path, 'missing'), None, 0, 0
+    digest = None
+    if known_hash is not None:
+        digest = content_hash(page.content)
+        if digest == known_hash:
+            return PageResult(path, 'cached'), digest, store.reads, 0
+
+    passes = 1
+    if stats:
+        page.stats = []
+    with instrument.counting() if stats else contextlib.nullcontext():
+        if schedule or fixed_point:
+            try:
+                passes = apply_schedule(page, rules, fixed_point, max_passes or MAX_PASSES)
+            except ScheduleError as e:
+                return PageResult(path, 'unsettled', error=str(e), stats=page.stats), None, store.reads, 0
+        else:
+            process_page(page, rules)
+
+    if page.changed:
+        result = PageResult(path, 'changed', [rule.name for rule in rules], passes, stats=page.stats)
+        if not dry_run:
+            store.write(page)
+        return result, None, store.reads, store.writes
+    if cache and digest is None:
+        digest = content_hash(page.content)
+    return PageResult(path, 'unchanged', stats=page.stats), digest, store.reads, 0
+
+
+# Per-worker rule lookup, filled once by the pool initializer so tasks only
+# carry rule names and each worker imports and compiles the rules a single time
+_worker_rules = {}
+
+
+def _init_worker(names):
+    _worker_rules.update(
+        (rule.name, rule) for rule_set in select(names) for rule in rule_set.rules
+    )
+
+
+def _rewrite_in_worker(task):
+    root, path, rule_names, known_hash, options = task
+    rules = [_worker_rules[name] for name in rule_names]
+    return rewrite_page(root, path, rules, known_hash, **options)
+
+
+def run(names=None, root='.', dry_run=False, cache=False, jobs=1,
+        schedule=False, fixed_point=False, max_passes=None, stats=False):
+    """Run the selected rule sets over the site in a single read/write pass
+
+    With cache=True, pages recorded in the manifest as unchanged by the same
+    rules (same content hash, same rule sources) are skipped without running
+    any rule. With jobs > 1 the pages are rewritten in a process pool; results
+    still come back in plan order, so logs and files match a serial run.
+    schedule=True drops overwritten rules and reorders the rest by their
+    declared dependencies; fixed_point=True also repeats them until each page
+    settles. stats=True instruments every rule application (see instrument.py).
+    """
+    options = {
+        'dry_run': dry_run,
+        'cache': cache,
+        'schedule': schedule,
+        'fixed_point': fixed_point,
+        'max_passes': max_passes,
+        'stats': stats,
+    }
+    rule_sets = select(names)
+    start = time.perf_counter()
+    root = Path(root)
+    plan = build_plan(rule_sets, discover_pages(root))
+    manifest = Manifest.load(root) if cache else None
+    # A page at the fixed point of one mode need not be at the fixed point of another
+    if fixed_point:
+        mode = f'fixed_point:{max_passes or MAX_PASSES}'
+    else:
+        mode = 'schedule' if schedule else 'registry'
+
+    results = {}
+    tasks = []
+    keys = {}
+    for path, rules in plan.items():
+        known_hash = None
+        if manifest is not None:
+            keys[path] = key = rules_key(rules, mode)
+            if manifest.stat_fresh(path, key, root / path):
+                results[path] = PageResult(path, 'cached')
+                continue
+            known_hash = manifest.expected_hash(path, key)
+        tasks.append((path, rules, known_hash))
+
+    if jobs > 1 and len(tasks) > 1:
+        names = [rule_set.name for rule_set in rule_sets]
+        work = [
+            (str(root), path, [rule.name for rule in rules], known_hash, options)
+            for path, rules, known_hash in tasks
+        ]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(names,)) as pool:
+            outcomes = list(pool.map(_rewrite_in_worker, work, chunksize=max(1, len(work) // (jobs * 4))))
+    else:
+        outcomes = [
+            rewrite_page(root, path, rules, known_hash, **options)
+            for path, rules, known_hash in tasks
+        ]
+
+    reads = writes = hashed = 0
+    for (path, _, known_hash), (result, digest, page_reads, page_writes) in zip(tasks, outcomes):
+        results[path] = result
+        reads += page_reads
+        writes += page_writes
+        hashed += known_hash is not None and result.status != 'missing'
+        if manifest is not None and digest is not None:
+            # Fixed point (or touched-but-identical): refresh stat data so the next run skips the read
+            manifest.record(path, keys[path], digest, root / path)
+
+    if manifest is not None and not dry_run:
+        manifest.save()
+    ordered = [results[path] for path in plan]
+    return RunReport(ordered, time.perf_counter() - start, reads, writes, hashed)
+
+
+def run_legacy(names=None, root='.'):
+    """Replay the old script-by-script flow: every rule set reads and writes on its own"""
+    rule_sets = select(names)
+    start = time.perf_counter()
+    groups = discover_pages(root)
+    reads = writes = 0
+    results = {}
+
+    for rule_set in rule_sets:
+        store = PageStore(root)
+        for path, rules in build_plan([rule_set], groups).items():
+            page = store.get(path)
+            if page is None:
+                results.setdefault(path, PageResult(path, 'missing'))
+                continue
+            process_page(page, rules)
+            result = results.setdefault(path, PageResult(path, 'unchanged'))
+            if page.changed:
+                result.status = 'changed'
+                result.rules.extend(rule.name for rule in rules)
+                store.write(page)
+        reads += store.reads
+        writes += store.writes
+
+    return RunReport(list(results.values()), time.perf_counter() - start, reads, writes)
+
+
+def _copy_targets(root, names, dest):
+    """Copy the files the selected rule sets touch into a scratch tree"""
+    root = Path(root)
+    for path in build_plan(select(names), discover_pages(root)):
+        source = root / path
+        if source.exists():
+            target = Path(dest) / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+
+
+def compare(names=None, root='.'):
+    """Run both flows on scratch copies; return (legacy, single_pass, identical_output)"""
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as single_dir:
+        _copy_targets(root, names, legacy_dir)
+        _copy_targets(root, names, single_dir)
+        legacy = run_legacy(names, legacy_dir)
+        single = run(names, single_dir)
+        identical = all(
+            (Path(legacy_dir) / result.path).read_bytes() == (Path(single_dir) / result.path).read_bytes()
+            for result in single.results
+            if result.status != 'missing'
+        )
+    return legacy, single, identical
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Render the service pages from one shared layout and a data file per service
+
+templates/service/ holds the layout and the fragments every service page
+shares: the inline nav rule, the feature card, the gallery section and its
+CSS and lightbox script. templates/services/<slug>.json holds what one service
+adds: title and description, extra <meta> tags, hero and contact text with
+their data-keys, the feature cards, an optional gallery, and optional
+page-specific fragment files (extra styles, sections after the features,
+scripts). A few keys keep a page's own markup where it differs from the
+shared one: "nav_styles": false drops the inline nav rule, contact "accent"
+and "heading_key" (null for none) style the contact heading, a contact
+without "key" has untranslated text, and gallery "zoom": false leaves the
+items without the zoom-in cursor and lets a caption click open the lightbox.
+The nav, contact form and footer are include directives (see includes.py).
+
+Templates use {{ name }} placeholders. Values are inserted verbatim, so the
+strings in the data files are HTML. Each template is compiled once into
+literal and slot parts, and the parts are reused until the file's mtime changes.
+Adding a service takes one data file.
+"""
+
+import json
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from . import dom
+from .includes import Partials
+from .pages import SERVICES_DIR
+
+TEMPLATE_DIR = 'templates/service'
+DATA_DIR = 'templates/services'
+
+LAYOUT = 'layout.html'
+NAV_STYLES = 'nav.css'
+FEATURE = 'feature.html'
+GALLERY = 'gallery.html'
+GALLERY_ITEM = 'gallery-item.html'
+GALLERY_BADGES = 'gallery-badges.html'
+GALLERY_BADGE = 'gallery-badge.html'
+GALLERY_STYLES = 'gallery.css'
+GALLERY_SCRIPT = 'gallery.js'
+
+DEFAULT_SUBTITLE = 'Comprehensive services tailored to your needs'
+DEFAULT_ACCENT = 'purple'
+DEFAULT_CONTACT_KEY = 'contact'
+DELAY_STEP = 100
+
+_SLOT = re.compile(r'{{\s*(\w+)\s*}}')
+
+
+def data_key(key):
+    """A data-key attribute with its leading space, or nothing for no key"""
+    return f' data-key="{key}"' if key else ''
+
+
+@lru_cache(maxsize=None)
+def _compile(path, mtime_ns):
+    """Literal text at even indexes, slot names at odd ones"""
+    return tuple(_SLOT.split(Path(path).read_text(encoding='utf-8')))
+
+
+def load_template(path):
+    path = Path(path)
+    return path, _compile(str(path), path.stat().st_mtime_ns)
+
+
+def render(template, values):
+    path, parts = template
+    out = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            out.append(part)
+        elif part in values:
+            out.append(str(values[part]))
+        else:
+            raise KeyError(f'{path.name}: no value for {{{{ {part} }}}}')
+    return ''.join(out)
+
+
+class Generator:
+    """Renders service pages from the templates under one site root"""
+
+    def __init__(self, root='.'):
+        self.root = Path(root)
+        self.templates = self.root / TEMPLATE_DIR
+        self.data_dir = self.root / DATA_DIR
+        self.partials = Partials(root)
+
+    def template(self, name):
+        return load_template(self.templates / name)
+
+    def fragment(self, name):
+        """A page-specific fragment file next to the data files, rendered without values"""
+        return render(load_template(self.data_dir / name), {})
+
+    def services(self):
+        return sorted(path.stem for path in self.data_dir.glob('*.json'))
+
+    def load(self, slug):
+        return json.loads((self.data_dir / f'{slug}.json').read_text(encoding='utf-8'))
+
+    def features(self, features):
+        card = self.template(FEATURE)
+        return ''.join(
+            render(card, dict(feature, delay=(i + 1) * DELAY_STEP)) for i, feature in enumerate(features)
+        )
+
+    def gallery(self, gallery):
+        item_template = self.template(GALLERY_ITEM)
+        badge_template = self.template(GALLERY_BADGE)
+        step = gallery.get('delay_step', DELAY_STEP)
+        zoom = gallery.get('zoom', True)
+        item_values = {
+            'item_style': ' style="cursor: zoom-in;"' if zoom else '',
+            'caption_click': ' onclick="event.stopPropagation()"' if zoom else '',
+        }
+        items = []
+        for i, item in enumerate(gallery['items']):
+            badges = ''.join(
+                render(badge_template, dict(badge, spacing='margin-left:4px;' if j else ''))
+                for j, badge in enumerate(item.get('badges', ()))
+            )
+            if badges:
+                badges = render(self.template(GALLERY_BADGES), {'badges': badges})
+            items.append(render(item_template, dict(item, **item_values, badges=badges, delay=DELAY_STEP + i * step)))
+        return render(self.template(GALLERY), {
+            'title': gallery['title'],
+            'desc': gallery['desc'],
+            'accent': gallery.get('accent', DEFAULT_ACCENT),
+            'items': ''.join(items),
+        })
+
+    def render_page(self, data):
+        styles = [render(self.template(GALLERY_STYLES), {})] if data.get('gallery') else []
+        sections = [self.gallery(data['gallery'])] if data.get('gallery') else []
+        scripts = [render(self.template(GALLERY_SCRIPT), {})] if data.get('gallery') else []
+        styles += [self.fragment(name) for name in data.get('styles', ())]
+        sections += [self.fragment(name) for name in data.get('sections', ())]
+        scripts += [self.fragment(name) for name in data.get('scripts', ())]
+        hero = data['hero']
+        contact = data['contact']
+        page = render(self.template(LAYOUT), {
+            'title': data['title'],
+            'description': data['description'],
+            'meta': ''.join(f'  {dom.render_tag("meta", attrs)}\n' for attrs in data.get('meta', ())),
+            'nav_styles': render(self.template(NAV_STYLES), {}) if data.get('nav_styles', True) else '',
+            'styles': ''.join(styles),
+            'hero_key': hero['key'],
+            'hero_title': hero['title'],
+            'hero_desc_key': hero['desc_key'],
+            'hero_desc': hero['desc'],
+            'subtitle': data.get('subtitle', DEFAULT_SUBTITLE),
+            'features': self.features(data['features']),
+            'sections': ''.join(section + '\n' for section in sections),
+            'contact_accent': contact.get('accent', DEFAULT_ACCENT),
+            'contact_heading_key': data_key(contact.get('heading_key', DEFAULT_CONTACT_KEY)),
+            'contact_key': data_key(contact.get('key')),
+            'contact_text': contact['text'],
+            'scripts': ''.join(scripts),
+        })
+        return self.partials.resolve(page, SERVICES_DIR)[0]
+
+    def generate(self, slugs=None, check=False):
+        """Render the selected services (all by default); returns [(page, status)]
+
+        Status is 'written', 'unchanged', or with check=True 'differs' (nothing is written).
+        """
+        known = self.services()
+        unknown = [slug for slug in slugs or () if slug not in known]
+        if unknown:
+            raise KeyError(f'Unknown service(s): {", ".join(unknown)}')
+        results = []
+        for slug in slugs or known:
+            page = f'{SERVICES_DIR}/{slug}.html'
+            target = self.root / page
+            content = self.render_page(self.load(slug))
+            current = target.read_text(encoding='utf-8') if target.exists() else None
+            if content == current:
+                results.append((page, 'unchanged'))
+            elif check:
+                results.append((page, 'differs'))
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(content, encoding='utf-8')
+                results.append((page, 'written'))
+        return results
+
+
+def generate(root='.', slugs=None, check=False):
+    """Render service pages; returns ([(page, status)], wall time in seconds)"""
+    start = time.perf_counter()
+    results = Generator(root).generate(slugs, check)
+    return results, time.perf_counter() - start
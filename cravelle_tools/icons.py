@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Font Awesome icons the site uses, resolved to SVGs from the vendor/ mirror
+
+Icons appear as <i class="fas fa-globe"></i> in the pages and as class
+strings in scripts ('fas fa-spinner fa-spin'). Font Awesome 6 keeps the
+version 5 names (fa-shipping-fast, fa-file-alt) as aliases in its CSS, but
+ships each SVG only under its current name (svgs/solid/truck-fast.svg). The
+aliases are read from the stylesheet: every name that maps to the same glyph
+shares it, and the first one listed is the current name.
+"""
+
+import re
+
+from .vendor import VENDOR_DIR, mirror_path
+
+STYLES = {
+    'fas': 'solid', 'fa-solid': 'solid',
+    'far': 'regular', 'fa-regular': 'regular',
+    'fab': 'brands', 'fa-brands': 'brands',
+}
+DEFAULT_STYLE = 'solid'
+
+# Utility classes that are not icons, and the CSS that replaces them
+MODIFIERS = {
+    'fa-fw': '.fa-fw{text-align:center;width:1.25em}',
+    'fa-xs': '.fa-xs{font-size:.75em}',
+    'fa-sm': '.fa-sm{font-size:.875em}',
+    'fa-lg': '.fa-lg{font-size:1.25em}',
+    'fa-spin': '@keyframes fa-spin{to{transform:rotate(360deg)}}.fa-spin{animation:fa-spin 2s linear infinite}',
+    'fa-pulse': '@keyframes fa-spin{to{transform:rotate(360deg)}}.fa-pulse{animation:fa-spin 1s steps(8) infinite}',
+}
+MODIFIERS.update({f'fa-{size}x': f'.fa-{size}x{{font-size:{size}em}}' for size in range(1, 11)})
+
+_STYLESHEET = re.compile(r'^(.*/font-awesome/[^/]+)/css/(?:all|fontawesome)(?:\.min)?\.css$')
+_ELEMENT = re.compile(r'<(i|span)\b([^>]*\bclass=(["\'])[^"\']*\bfa[-\w]*[^"\']*\3[^>]*)>\s*</\1>', re.IGNORECASE)
+_CLASS = re.compile(r'\bclass=(["\'])(.*?)\1', re.IGNORECASE | re.DOTALL)
+_STRING = re.compile(r'''(["'`])((?:\\.|(?!\1).)*?)\1''', re.DOTALL)
+_GLYPH = re.compile(r'((?:\.fa-[-\w]+:{1,2}before\s*,?\s*)+)\{\s*content:\s*["\']\\?([^"\']+)["\']')
+_GLYPH_NAME = re.compile(r'\.(fa-[-\w]+):{1,2}before')
+_SVG = re.compile(r'<svg\b([^>]*)>(.*)</svg>', re.DOTALL)
+_VIEW_BOX = re.compile(r'viewBox=["\']([^"\']+)["\']')
+_COMMENT = re.compile(r'<!--(.*?)-->', re.DOTALL)
+
+
+def icon_set(href):
+    """Base URL of the Font Awesome package a stylesheet URL belongs to, or None"""
+    match = _STYLESHEET.match(href or '')
+    return match.group(1) if match else None
+
+
+def parse_classes(classes):
+    """(style, icon name, modifiers) for a class list; the name is None when there is no icon"""
+    style = DEFAULT_STYLE
+    name = None
+    modifiers = []
+    for value in classes:
+        if value in STYLES:
+            style = STYLES[value]
+        elif value in MODIFIERS:
+            modifiers.append(value)
+        elif value.startswith('fa-') and name is None:
+            name = value[3:]
+    return style, name, modifiers
+
+
+def markup_icons(content, start=0):
+    """[(match, style, name, modifiers)] for the empty <i>/<span> icon elements of a page, from start on"""
+    icons = []
+    for match in _ELEMENT.finditer(content, start):
+        classes = _CLASS.search(match.group(2))
+        style, name, modifiers = parse_classes(classes.group(2).split())
+        if name is not None:
+            icons.append((match, style, name, modifiers))
+    return icons
+
+
+def script_icons(js):
+    """{(style, name)} and modifiers for the icon class strings in a script"""
+    icons = set()
+    modifiers = set()
+    for string in _STRING.finditer(js):
+        words = string.group(2).split()
+        if not any(word.startswith('fa-') for word in words):
+            continue
+        style, name, used = parse_classes(words)
+        if name is not None:
+            icons.add((style, name))
+        modifiers.update(used)
+    return icons, modifiers
+
+
+def glyph_names(css):
+    """{icon name: [names of the same glyph, current name first]} from a Font Awesome stylesheet"""
+    groups = {}
+    for match in _GLYPH.finditer(css):
+        names = groups.setdefault(match.group(2).lower(), [])
+        names += [name[3:] for name in _GLYPH_NAME.findall(match.group(1)) if name[3:] not in names]
+    return {name: names for names in groups.values() for name in names}
+
+
+def icon_url(base, style, name):
+    return f'{base}/svgs/{style}/{name}.svg'
+
+
+class IconSet:
+    """The SVGs of one Font Awesome package in a vendor/ mirror"""
+
+    def __init__(self, root, base):
+        self.directory = root / VENDOR_DIR
+        self.base = base
+        stylesheet = self.directory / mirror_path(f'{base}/css/all.min.css')
+        self.aliases = glyph_names(stylesheet.read_text(encoding='utf-8')) if stylesheet.is_file() else {}
+
+    def candidates(self, style, name):
+        """SVG URLs that may hold an icon: its current name first, then the name as written"""
+        names = self.aliases.get(name, [name])
+        return [icon_url(self.base, style, candidate) for candidate in dict.fromkeys(names + [name])]
+
+    def load(self, style, name):
+        """(viewBox, inner markup, license comment) of an icon, or None when the mirror lacks it"""
+        for url in self.candidates(style, name):
+            path = self.directory / mirror_path(url)
+            if not path.is_file():
+                continue
+            svg = path.read_text(encoding='utf-8')
+            match = _SVG.search(svg)
+            view_box = _VIEW_BOX.search(match.group(1)) if match else None
+            if view_box is None:
+                continue
+            comment = _COMMENT.search(match.group(2))
+            inner = _COMMENT.sub('', match.group(2)).strip()
+            return view_box.group(1), inner, comment.group(1).strip() if comment else None
+        return None
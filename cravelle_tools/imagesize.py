@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Image dimensions from the first bytes of a file, without decoding it
+
+PNG, GIF and WebP keep their size in a fixed header. A JPEG keeps it in its
+SOF segment, after the APPn segments (EXIF, ICC profiles), which are skipped
+by their length without being read. An EXIF orientation of 5-8 rotates the
+image by 90°, so its width and height are swapped, as browsers display it.
+An SVG gets its size from its width/height attributes, or else its viewBox.
+The format is taken from the magic bytes, not the file name.
+"""
+
+import re
+import struct
+
+SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg')
+
+SVG_HEAD = 4096
+
+# Start-of-frame markers; C4 (DHT), C8 (JPG) and CC (DAC) share the range but are not frames
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+_EXIF_ORIENTATION = 0x0112
+_SVG_TAG = re.compile(rb'<svg\b[^>]*>', re.IGNORECASE)
+_SVG_LENGTH = re.compile(r'^\s*([\d.]+)\s*(px)?\s*$')
+
+
+def _png(handle):
+    header = handle.read(24)
+    if header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    return None
+
+
+def _gif(handle):
+    header = handle.read(10)
+    if header[:4] == b'GIF8':
+        return struct.unpack('<HH', header[6:10])
+    return None
+
+
+def _webp(handle):
+    header = handle.read(30)
+    if header[:4] != b'RIFF' or header[8:12] != b'WEBP':
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        b0, b1, b2, b3 = header[21:25]
+        return 1 + (((b1 & 0x3F) << 8) | b0), 1 + (((b3 & 0x0F) << 10) | (b2 << 2) | ((b1 & 0xC0) >> 6))
+    if chunk == b'VP8X':
+        return 1 + int.from_bytes(header[24:27], 'little'), 1 + int.from_bytes(header[27:30], 'little')
+    return None
+
+
+def _exif_orientation(segment):
+    """Orientation tag of an APP1 Exif segment, or 1"""
+    tiff = segment[6:]
+    if len(tiff) < 8 or tiff[:2] not in (b'II', b'MM'):
+        return 1
+    order = '<' if tiff[:2] == b'II' else '>'
+    offset = struct.unpack(order + 'I', tiff[4:8])[0]
+    if offset + 2 > len(tiff):
+        return 1
+    count = struct.unpack(order + 'H', tiff[offset:offset + 2])[0]
+    for entry in range(offset + 2, min(offset + 2 + count * 12, len(tiff) - 11), 12):
+        tag, _, _ = struct.unpack(order + 'HHI', tiff[entry:entry + 8])
+        if tag == _EXIF_ORIENTATION:
+            return struct.unpack(order + 'H', tiff[entry + 8:entry + 10])[0]
+    return 1
+
+
+def _jpeg(handle):
+    if handle.read(2) != b'\xff\xd8':
+        return None
+    orientation = 1
+    while True:
+        byte = handle.read(1)
+        while byte == b'\xff':
+            marker = handle.read(1)
+            if marker != b'\xff':
+                break
+        else:
+            return None
+        if not marker or marker == b'\xda':  # start of scan: no frame header before the image data
+            return None
+        marker = marker[0]
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:  # restart markers and TEM carry no length
+            continue
+        length = struct.unpack('>H', handle.read(2))[0]
+        if marker in _SOF_MARKERS:
+            _, height, width = struct.unpack('>BHH', handle.read(5))
+            return (height, width) if orientation >= 5 else (width, height)
+        if marker == 0xE1:
+            segment = handle.read(length - 2)
+            if segment[:6] == b'Exif\x00\x00':
+                orientation = _exif_orientation(segment)
+        else:
+            handle.seek(length - 2, 1)
+
+
+def _svg_number(value):
+    match = _SVG_LENGTH.match(value or '')
+    return float(match.group(1)) if match else None
+
+
+def _svg(handle):
+    tag = _SVG_TAG.search(handle.read(SVG_HEAD))
+    if tag is None:
+        return None
+    attrs = dict(re.findall(r'([-\w:]+)\s*=\s*["\']([^"\']*)["\']', tag.group().decode('utf-8', errors='replace')))
+    width, height = _svg_number(attrs.get('width')), _svg_number(attrs.get('height'))
+    view_box = attrs.get('viewBox', '').replace(',', ' ').split()
+    if (width is None or height is None) and len(view_box) == 4:
+        box_width, box_height = float(view_box[2]), float(view_box[3])
+        if box_width and box_height:
+            if width is None and height is None:
+                width, height = box_width, box_height
+            elif width is None:
+                width = height * box_width / box_height
+            else:
+                height = width * box_height / box_width
+    if not width or not height:
+        return None
+    return round(width), round(height)
+
+
+def _reader(head, suffix):
+    """Header parser for a file's first bytes; the suffix is only trusted for SVG
+
+    Some images here are PNGs saved as .jpg (hero-banner.jpg), so the format comes from the magic bytes.
+    """
+    if head.startswith(b'\x89PNG'):
+        return _png
+    if head.startswith(b'GIF8'):
+        return _gif
+    if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+        return _webp
+    if head.startswith(b'\xff\xd8'):
+        return _jpeg
+    if suffix == '.svg' or head.lstrip().startswith(b'<'):
+        return _svg
+    return None
+
+
+def image_size(path):
+    """((width, height) or None, bytes read) for an image file, reading only its header"""
+    with open(path, 'rb') as handle:
+        reader = _reader(handle.read(12), path.suffix.lower())
+        if reader is None:
+            return None, handle.tell()
+        handle.seek(0)
+        try:
+            size = reader(handle)
+        except (struct.error, ValueError, IndexError):
+            size = None
+        return size, handle.tell()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Shared page blocks (nav, footer, contact form) kept in one place and spliced into every page
+
+A page marks a block with an include directive:
+
+    <!-- @include partials/nav.html -->
+
+Paths are relative to templates/. A partial can differ by context, which is
+the directory of the page ('root' for index.html, 'services' for the service
+pages): templates/partials/services/nav.html, when it exists, is used instead
+of templates/partials/nav.html on the service pages. Partials may include
+other partials.
+
+Resolving a directive writes the rendered partial after it, followed by a
+closing <!-- /@include partials/nav.html --> marker. The committed pages keep
+the rendered blocks, so they work as they are in the dev server, and
+resolving again replaces each block in place. Every partial is rendered once
+per context and then spliced in as text; the pages are never parsed.
+"""
+
+import re
+from pathlib import Path
+
+from .pages import discover_pages
+
+PARTIALS_DIR = 'templates'
+ROOT_CONTEXT = 'root'
+
+_DIRECTIVE = re.compile(
+    r'(?m)^([ \t]*)<!--\s*@include\s+([-\w./]+)\s*-->\n'
+    r'(?:.*?^[ \t]*<!--\s*/@include\s+\2\s*-->\n)?',
+    re.DOTALL,
+)
+# Rendered blocks, for stages that handle each distinct block once
+_BLOCK = re.compile(r'<!--\s*@include\s+([-\w./]+)\s*-->.*?<!--\s*/@include\s+\1\s*-->', re.DOTALL)
+_PLACEHOLDER = '<!-- @include-block {} -->'
+_PLACEHOLDER_PATTERN = re.compile(r'<!-- @include-block (\d+) -->')
+
+
+def context_for(page):
+    """'root' for pages in the site root, else the page's directory ('services')"""
+    directory = page.rpartition('/')[0]
+    return directory or ROOT_CONTEXT
+
+
+class Partials:
+    """Partials under one site root, each rendered once per context"""
+
+    def __init__(self, root='.'):
+        self.root = Path(root)
+        self.directory = self.root / PARTIALS_DIR
+        self._rendered = {}
+
+    def source(self, name, context):
+        """The context's variant of a partial when there is one, else the partial itself"""
+        folder, _, filename = name.rpartition('/')
+        variant = self.directory / folder / context / filename
+        path = variant if variant.is_file() else self.directory / name
+        if not path.is_file():
+            raise KeyError(f'Unknown partial: {name} (looked in {PARTIALS_DIR}/)')
+        return path
+
+    def render(self, name, context, stack=()):
+        """Partial text with its own directives resolved"""
+        key = (name, context)
+        if key not in self._rendered:
+            if name in stack:
+                raise ValueError(f'Include cycle: {" -> ".join(stack + (name,))}')
+            text = self.source(name, context).read_text(encoding='utf-8')
+            if text and not text.endswith('\n'):
+                text += '\n'
+            self._rendered[key] = self.resolve(text, context, stack + (name,))[0]
+        return self._rendered[key]
+
+    def resolve(self, content, context, stack=()):
+        """Content with every directive followed by its rendered block; returns (content, blocks)"""
+        count = 0
+
+        def splice(match):
+            nonlocal count
+            indent, name = match.groups()
+            count += 1
+            block = self.render(name, context, stack)
+            return f'{indent}<!-- @include {name} -->\n{block}{indent}<!-- /@include {name} -->\n'
+
+        return _DIRECTIVE.sub(splice, content), count
+
+    def resolve_page(self, content, page):
+        return self.resolve(content, context_for(page))
+
+    def update(self, pages=None, check=False, site=None):
+        """Resolve the directives of the site's pages in place; returns [(page, blocks, status)]
+
+        site is the tree holding the pages (a build output), by default the root.
+        Status is 'written', 'unchanged', or with check=True 'differs' (nothing is written).
+        """
+        site = self.root if site is None else Path(site)
+        if pages is None:
+            groups = discover_pages(site)
+            pages = groups['index'] + groups['services']
+        results = []
+        for page in pages:
+            path = site / page
+            current = path.read_text(encoding='utf-8')
+            content, blocks = self.resolve_page(current, page)
+            if content == current:
+                status = 'unchanged'
+            elif check:
+                status = 'differs'
+            else:
+                path.write_text(content, encoding='utf-8')
+                status = 'written'
+            results.append((page, blocks, status))
+        return results
+
+
+def split_blocks(content):
+    """Content with each rendered block swapped for a placeholder; returns (content, blocks)"""
+    blocks = []
+
+    def cut(match):
+        blocks.append(match.group())
+        return _PLACEHOLDER.format(len(blocks) - 1)
+
+    return _BLOCK.sub(cut, content), blocks
+
+
+def join_blocks(content, blocks):
+    return _PLACEHOLDER_PATTERN.sub(lambda match: blocks[int(match.group(1))], content)
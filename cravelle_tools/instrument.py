@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Per-rule instrumentation and collapsed-stack profiles for rewrite runs
+
+An instrumented run (engine.run(..., stats=True)) records one RuleStat per
+rule application: the page, the wall time of the rule alone, how many
+matches it hit, the page size before and after, and whether it changed
+anything. Matches count regex hits for text rules (re.sub/subn/search/...
+while the rule runs) and rules returned by StyleIndex lookups for CSS rules.
+Stats come back with each PageResult, so parallel runs report them too.
+
+`profile` runs a callable under cProfile or tracemalloc and writes
+collapsed stacks ("frame;frame;frame value" lines) that flamegraph.pl,
+speedscope or inferno read directly.
+"""
+
+import contextlib
+import cProfile
+import csv
+import json
+import pstats
+import re
+import time
+import tracemalloc
+from pathlib import Path
+
+from .css_index import StyleIndex
+
+FIELDS = ('page', 'rule', 'kind', 'wall_time', 'matches', 'bytes_in', 'bytes_out', 'delta', 'noop')
+
+
+class RuleStat:
+    """One rule applied to one page"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, page, rule, kind, wall_time, matches, bytes_in, bytes_out, noop):
+        self.page = page
+        self.rule = rule
+        self.kind = kind
+        self.wall_time = wall_time
+        self.matches = matches
+        self.bytes_in = bytes_in
+        self.bytes_out = bytes_out
+        self.delta = bytes_out - bytes_in
+        self.noop = noop
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+
+class _Counter:
+    hits = 0
+
+
+_counter = _Counter()
+
+
+def _counting(original, count):
+    def wrapper(*args, **kwargs):
+        result = original(*args, **kwargs)
+        _counter.hits += count(result)
+        return result
+    return wrapper
+
+
+def _counting_sub(original_subn):
+    def sub(pattern, repl, string, count=0, flags=0):
+        result, hits = original_subn(pattern, repl, string, count, flags)
+        _counter.hits += hits
+        return result
+    return sub
+
+
+@contextlib.contextmanager
+def counting():
+    """Count regex and StyleIndex matches made through the re module functions while active"""
+    originals = {name: getattr(re, name) for name in ('sub', 'subn', 'search', 'match', 'fullmatch', 'findall')}
+    original_find = StyleIndex.find
+    re.sub = _counting_sub(originals['subn'])
+    re.subn = _counting(originals['subn'], lambda result: result[1])
+    for name in ('search', 'match', 'fullmatch'):
+        setattr(re, name, _counting(originals[name], lambda result: result is not None))
+    re.findall = _counting(originals['findall'], len)
+    StyleIndex.find = _counting(original_find, len)
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(re, name, original)
+        StyleIndex.find = original_find
+
+
+def measure(rule, page):
+    """Apply one rule to a page and append its RuleStat to page.stats
+
+    Sizes are taken outside the timed region; for CSS rules that renders the
+    StyleIndex, which does not drop the parse the next CSS rule shares.
+    """
+    before = page.content
+    hits = _counter.hits
+    start = time.perf_counter()
+    rule.apply_to(page)
+    wall_time = time.perf_counter() - start
+    after = page.content
+    page.stats.append(RuleStat(
+        page.path, rule.name, rule.kind, wall_time, _counter.hits - hits,
+        len(before.encode('utf-8')), len(after.encode('utf-8')), after == before,
+    ))
+
+
+def write_report(stats, path):
+    """Write RuleStats as JSON or CSV, chosen by the file suffix"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == '.csv':
+        with path.open('w', newline='', encoding='utf-8') as handle:
+            writer = csv.DictWriter(handle, FIELDS)
+            writer.writeheader()
+            writer.writerows(stat.as_dict() for stat in stats)
+    else:
+        path.write_text(json.dumps([stat.as_dict() for stat in stats], indent=1), encoding='utf-8')
+    return path
+
+
+def summarize(stats):
+    """Per-rule totals, slowest first: [(rule, calls, wall_time, matches, noops, delta)]"""
+    totals = {}
+    for stat in stats:
+        calls, wall_time, matches, noops, delta = totals.get(stat.rule, (0, 0.0, 0, 0, 0))
+        totals[stat.rule] = (
+            calls + 1, wall_time + stat.wall_time, matches + stat.matches, noops + stat.noop, delta + stat.delta,
+        )
+    return sorted(((rule,) + values for rule, values in totals.items()), key=lambda row: -row[2])
+
+
+def _frame(func):
+    filename, line, name = func
+    return f'{Path(filename).name}:{line}:{name}' if line else name
+
+
+def _collapsed_cpu(profiler):
+    """Collapsed stacks (microseconds of self time) from a cProfile call graph
+
+    cProfile keeps caller -> callee edges, not whole stacks, so each edge's
+    self time is attributed along every path that reaches it; recursion is
+    cut at the first repeat.
+    """
+    stats = pstats.Stats(profiler).stats
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge))
+    roots = [func for func, (_, _, _, _, callers) in stats.items() if not callers]
+    lines = {}
+
+    def walk(func, stack, self_time):
+        stack = stack + [_frame(func)]
+        key = ';'.join(stack)
+        lines[key] = lines.get(key, 0) + self_time
+        for callee, (_, _, edge_self, _) in callees.get(func, ()):
+            if _frame(callee) not in stack:
+                walk(callee, stack, edge_self)
+
+    for root in roots:
+        walk(root, [], stats[root][2])
+    return {stack: round(seconds * 1e6) for stack, seconds in lines.items() if round(seconds * 1e6)}
+
+
+def _collapsed_memory(snapshot):
+    """Collapsed stacks (bytes still allocated at the end) from a tracemalloc snapshot"""
+    lines = {}
+    for stat in snapshot.statistics('traceback'):
+        # Traceback frames run from the oldest call to the allocation, as collapsed stacks expect
+        key = ';'.join(f'{Path(frame.filename).name}:{frame.lineno}' for frame in stat.traceback)
+        lines[key] = lines.get(key, 0) + stat.size
+    return lines
+
+
+def profile(fn, mode, out):
+    """Run fn() under cProfile ('cpu') or tracemalloc ('memory'); write collapsed stacks to out
+
+    Returns fn's result.
+    """
+    if mode == 'cpu':
+        profiler = cProfile.Profile()
+        result = profiler.runcall(fn)
+        lines = _collapsed_cpu(profiler)
+    elif mode == 'memory':
+        tracemalloc.start(64)
+        try:
+            result = fn()
+            lines = _collapsed_memory(tracemalloc.take_snapshot())
+        finally:
+            tracemalloc.stop()
+    else:
+        raise ValueError(f'Unknown profile mode: {mode}')
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(''.join(f'{stack} {value}\n' for stack, value in sorted(lines.items())), encoding='utf-8')
+    return result
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Rendered <img> sizes as far as the page's CSS fixes them in pixels
+
+No layout engine: for each image (and its ancestors) the width, height,
+max-width, max-height and grid-template-columns declarations of the rules
+that match it are collected, per `@media (max-width: Npx)` breakpoint, and
+resolved by specificity and source order. That is enough for the cases the
+image stages care about:
+
+- a pixel width, or a pixel height with width left to the aspect ratio
+  (.nav__logo{height:48px} and its smaller mobile heights), percentages
+  included when the parent has a pixel size (.logo-loop-item img);
+- a cell of a `repeat(auto-fit|auto-fill, minmax(Npx, 1fr))` grid, which is
+  never wider than 2N px once a second column fits.
+
+Other media conditions and !important are ignored.
+"""
+
+import re
+
+from . import dom
+from .css_index import StyleIndex
+
+SIZE_PROPERTIES = ('width', 'height', 'max-width', 'max-height', 'grid-template-columns')
+
+_IMG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+# <img> text inside these is not markup (the element tree skips it too)
+_RAW_TEXT = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_BREAKPOINT = re.compile(r'^@media\s+(?:(?:only\s+)?screen\s+and\s+)?\(\s*max-width\s*:\s*(\d+(?:\.\d+)?)px\s*\)$', re.IGNORECASE)
+_DECLARATION = re.compile(r'(?:^|;)\s*([-\w]+)\s*:\s*([^;]+)')
+_PIXELS = re.compile(r'^(\d+(?:\.\d+)?)px$')
+_PERCENT = re.compile(r'^(\d+(?:\.\d+)?)%$')
+_AUTO_GRID = re.compile(r'repeat\(\s*auto-(?:fit|fill)\s*,\s*minmax\(\s*(\d+(?:\.\d+)?)px\s*,\s*1fr\s*\)\s*\)')
+_PSEUDO_ELEMENT = re.compile(r'::?(?:before|after|placeholder|marker|selection)\b', re.IGNORECASE)
+_ID = re.compile(r'#[-\w]+')
+_CLASS_LIKE = re.compile(r'\.[-\w]+|\[[^\]]*\]|(?<!:):(?!not\b|is\b|where\b)[-\w]+')
+_TYPE = re.compile(r'(?:^|[\s>+~(])([a-zA-Z][-\w]*)')
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
+def img_tags(content):
+    """<img> tag matches outside script and style blocks, in document order"""
+    skipped = [match.span() for match in _RAW_TEXT.finditer(content)]
+    return [
+        match for match in _IMG.finditer(content)
+        if not any(start <= match.start() < end for start, end in skipped)
+    ]
+
+
+def aligned_images(content):
+    """(tag matches, img elements, root) of a page; the elements are None when the regex and the parser disagree"""
+    root = dom.parse_html(content)
+    elements = [element for element in root.iter() if element.tag == 'img']
+    tags = img_tags(content)
+    aligned = len(elements) == len(tags) and all(
+        (dom.tag_attributes(tag.group()).get('src') or '') == (element.attrs.get('src') or '')
+        for tag, element in zip(tags, elements)
+    )
+    return tags, (elements if aligned else None), root
+
+
+def specificity(selector):
+    """(ids, classes/attributes/pseudo-classes, types) of one complex selector"""
+    return (
+        len(_ID.findall(selector)),
+        len(_CLASS_LIKE.findall(selector)),
+        len([name for name in _TYPE.findall(selector) if name.lower() not in ('not', 'is', 'where')]),
+    )
+
+
+def _collect(css, elements, found, breakpoint, order):
+    for rule in StyleIndex.parse(css, css=True, nested=False).rules:
+        prelude = rule.selector
+        if prelude.startswith('@'):
+            match = _BREAKPOINT.match(' '.join(prelude.split()))
+            if match and breakpoint is None:
+                _collect(rule.body, elements, found, float(match.group(1)), order)
+            elif prelude.split()[0].lower() in ('@supports', '@layer'):
+                _collect(rule.body, elements, found, breakpoint, order)
+            continue
+        declarations = [
+            (name.lower(), value.strip())
+            for name, value in _DECLARATION.findall(_COMMENT.sub('', rule.body))
+            if name.lower() in SIZE_PROPERTIES
+        ]
+        if not declarations:
+            continue
+        order[0] += 1
+        for selector in dom.split_selector_list(prelude):
+            if _PSEUDO_ELEMENT.search(selector):
+                continue
+            for element in elements:
+                if dom.matches(selector, element, dynamic=False):
+                    weight = specificity(selector)
+                    found.setdefault(element.index, []).extend(
+                        (breakpoint, weight, order[0], name, value) for name, value in declarations
+                    )
+
+
+def declared_sizes(stylesheets, elements):
+    """{element index: [(max-width breakpoint or None, specificity, order, property, value)]}
+
+    elements should include the ancestors whose grids matter; stylesheets are CSS texts in cascade order.
+    """
+    found = {}
+    order = [0]
+    for css in stylesheets:
+        _collect(css, elements, found, None, order)
+    return found
+
+
+def _cascade(entries, breakpoint):
+    """{property: value} that applies at viewports just under breakpoint (None: wider than every breakpoint)"""
+    applying = [
+        entry for entry in entries
+        if entry[0] is None or (breakpoint is not None and entry[0] >= breakpoint)
+    ]
+    values = {}
+    for _, _, _, name, value in sorted(applying, key=lambda entry: (entry[1], entry[2])):
+        values[name] = value
+    return values
+
+
+def _pixels(value):
+    match = _PIXELS.match(value or '')
+    return float(match.group(1)) if match else None
+
+
+def _resolve(values, parent):
+    """Percentages made pixels against the parent's pixel width/height where it has one"""
+    resolved = dict(values)
+    for name, value in values.items():
+        match = _PERCENT.match(value)
+        basis = _pixels(parent.get('height' if name.endswith('height') else 'width'))
+        if match and basis is not None:
+            resolved[name] = f'{basis * float(match.group(1)) / 100:g}px'
+    return resolved
+
+
+def _width(values, size):
+    """CSS pixel width from resolved declarations and the natural size, or None"""
+    width = _pixels(values.get('width'))
+    if width is None and values.get('width', 'auto') == 'auto' and size:
+        height = _pixels(values.get('height'))
+        if height is not None:
+            width = height * size[0] / size[1]
+        elif values.get('height', 'auto') == 'auto' and _pixels(values.get('max-height')) is not None:
+            # Natural size, shrunk to fit the maximum height
+            width = min(size[0], _pixels(values['max-height']) * size[0] / size[1])
+    cap = _pixels(values.get('max-width'))
+    if width is not None and cap is not None:
+        width = min(width, cap)
+    return width
+
+
+def breakpoints(entries):
+    return sorted({entry[0] for entry in entries if entry[0] is not None})
+
+
+def css_widths(entries, size, parent_entries=()):
+    """[(breakpoint or None, px width)] narrowest first, or None when the CSS does not fix the width"""
+    widths = [
+        (point, _width(_resolve(_cascade(entries, point), _cascade(parent_entries, point)), size))
+        for point in breakpoints(entries) + [None]
+    ]
+    if any(width is None for _, width in widths):
+        return None
+    return widths
+
+
+def height_constrained(entries, parent_entries=()):
+    """True when at some breakpoint the CSS limits the height in px but leaves the width auto
+
+    The width then follows from the height and the aspect ratio, and a width
+    attribute would override it (.nav__logo{height:48px} would render 3200px wide).
+    """
+    for point in breakpoints(entries) + [None]:
+        values = _resolve(_cascade(entries, point), _cascade(parent_entries, point))
+        if values.get('width', 'auto') == 'auto' and (
+            _pixels(values.get('height')) is not None or _pixels(values.get('max-height')) is not None
+        ):
+            return True
+    return False
+
+
+def grid_bound(element, found):
+    """Widest a grid cell holding the element gets, in px, for auto-fit/auto-fill minmax(Npx, 1fr) grids"""
+    for ancestor in element.ancestors():
+        columns = _cascade(found.get(ancestor.index, []), None).get('grid-template-columns')
+        if columns is None:
+            continue
+        match = _AUTO_GRID.search(columns)
+        return 2 * float(match.group(1)) if match else None
+    return None
+
+
+def sizes_attribute(element, found, size, width_attribute=''):
+    """A sizes value for an <img>: from its CSS width, its width attribute or its grid; None if unknown"""
+    entries = found.get(element.index, [])
+    parent = found.get(element.parent.index, []) if element.parent is not None else []
+    widths = css_widths(entries, size, parent) if entries else None
+    if widths:
+        parts = []
+        for position, (point, width) in enumerate(widths):
+            # A breakpoint whose width equals the next wider one adds nothing
+            if point is not None and round(width) == round(widths[position + 1][1]):
+                continue
+            parts.append(f'(max-width: {point:g}px) {round(width)}px' if point is not None else f'{round(width)}px')
+        return ', '.join(parts)
+    if width_attribute.isdigit():
+        return f'(max-width: {width_attribute}px) 100vw, {width_attribute}px'
+    bound = grid_bound(element, found)
+    if bound is not None:
+        return f'(max-width: {bound:g}px) 100vw, {bound:g}px'
+    return None
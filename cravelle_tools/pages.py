@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Page discovery and read-once / write-once page buffers"""
+
+from pathlib import Path
+
+from .css_index import StyleIndex
+
+SERVICES_DIR = 'services'
+INDEX_PAGE = 'index.html'
+
+
+def discover_pages(root='.'):
+    """Find the site pages once and group them the way the rules target them"""
+    root = Path(root)
+    services = sorted(
+        p.relative_to(root).as_posix()
+        for p in (root / SERVICES_DIR).glob('*.html')
+    )
+    index = [INDEX_PAGE] if (root / INDEX_PAGE).exists() else []
+    return {
+        'services': services,
+        'index': index,
+    }
+
+
+def resolve_targets(targets, groups, exclude=()):
+    """Expand group names ('services', 'index') and literal paths into page paths"""
+    resolved = []
+    for target in targets:
+        for path in groups.get(target, [target]):
+            if path not in exclude and path not in resolved:
+                resolved.append(path)
+    return resolved
+
+
+class Page:
+    """In-memory copy of one file, read once and written back at most once
+
+    `styles` is a StyleIndex parsed on first use. CSS rules edit it in place and
+    the text is only re-rendered when a plain-text rule asks for `content`, so a
+    run of consecutive CSS rules shares a single parse.
+    """
+
+    def __init__(self, path, content):
+        self.path = path
+        self.original = content
+        self._content = content
+        self._styles = None
+        # A list when the run is instrumented: Rule.run appends a RuleStat per application
+        self.stats = None
+
+    @property
+    def content(self):
+        if self._styles is not None and self._styles.dirty:
+            self._content = self._styles.render()
+            self._styles.dirty = False
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        if value is not self._content:
+            self._content = value
+            self._styles = None
+
+    @property
+    def styles(self):
+        if self._styles is None:
+            self._styles = StyleIndex.parse(self.content, css=self.path.endswith('.css'))
+        return self._styles
+
+    @property
+    def changed(self):
+        return self.content != self.original
+
+
+class PageStore:
+    """Loads pages lazily under a root directory and counts the file I/O it does"""
+
+    def __init__(self, root='.'):
+        self.root = Path(root)
+        self.pages = {}
+        self.reads = 0
+        self.writes = 0
+
+    def get(self, path):
+        """Return the buffered page, reading it from disk on first access"""
+        if path in self.pages:
+            return self.pages[path]
+        file_path = self.root / path
+        if not file_path.exists():
+            self.pages[path] = None
+            return None
+        page = Page(path, file_path.read_text(encoding='utf-8'))
+        self.reads += 1
+        self.pages[path] = page
+        return page
+
+    def write(self, page):
+        """Write one page back to disk"""
+        (self.root / page.path).write_text(page.content, encoding='utf-8')
+        page.original = page.content
+        self.writes += 1
@@ -0,0 +1,24 @@
+"""Built-in rule sets, one per former standalone script
+
+Import order is run order: theme/markup updates first, then the style
+fixes, then the hero/body consolidation and the final cleanup.
+"""
+
+from . import (  # noqa: F401
+    update_service_pages,
+    update_iridescence,
+    fix_service_pages,
+    fix_hero_sections,
+    add_glass_to_cards,
+    fix_white_areas,
+    fix_gradient_text,
+    fix_all_white_boxes,
+    add_spotlight_script,
+    remove_h3_gradients,
+    fix_service_navigation,
+    fix_navigation_styles,
+    fix_all_issues,
+    fix_comprehensive,
+    fix_hero_titles,
+    fix_final_cleanup,
+)
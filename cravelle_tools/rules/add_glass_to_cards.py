@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""Add glass morphism to feature cards"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'add_glass_to_cards',
+    'Add glass morphism to feature cards',
+))
+
+
+@rules.rule(reads=('.feature-card',), writes=('.feature-card',))
+def feature_card_glass(content):
+    """Replace feature-card background with glass morphism"""
+    return re.sub(
+        r'(\.feature-card\s*\{\s*)(background:\s*var\(--pearl\);)',
+        r'\1background: rgba(245, 245, 247, 0.6);\n      backdrop-filter: blur(10px);\n      -webkit-backdrop-filter: blur(10px);',
+        content
+    )
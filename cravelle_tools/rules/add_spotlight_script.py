@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Add spotlight cards script to service pages"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'add_spotlight_script',
+    'Load spotlight-cards.js and slow the iridescence down with mouse tracking',
+))
+
+
+@rules.rule(reads=('<scripts>',), writes=('<scripts>',))
+def spotlight_script(content):
+    """Add spotlight cards script if not present"""
+    if 'spotlight-cards.js' not in content:
+        content = re.sub(
+            r'(<script type="module" src="/src/js/form-handler\.js"></script>)',
+            r'\1\n  <script type="module" src="/src/js/spotlight-cards.js"></script>',
+            content
+        )
+    return content
+
+
+@rules.rule(reads=('<scripts>',), writes=('<scripts>',))
+def iridescence_options(content):
+    """Update iridescence initialization to use slower speed and mouse tracking"""
+    return re.sub(
+        r'initIridescence\(\'body\',\s*\{[^}]+\}\)',
+        r'''initIridescence('body', {
+        color: [1, 1, 1],
+        speed: 0.3,
+        amplitude: 0.3,
+        mouseReact: true
+      })''',
+        content
+    )
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Snippets shared by more than one rule set"""
+
+import re
+
+CLEAN_BODY = '''body {
+      background: var(--charcoal);
+      font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+      color: var(--text);
+      overflow-x: hidden;
+      line-height: 1.6;
+      position: relative;
+      margin: 0;
+      padding: 0;
+    }'''
+
+
+def block_at(match):
+    """Text of the CSS block a regex match starts in, from the match to the block's closing brace
+
+    Rules that add declarations check it first, so running them again leaves the page as it is.
+    """
+    end = match.string.find('}', match.end())
+    return match.string[match.start():end + 1 if end >= 0 else len(match.string)]
+
+
+def insert_clean_body(content):
+    """Insert the consolidated body rule after the :root block"""
+    return re.sub(
+        r'(:root \{[^}]*\})',
+        r'\1\n\n    ' + CLEAN_BODY,
+        content,
+        count=1,
+        flags=re.DOTALL
+    )
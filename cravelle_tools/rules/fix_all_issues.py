@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Fix white boxes, center titles, and fix contact section backgrounds"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'fix_all_issues',
+    'Remove section--light, center section headers, black contact background',
+))
+
+
+@rules.rule(targets=('index',), reads=('<section>',), writes=('<section>',))
+def section_light(content):
+    """Remove section--light class from index.html to fix white boxes"""
+    return re.sub(r'\s*section--light', '', content)
+
+
+@rules.rule(
+    reads=('.section-header', '.gallery-section .section-header'),
+    writes=('.section-header', '.gallery-section .section-header'),
+)
+def section_header(content):
+    """Fix section-header to ensure proper centering"""
+    return re.sub(
+        r'\.section-header \{[^}]*\}',
+        '''.section-header {
+      text-align: center;
+      max-width: 700px;
+      margin: 0 auto 60px;
+    }''',
+        content,
+        flags=re.DOTALL
+    )
+
+
+@rules.rule(reads=('.cta-section',), writes=('.cta-section',))
+def cta_background(content):
+    """Fix contact section background to black instead of blue gradient"""
+    return re.sub(
+        r'\.cta-section \{\s*padding: 100px 5%;[^}]*background:[^;]*;',
+        '''.cta-section {
+      padding: 100px 5%;
+      background: rgba(10, 10, 10, 0.95);
+      backdrop-filter: blur(20px);
+      -webkit-backdrop-filter: blur(20px);''',
+        content,
+        flags=re.DOTALL
+    )
+
+
+@rules.rule(reads=('+.section-header h2',), overwrites=('.section-header h2',))
+def section_header_h2(content):
+    """Ensure .section-header h2 is centered"""
+    if '.section-header h2 {' in content:
+        content = re.sub(
+            r'\.section-header h2 \{[^}]*\}',
+            '''.section-header h2 {
+      font-family: 'Playfair Display', serif;
+      font-size: clamp(2rem, 4vw, 3rem);
+      font-weight: 700;
+      margin-bottom: 16px;
+      text-align: center;
+    }''',
+            content,
+            flags=re.DOTALL
+        )
+    return content
+
+
+@rules.rule(
+    reads=('+.gallery-section .section-header',),
+    overwrites=('.gallery-section .section-header',),
+)
+def gallery_section_header(content):
+    """Make sure gallery section headers are centered"""
+    return re.sub(
+        r'\.gallery-section \.section-header \{[^}]*\}',
+        '''.gallery-section .section-header {
+      text-align: center;
+      max-width: 700px;
+      margin: 0 auto 60px;
+    }''',
+        content,
+        flags=re.DOTALL
+    )
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Fix all white boxes and darken feature cards"""
+
+import re
+
+from ..engine import RuleSet, register
+from .common import block_at
+
+rules = register(RuleSet(
+    'fix_all_white_boxes',
+    'Dark feature cards with spotlight, dark contact section, footer without gap',
+))
+
+FEATURE_CARD = '''.feature-card {
+      position: relative;
+      background: rgba(17, 17, 17, 0.9);
+      border: 1px solid rgba(255, 255, 255, 0.1);
+      backdrop-filter: blur(10px);
+      -webkit-backdrop-filter: blur(10px);
+      overflow: hidden;
+      --mouse-x: 50%;
+      --mouse-y: 50%;'''
+
+
+@rules.rule(reads=('.feature-card',), writes=('.feature-card',))
+def feature_card_dark(content):
+    """Change feature cards from light to very dark with spotlight effect"""
+    return re.sub(
+        r'\.feature-card\s*\{[^}]*background:[^;]+;[^}]*backdrop-filter:[^;]+;[^}]*-webkit-backdrop-filter:[^;]+;',
+        lambda m: m.group() if '--mouse-x' in block_at(m) else FEATURE_CARD,
+        content,
+        flags=re.DOTALL
+    )
+
+
+@rules.rule(
+    reads=('+.feature-card:hover', '+.feature-card::before'),
+    writes=('.feature-card::before', '+.feature-card::before', '.feature-card:hover::before', '+.feature-card:hover::before', 'ws'),
+)
+def feature_card_spotlight(content):
+    """Add spotlight effect to feature cards"""
+    if '.feature-card:hover {' in content and '.feature-card::before' not in content:
+        content = re.sub(
+            r'(\.feature-card:hover\s*\{)',
+            r'''.feature-card::before {
+      content: '';
+      position: absolute;
+      top: 0;
+      left: 0;
+      right: 0;
+      bottom: 0;
+      background: radial-gradient(circle at var(--mouse-x) var(--mouse-y), rgba(201, 169, 97, 0.15), transparent 80%);
+      opacity: 0;
+      transition: opacity 0.5s ease;
+      pointer-events: none;
+    }
+
+    .feature-card:hover::before {
+      opacity: 1;
+    }
+
+    \1''',
+            content,
+            count=1
+        )
+    return content
+
+
+@rules.rule(reads=('+#contact',), overwrites=('#contact',))
+def contact_background(content):
+    """Fix contact section background"""
+    return re.sub(
+        r'#contact\s*\{[^}]*\}',
+        r'''#contact {
+      padding: 100px 5% 0;
+      background: rgba(10, 10, 10, 0.95);
+      margin: 0;
+    }''',
+        content
+    )
+
+
+@rules.rule(reads=('+footer',), writes=('footer', '+footer', 'ws'))
+def footer_gap(content):
+    """Ensure footer has no gap"""
+    if 'footer {' not in content:
+        content = re.sub(
+            r'</style>',
+            r'''    footer {
+      margin: 0;
+      padding: 40px 5%;
+      background: var(--charcoal);
+    }
+  </style>''',
+            content,
+            count=1
+        )
+    return content
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Comprehensive fix: alignment, gaps, and color consistency"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'fix_comprehensive',
+    'Alignment, gaps, and color consistency',
+))
+
+GRADIENT_CSS = 'src/css/components/gradient-text.css'
+
+
+@rules.css_rule(
+    targets=(GRADIENT_CSS,),
+    reads=('+.gradient-text--default',),
+    overwrites=('.gradient-text--default',),
+)
+def gradient_default_gold(styles):
+    """Update gradient-text--default to use elegant gold instead of rainbow"""
+    styles.replace('.gradient-text--default', '''.gradient-text--default {
+  background: linear-gradient(
+    to right,
+    #C9A961 0%,
+    #D4AF37 25%,
+    #F4D03F 50%,
+    #D4AF37 75%,
+    #C9A961 100%
+  );
+  background-size: 200% auto;
+}''')
+
+
+@rules.css_rule(reads=('+.section-header',), overwrites=('.section-header',))
+def section_header(styles):
+    """Fix section-header alignment - ensure proper centering"""
+    styles.replace('.section-header', '''.section-header {
+      text-align: center;
+      max-width: 700px;
+      margin: 0 auto 60px;
+    }''')
+
+
+@rules.css_rule(reads=('+.section-header h2',), overwrites=('.section-header h2',))
+def section_header_h2(styles):
+    """Fix section-header h2 alignment"""
+    styles.replace('.section-header h2', '''.section-header h2 {
+      font-family: 'Playfair Display', serif;
+      font-size: clamp(2rem, 4vw, 3rem);
+      font-weight: 700;
+      margin-bottom: 16px;
+      text-align: center;
+    }''')
+
+
+@rules.css_rule(
+    reads=('+.gallery-section .section-header',),
+    overwrites=('.gallery-section .section-header',),
+)
+def gallery_section_header(styles):
+    """Fix gallery section header alignment"""
+    styles.replace('.gallery-section .section-header', '''.gallery-section .section-header {
+      text-align: center;
+      max-width: 700px;
+      margin: 0 auto 60px;
+    }''')
+
+
+@rules.css_rule(reads=('+footer',), overwrites=('footer',))
+def footer(styles):
+    """Fix footer to remove gap below contact section"""
+    styles.replace('footer', '''footer {
+      background-color: var(--charcoal);
+      color: var(--platinum);
+      text-align: center;
+      padding: 40px 5%;
+      font-size: 14px;
+      margin: 0;
+    }''')
+
+
+@rules.css_rule(reads=('body',), writes=('body',))
+def body_margins(styles):
+    """Fix body to prevent gaps"""
+    for rule in styles.find('body'):
+        if 'margin: 0;' in rule.body and 'padding: 0;' in rule.body:
+            continue
+        styles.set_body(rule, '\n' + rule.body.strip() + '\n      margin: 0;\n      padding: 0;\n    ')
+
+
+@rules.css_rule(reads=('.cta-section',), writes=('.cta-section',))
+def cta_margin(styles):
+    """Ensure CTA section has no bottom margin"""
+    for rule in styles.find('.cta-section'):
+        before, found, after = rule.body.rpartition('padding: 100px 5%;')
+        if found:
+            styles.set_body(rule, before + 'padding: 100px 5% 80px 5%;\n      margin: 0;' + after)
+
+
+@rules.rule(reads=('<h2>',), writes=('<h2>',))
+def gold_section_titles(content):
+    """Update gradient colors to match elegant palette across all gradients"""
+    return re.sub(
+        r'<h2 class="gradient-text gradient-text--default"',
+        '<h2 class="gradient-text gradient-text--gold"',
+        content
+    )
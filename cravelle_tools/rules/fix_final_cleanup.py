@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Final cleanup: remove duplicate rules and extra whitespace"""
+
+import re
+
+from ..engine import RuleSet, register
+from .common import insert_clean_body
+
+rules = register(RuleSet(
+    'fix_final_cleanup',
+    'Remove duplicate body rules, empty comment blocks and extra whitespace',
+))
+
+
+@rules.rule(reads=('ws',), writes=('ws',))
+def blank_lines(content):
+    """Remove extra whitespace between CSS rules (more than 2 newlines)"""
+    return re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+
+
+@rules.rule(reads=('+body', '+:root'), writes=('+body', 'ws'), overwrites=('body',))
+def consolidate_body(content):
+    """Remove all body rules, keeping only one consolidated version"""
+    if re.search(r'body \{[^}]*\}', content, flags=re.DOTALL):
+        content = re.sub(r'body \{[^}]*\}', '', content, flags=re.DOTALL)
+        content = insert_clean_body(content)
+    return content
+
+
+@rules.rule
+def empty_comment_blocks(content):
+    """Remove empty comment blocks"""
+    content = re.sub(r'/\* Language Dropdown \(minimal styles\) \*/\s*(?=/\*|\.|\[)', '', content)
+    return re.sub(r'\[dir="rtl"\]\s*(?=/\*|\.)', '', content)
+
+
+@rules.rule(reads=('ws',), writes=('ws',))
+def trailing_blank_lines(content):
+    """Clean up extra whitespace again after removals"""
+    return re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
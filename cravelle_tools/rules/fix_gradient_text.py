@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Fix service pages to properly support gradient text by updating inline styles"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'fix_gradient_text',
+    'Stop section/feature heading colours from overriding gradient text',
+))
+
+# Fix section-header h2 to not override gradient text
+OLD_SECTION_HEADER_H2 = r'\.section-header h2 \{[^}]*color: var\(--accent\);[^}]*\}'
+NEW_SECTION_HEADER_H2 = '''.section-header h2 {
+      font-family: 'Playfair Display', serif;
+      font-size: clamp(2rem, 4vw, 3rem);
+      font-weight: 700;
+      margin-bottom: 16px;
+    }
+    
+    .section-header h2:not(.gradient-text) {
+      color: var(--accent);
+    }'''
+
+# Fix feature-card h3 to not override gradient text
+OLD_FEATURE_H3 = r'\.feature-card h3 \{[^}]*color: var\(--accent\);[^}]*\}'
+NEW_FEATURE_H3 = '''.feature-card h3 {
+      font-family: 'Playfair Display', serif;
+      font-size: 1.5rem;
+      font-weight: 600;
+      margin-bottom: 12px;
+    }
+    
+    .feature-card h3:not(.gradient-text) {
+      color: var(--accent);
+    }'''
+
+
+@rules.rule(
+    reads=('.section-header h2',),
+    writes=('.section-header h2', '.section-header h2:not(.gradient-text)', '+.section-header h2:not(.gradient-text)', 'ws'),
+)
+def section_header_h2(content):
+    """Fix section-header h2"""
+    return re.sub(OLD_SECTION_HEADER_H2, NEW_SECTION_HEADER_H2, content, flags=re.DOTALL)
+
+
+@rules.rule(
+    reads=('.feature-card h3',),
+    writes=('.feature-card h3', '.feature-card h3:not(.gradient-text)', '+.feature-card h3:not(.gradient-text)', 'ws'),
+)
+def feature_card_h3(content):
+    """Fix feature-card h3"""
+    return re.sub(OLD_FEATURE_H3, NEW_FEATURE_H3, content, flags=re.DOTALL)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Fix hero sections: remove backgrounds, ensure dark theme"""
+
+import re
+
+from ..engine import RuleSet, register
+from .common import block_at
+
+rules = register(RuleSet(
+    'fix_hero_sections',
+    'Remove hero backgrounds and apply consistent hero layout',
+))
+
+HERO_LAYOUT = '''
+      display: flex;
+      align-items: center;
+      justify-content: center;
+      min-height: 60vh;
+      padding: 120px 5% 80px;
+      text-align: center;
+      position: relative;'''
+LAYOUT_PROPERTIES = re.findall(r'([-\w]+):', HERO_LAYOUT)
+
+
+def has_layout(block):
+    """True when a .hero block already declares every property of the consistent layout
+
+    The generated service pages set them with their own values (padding: 130px 5% 90px).
+    """
+    return all(re.search(rf'(?<![-\w]){name}\s*:', block) for name in LAYOUT_PROPERTIES)
+
+
+@rules.rule(reads=('.hero',), writes=('.hero',))
+def hero_background_url(content):
+    """Remove any remaining background images from hero"""
+    return re.sub(
+        r'(\.hero\s*\{[^}]*?)background:[^;]+url\([^)]+\)[^;]*;',
+        r'\1',
+        content,
+        flags=re.DOTALL
+    )
+
+
+@rules.rule(reads=('.hero',), writes=('.hero',))
+def hero_min_height(content):
+    """Drop min-height from hero rules before the consistent block is added"""
+    return re.sub(
+        r'\.hero\s*\{[^}]*\}',
+        lambda m: m.group(0) if has_layout(m.group(0)) else re.sub(r'min-height:[^;]+;', '', m.group(0)),
+        content,
+        flags=re.DOTALL
+    )
+
+
+@rules.rule(reads=('.hero',), writes=('.hero',))
+def hero_layout(content):
+    """Add consistent hero styling"""
+    match = re.search(r'\.hero\s*\{', content)
+    if '.hero {' not in content or match is None or has_layout(block_at(match)):
+        return content
+    return content[:match.end()] + HERO_LAYOUT + content[match.end():]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Fix hero section titles and styling in all service pages"""
+
+import re
+
+from ..engine import RuleSet, register
+from .common import CLEAN_BODY
+
+rules = register(RuleSet(
+    'fix_hero_titles',
+    'Clean hero CSS, title alignment and spacing',
+))
+
+HERO_CSS = '''.hero {
+      position: relative;
+      overflow: hidden;
+      padding: 100px 5% 80px;
+      text-align: center;
+      display: flex;
+      align-items: center;
+      justify-content: center;
+      min-height: 60vh;
+    }'''
+
+HERO_H1_CSS = '''
+    .hero h1 {
+      font-family: 'Playfair Display', serif;
+      font-size: clamp(2.5rem, 5vw, 4rem);
+      font-weight: 700;
+      color: #ffffff;
+      text-shadow: 0 2px 12px rgba(0,0,0,0.45);
+      margin-bottom: 24px;
+      line-height: 1.2;
+      text-align: center;
+    }'''
+
+HERO_CONTENT_CSS = '''
+    .hero-content {
+      max-width: 800px;
+      position: relative;
+      z-index: 1;
+    }'''
+
+HERO_P_CSS = '''
+    .hero p {
+      font-size: clamp(1.1rem, 2vw, 1.25rem);
+      color: rgba(255,255,255,0.92);
+      text-shadow: 0 1px 8px rgba(0,0,0,0.35);
+      margin-bottom: 40px;
+      line-height: 1.8;
+      text-align: center;
+    }'''
+
+HERO_CTA_CSS = '''
+    .hero-cta {
+      display: inline-flex;
+      gap: 16px;
+      flex-wrap: wrap;
+      justify-content: center;
+    }'''
+
+
+@rules.css_rule(reads=('.hero',), writes=('.hero',))
+def hero(styles):
+    """Replace the /* Hero Section */ .hero rule with the clean version"""
+    for rule in styles.find('.hero'):
+        if rule.comment == 'Hero Section':
+            styles.replace_rule(rule, HERO_CSS)
+
+
+@rules.css_rule(
+    reads=('+.hero h1', '+.hero::before'),
+    writes=('+.hero h1', 'ws'),
+    overwrites=('.hero h1',),
+)
+def hero_h1(styles):
+    """Ensure hero h1 has proper styling"""
+    if not styles.replace('.hero h1', HERO_H1_CSS):
+        # Add after hero section if not present
+        for rule in styles.find('.hero::before'):
+            styles.insert_after(rule, '\n' + HERO_H1_CSS)
+
+
+@rules.css_rule(reads=('+.hero-content',), writes=('ws',), overwrites=('.hero-content',))
+def hero_content(styles):
+    """Fix hero-content styling"""
+    styles.replace('.hero-content', HERO_CONTENT_CSS)
+
+
+@rules.css_rule(reads=('+.hero p',), writes=('ws',), overwrites=('.hero p',))
+def hero_p(styles):
+    """Ensure hero paragraph has proper spacing"""
+    styles.replace('.hero p', HERO_P_CSS)
+
+
+@rules.css_rule(reads=('+.hero-cta',), writes=('ws',), overwrites=('.hero-cta',))
+def hero_cta(styles):
+    """Fix hero-cta styling"""
+    styles.replace('.hero-cta', HERO_CTA_CSS)
+
+
+@rules.css_rule(reads=('body', '+body', '+:root'), writes=('body', '+body', 'ws'))
+def duplicate_body(styles):
+    """Clean up any duplicate body rules, keeping one consolidated rule after :root"""
+    body_rules = styles.find('body')
+    if len(body_rules) > 1:
+        for rule in body_rules:
+            styles.remove_rule(rule)
+        root = styles.first(':root')
+        if root is not None:
+            styles.insert_after(root, '\n\n    ' + CLEAN_BODY)
+
+
+@rules.rule
+def rtl_remnants(content):
+    """Remove any corrupted language dropdown remnants"""
+    return re.sub(r'\[dir="rtl"\]\s*(?=/\*|\.)', '', content)
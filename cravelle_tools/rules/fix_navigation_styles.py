@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Remove inline navigation styles from service pages and let them use the shared navigation.css component"""
+
+import re
+from itertools import chain
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'fix_navigation_styles',
+    'Remove inline navigation styles in favour of navigation.css',
+))
+
+# Inline rules now provided by src/css/components/navigation.css
+NAV_SELECTORS = [
+    '.nav-logo',
+    '.nav-logo:hover',
+    '.nav-links',
+    '.nav-links a',
+    '.nav-links a:hover',
+    '.language-dropdown',
+    '.language-toggle',
+    '.language-toggle__flag',
+    '.language-menu',
+    '.lang-title',
+    '.lang-list',
+    '.lang-list__button',
+    '.lang-list__button:hover',
+    '[dir="rtl"] .language-menu',
+    '.hamburger',
+]
+NAV_RESOURCES = tuple(NAV_SELECTORS) + tuple('+' + selector for selector in NAV_SELECTORS)
+
+
+@rules.css_rule
+def nav_block(styles):
+    """Remove the /* Navigation */ nav { ... } block, up to the rule ending in z-index: 999;"""
+    for rule in styles.find('nav'):
+        if not rule.live or rule.comment != 'Navigation':
+            continue
+        block = []
+        for candidate in chain([rule], styles.following(rule)):
+            block.append(candidate)
+            if candidate.body.rstrip().endswith('z-index: 999;'):
+                break
+        else:
+            continue
+        styles.remove_rule(rule, comment=True)
+        for candidate in block[1:]:
+            candidate.lead = ''
+            styles.remove_rule(candidate)
+
+
+@rules.css_rule(reads=(), writes=('ws',), overwrites=NAV_RESOURCES)
+def nav_component_rules(styles):
+    """Remove nav, language dropdown and hamburger rules"""
+    for selector in NAV_SELECTORS:
+        styles.remove(selector)
+
+
+@rules.rule(reads=('ws',), writes=('ws',))
+def blank_lines(content):
+    """Clean up extra whitespace"""
+    return re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Fix service page navigation to match landing page
+
+The navigation lives once, in templates/partials/nav.html (see includes.py).
+A service page whose <nav> is still hand-written gets the include directive
+in its place; `python -m cravelle_tools include` (and generate and build)
+then render the partial there. A nav already inside its include block is
+left to the include command.
+"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'fix_service_navigation',
+    'Replace a hand-written service page <nav> with the shared nav partial',
+))
+
+NAV_PARTIAL = 'partials/nav.html'
+
+_NAV = re.compile(r'<nav[^>]*>.*?</nav>', re.DOTALL)
+_NAV_BLOCK = re.compile(
+    rf'<!--\s*@include\s+{re.escape(NAV_PARTIAL)}\s*-->.*?<!--\s*/@include\s+{re.escape(NAV_PARTIAL)}\s*-->',
+    re.DOTALL,
+)
+
+
+@rules.rule(reads=('+<nav>',), overwrites=('<nav>',))
+def replace_nav(content):
+    """Replace navigation with the nav partial's include directive"""
+    included = [match.span() for match in _NAV_BLOCK.finditer(content)]
+
+    def swap(match):
+        if any(start < match.start() < end for start, end in included):
+            return match.group()
+        return f'<!-- @include {NAV_PARTIAL} -->'
+
+    return _NAV.sub(swap, content)
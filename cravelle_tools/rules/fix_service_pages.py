@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Fix service pages: remove background images, add glass morphism"""
+
+import re
+
+from ..engine import RuleSet, register
+from .common import block_at
+
+rules = register(RuleSet(
+    'fix_service_pages',
+    'Remove hero background images, add glass morphism to features',
+))
+
+
+@rules.rule(reads=('.hero',), writes=('.hero',))
+def hero_background_image(content):
+    """Remove background-image, background-size and background-position from .hero"""
+    for prop in ('background-image', 'background-size', 'background-position'):
+        content = re.sub(
+            rf'(\.hero\s*\{{[^}}]*?){prop}:[^;]+;([^}}]*?\}})',
+            r'\1\2',
+            content,
+            flags=re.DOTALL
+        )
+    return content
+
+
+@rules.rule(reads=('.features',), writes=('.features',))
+def features_glass(content):
+    """Add glass morphism to features section"""
+    return re.sub(
+        r'(\.features\s*\{[^}]*?padding:\s*100px\s+5%;)',
+        lambda m: m.group() if 'backdrop-filter' in block_at(m)
+        else m.group(1) + '\n      backdrop-filter: blur(20px);\n      -webkit-backdrop-filter: blur(20px);',
+        content
+    )
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Fix white areas in service pages - ensure dark theme"""
+
+import re
+
+from ..engine import RuleSet, register
+from .common import block_at
+
+rules = register(RuleSet(
+    'fix_white_areas',
+    'Dark gallery/contact backgrounds and dark body',
+))
+
+
+@rules.rule(reads=('.gallery-section',), writes=('.gallery-section',))
+def gallery_background(content):
+    """Change gallery section background from pearl to dark with glass"""
+    return re.sub(
+        r'(\.gallery-section\s*\{[^}]*?)background:\s*var\(--pearl\);',
+        r'\1background: rgba(26, 26, 26, 0.85);\n      backdrop-filter: blur(20px);\n      -webkit-backdrop-filter: blur(20px);',
+        content
+    )
+
+
+@rules.rule(reads=('.contact-section',), writes=('.contact-section',))
+def contact_background(content):
+    """Change contact section background to dark"""
+    return re.sub(
+        r'(\.contact-section\s*\{[^}]*?)background:\s*var\(--pearl\);',
+        r'\1background: rgba(10, 10, 10, 0.9);\n      backdrop-filter: blur(20px);\n      -webkit-backdrop-filter: blur(20px);',
+        content
+    )
+
+
+@rules.rule(reads=('body',), writes=('body',))
+def body_background(content):
+    """Ensure body has dark background"""
+    match = re.search(r'body\s*\{', content)
+    if match is None or 'background: var(--charcoal);' in block_at(match):
+        return content
+    return content[:match.start()] + 'body {\n      background: var(--charcoal);' + content[match.end():]
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Remove gradient-text from h3 elements, keep only on h1/h2"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'remove_h3_gradients',
+    'Remove gradient-text from h3 elements, keep only on h1/h2',
+))
+
+
+@rules.rule(reads=('<h3>',), writes=('<h3>',))
+def h3_gradient_classes(content):
+    """Remove gradient-text classes from h3 tags (keep h1, h2)"""
+    def strip(match):
+        names = match.group(2).split()
+        kept = [name for name in names if not name.startswith('gradient-text')]
+        return match.group() if kept == names else f'{match.group(1)}{" ".join(kept)}"'
+
+    return re.sub(r'(<h3\b[^>]*\sclass=")([^"]*)"', strip, content)
+
+
+@rules.rule
+def class_whitespace(content):
+    """Clean up double spaces in class"""
+    content = re.sub(r'class="\s+', 'class="', content)
+    return re.sub(r'\s+"', '"', content)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Update all service pages with WebGL iridescence"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'update_iridescence',
+    'Replace the CSS iridescence div with the WebGL iridescence script',
+))
+
+# WebGL iridescence script to add before </body>
+IRIDESCENCE_SCRIPT = '''
+  <!-- WebGL Iridescence Background -->
+  <script type="module">
+    import { initIridescence } from '../src/js/iridescence-webgl.js';
+    
+    // Initialize WebGL iridescence on page load
+    if (document.readyState === 'loading') {
+      document.addEventListener('DOMContentLoaded', () => {
+        initIridescence('body', {
+          color: [1, 1, 1],
+          speed: 1.0,
+          amplitude: 0.1,
+          mouseReact: false
+        });
+      });
+    } else {
+      initIridescence('body', {
+        color: [1, 1, 1],
+        speed: 1.0,
+        amplitude: 0.1,
+        mouseReact: false
+      });
+    }
+  </script>
+</body>'''
+
+
+@rules.rule(reads=('<body>',), writes=('<body>',))
+def remove_css_iridescence(content):
+    """Remove old CSS iridescence div if it exists"""
+    return re.sub(
+        r'  <!-- Iridescence Background -->\s*<div class="iridescence-bg">.*?</div>\s*',
+        '',
+        content,
+        flags=re.DOTALL
+    )
+
+
+@rules.rule(reads=('<scripts>',), writes=('<scripts>',))
+def webgl_iridescence(content):
+    """Add WebGL iridescence script before </body>"""
+    if '<script type="module">' not in content or 'initIridescence' not in content:
+        content = content.replace('</body>', IRIDESCENCE_SCRIPT)
+    return content
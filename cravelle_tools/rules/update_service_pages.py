@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Batch update service pages with dark theme, iridescence background, and gradient text"""
+
+import re
+
+from ..engine import RuleSet, register
+
+rules = register(RuleSet(
+    'update_service_pages',
+    'Dark theme variables, main.css import, iridescence background and gradient text',
+    # academy.html was updated by hand before this batch script existed
+    exclude=('services/academy.html',),
+))
+
+# Iridescence background HTML
+IRIDESCENCE_BG = """  <!-- Iridescence Background -->
+  <div class="iridescence-bg">
+    <div class="iridescence-layer-1"></div>
+    <div class="iridescence-layer-2"></div>
+    <div class="iridescence-layer-3"></div>
+  </div>
+  
+"""
+
+THEME_REPLACEMENTS = [
+    (r'--accent: #283540;', '--accent: #7A9CC6;'),
+    (r'--accent-hover: #3a4b5a;', '--accent-hover: #93B4DB;'),
+    (r'--border: rgba\(10, 10, 10, 0\.08\);', '--border: rgba(255, 255, 255, 0.12);'),
+    (r'--nav-bg: rgba\(250, 250, 250, 0\.95\);', '--nav-bg: rgba(10, 10, 10, 0.95);'),
+    (r'--nav-text: var\(--charcoal\);', '--nav-text: var(--pearl);'),
+    (r'--text: var\(--charcoal\);', '--text: var(--pearl);'),
+    (r'--text-secondary: var\(--silver\);', '--text-secondary: var(--platinum);'),
+]
+
+
+@rules.rule(reads=(':root',), writes=(':root',))
+def dark_theme_vars(content):
+    """Update CSS variables to dark theme"""
+    for pattern, replacement in THEME_REPLACEMENTS:
+        content = re.sub(pattern, replacement, content)
+    return content
+
+
+@rules.rule
+def body_background(content):
+    """Update body background"""
+    return re.sub(r'background: var\(--ivory\);', 'background: var(--charcoal);', content)
+
+
+@rules.rule(reads=('<head>',), writes=('<head>',))
+def main_css_link(content):
+    """Add CSS import before <style> if not present"""
+    if '<link rel="stylesheet" href="/src/css/main.css">' not in content:
+        content = content.replace(
+            '<link href="https://unpkg.com/aos@2.3.1/dist/aos.css" rel="stylesheet">',
+            '<link href="https://unpkg.com/aos@2.3.1/dist/aos.css" rel="stylesheet">\n  \n  <!-- Import main CSS -->\n  <link rel="stylesheet" href="/src/css/main.css">'
+        )
+    return content
+
+
+@rules.rule(reads=('<body>',), writes=('<body>',))
+def iridescence_background(content):
+    """Add iridescence background after <body> if not present"""
+    if 'iridescence-bg' not in content:
+        content = content.replace('<body>\n  <!-- Navigation -->', '<body>\n' + IRIDESCENCE_BG + '  <!-- Navigation -->')
+        content = content.replace('<body>\n  <nav>', '<body>\n' + IRIDESCENCE_BG + '  <nav>')
+    return content
+
+
+HEADING_CLASSES = {
+    'h1': ['gradient-text'],
+    'h2': ['gradient-text', 'gradient-text--purple'],
+    'h3': ['gradient-text', 'gradient-text--gold'],
+}
+
+
+def add_classes(tag, attrs, classes):
+    """Start tag with the classes put in front of its class list; unchanged when it has them all"""
+    existing = re.search(r'\sclass="([^"]*)"', attrs)
+    current = existing.group(1).split() if existing else []
+    missing = [name for name in classes if name not in current]
+    if not missing:
+        return f'<{tag}{attrs}>'
+    if existing is None:
+        return f'<{tag} class="{" ".join(missing)}"{attrs}>'
+    value = ' '.join(missing + [existing.group(1)]) if existing.group(1) else ' '.join(missing)
+    return f'<{tag}{attrs[:existing.start(1)]}{value}{attrs[existing.end(1):]}>'
+
+
+@rules.rule(reads=('<h1>', '<h2>', '<h3>'), writes=('<h1>', '<h2>', '<h3>'))
+def heading_gradients(content):
+    """Add gradient-text class to h1, h2, h3 tags"""
+    return re.sub(
+        r'<(h[123])(\s[^>]*?)?>',
+        lambda m: add_classes(m.group(1), m.group(2) or '', HEADING_CLASSES[m.group(1)]),
+        content
+    )
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Dependency-aware rule scheduling and fixed-point iteration
+
+Rules declare what they read, write and overwrite (see engine.Rule). From
+that the scheduler:
+
+1. drops rules whose every write is overwritten by a later rule before
+   anything reads it (e.g. fix_all_issues' .section-header rewrite, which
+   fix_comprehensive replaces again);
+2. orders the remaining rules topologically, keeping every pair that touches
+   the same resource in registry order, and otherwise keeping CSS rules
+   next to each other so consecutive ones share a StyleIndex parse;
+3. optionally repeats the schedule until the page stops changing, with
+   cycle detection, instead of operators rerunning scripts by hand.
+"""
+
+import heapq
+
+from .cache import content_hash
+
+# Resource name that conflicts with everything; rules declare nothing narrower by default
+ANY = '*'
+
+MAX_PASSES = 10
+
+_schedules = {}
+
+
+class ScheduleError(RuntimeError):
+    """A page oscillates between states or does not settle within the pass limit"""
+
+
+def conflicts(a, b):
+    """True when the relative order of two rules can change the result"""
+    if ANY in a.reads or ANY in a.writes or ANY in b.reads or ANY in b.writes:
+        return True
+    return bool(a.writes & (b.reads | b.writes) or a.reads & b.writes)
+
+
+def dead_rules(rules):
+    """Rules whose writes are all overwritten later before being read"""
+    dead = set()
+    overwritten = set()
+    for rule in reversed(rules):
+        if rule.writes and ANY not in rule.writes and rule.writes <= overwritten:
+            dead.add(rule.name)
+            continue
+        if ANY in rule.reads:
+            overwritten.clear()
+        else:
+            overwritten -= rule.reads
+        overwritten |= rule.overwrites
+    return dead
+
+
+def order_rules(rules):
+    """Topological order that respects conflicts and groups rules of the same kind"""
+    count = len(rules)
+    successors = [[] for _ in range(count)]
+    waiting = [0] * count
+    for i in range(count):
+        for j in range(i + 1, count):
+            if conflicts(rules[i], rules[j]):
+                successors[i].append(j)
+                waiting[j] += 1
+
+    # One ready-heap per kind; stay on the current kind while it has work
+    ready = {'css': [], 'text': []}
+    for i in range(count):
+        if not waiting[i]:
+            heapq.heappush(ready[rules[i].kind], i)
+    ordered = []
+    kind = rules[0].kind if rules else 'text'
+    while ready['css'] or ready['text']:
+        if not ready[kind]:
+            kind = 'css' if kind == 'text' else 'text'
+        i = heapq.heappop(ready[kind])
+        ordered.append(rules[i])
+        for j in successors[i]:
+            waiting[j] -= 1
+            if not waiting[j]:
+                heapq.heappush(ready[rules[j].kind], j)
+    return ordered
+
+
+class Schedule:
+    """The rules to run for one rule list, in order, plus the ones skipped"""
+
+    def __init__(self, rules):
+        dead = dead_rules(rules)
+        self.skipped = [rule for rule in rules if rule.name in dead]
+        self.rules = order_rules([rule for rule in rules if rule.name not in dead])
+
+    @property
+    def switches(self):
+        """How often consecutive rules change kind (each css -> text -> css costs a reparse)"""
+        return sum(1 for a, b in zip(self.rules, self.rules[1:]) if a.kind != b.kind)
+
+
+def schedule_for(rules):
+    """Memoized Schedule for an ordered rule list"""
+    key = tuple(rule.name for rule in rules)
+    if key not in _schedules:
+        _schedules[key] = Schedule(rules)
+    return _schedules[key]
+
+
+def apply_schedule(page, rules, fixed_point=False, max_passes=MAX_PASSES):
+    """Run the scheduled rules over a page; return the number of passes made"""
+    schedule = schedule_for(rules)
+    seen = {content_hash(page.content): 0}
+    for passes in range(1, max_passes + 1):
+        before = page.content
+        for rule in schedule.rules:
+            rule.run(page)
+        after = page.content
+        if not fixed_point or after == before:
+            return passes
+        digest = content_hash(after)
+        if digest in seen:
+            raise ScheduleError(f'pass {passes} repeats the state after pass {seen[digest]}')
+        seen[digest] = passes
+    raise ScheduleError(f'still changing after {max_passes} passes')
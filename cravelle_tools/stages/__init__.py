@@ -0,0 +1,23 @@
+"""Built-in build stages
+
+Import order is build order.
+"""
+
+from . import (  # noqa: F401
+    icon_sprite,
+    vendor_assets,
+    dedupe_assets,
+    prune_assets,
+    shared_css,
+    purge_css,
+    critical_css,
+    responsive_images,
+    image_dimensions,
+    image_placeholders,
+    translation_bundles,
+    hashed_translations,
+    prerender,
+    resource_hints,
+    minify_html,
+    precompress,
+)
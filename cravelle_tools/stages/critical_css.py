@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""Inline the CSS the first viewport needs and load the full stylesheets asynchronously
+
+Every page blocks first paint on /src/css/main.css, which pulls about twenty
+files through @import one round trip at a time, and on the font, icon and
+animation sheets from cdnjs/unpkg. Per page this stage:
+
+1. takes the elements of the first viewport: everything up to the end of the
+   hero (.hero on service pages, .hero-banner on the home page), which
+   covers nav, .hero-content and .hero-cta. Elements the CSS hides with
+   display: none (the language menu, the mobile menu) and their contents
+   are left out;
+2. flattens each local stylesheet's @import chain into one content-hashed
+   file under assets/ and keeps the rules of those sheets and of the page's
+   own <style> blocks whose selectors match those elements (plus the
+   @font-face and @keyframes they need). Custom properties in :root are cut
+   down to the ones the kept rules use, and interaction-only properties
+   (transitions, cursor, user-select...) are left to the full sheets;
+3. inlines that set as <style data-critical> where the first local
+   stylesheet was linked, and turns every stylesheet link into a preload
+   that applies itself on load, with a <noscript> fallback. The page's plain
+   <style> blocks that follow the last stylesheet link move to the end of
+   <body>, which keeps their place in the cascade.
+
+The critical set is cached per page under the hashes of the page and of
+every CSS file it pulls in, so an unchanged page skips matching.
+"""
+
+import re
+from pathlib import Path
+
+from .. import css_index, dom
+from ..build import site_file, stage
+from ..cache import content_hash
+from ..css_index import StyleIndex, split_declarations
+from ..pages import discover_pages
+from ..stylesheets import bundle, write_bundle
+
+# The first viewport ends with the first of these
+FOLD_ROOTS = ('.hero', '.hero-banner')
+
+GROUP_AT_RULES = ('@media', '@supports', '@layer', '@container', '@document')
+
+# Interaction-only properties: the full stylesheets bring them before anyone can hover, click or drag
+DEFERRED_PROPERTIES = {
+    'transition', 'transition-property', 'transition-duration', 'transition-timing-function',
+    'transition-delay', 'cursor', 'pointer-events', 'touch-action', 'will-change',
+    'user-select', '-webkit-user-select', '-moz-user-select', '-ms-user-select',
+    'user-drag', '-webkit-user-drag', '-khtml-user-drag', '-moz-user-drag', '-o-user-drag',
+    '-webkit-touch-callout', '-webkit-tap-highlight-color',
+}
+
+_LINK = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_NOSCRIPT = re.compile(r'<noscript\b.*?</noscript>', re.IGNORECASE | re.DOTALL)
+_HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_KEYFRAMES_NAME = re.compile(r'@(?:-webkit-)?keyframes\s+([-\w]+)')
+_FONT_FAMILY = re.compile(r'font-family\s*:\s*[\'"]?([^\'",;]+)')
+_STYLE_BLOCK = re.compile(r'\n?[ \t]*<style\s*>(.*?)</style\s*>', re.IGNORECASE | re.DOTALL)
+_BODY_END = re.compile(r'</body\s*>', re.IGNORECASE)
+_DISPLAY = re.compile(r'(?:^|;)\s*display\s*:\s*([-\w]+)', re.IGNORECASE)
+_ROOT_RULE = re.compile(r'(?<![-\w]):root\{([^{}]*)\}')
+_CUSTOM_PROPERTY = re.compile(r'^\s*(--[-\w]+)\s*:')
+_VAR = re.compile(r'var\(\s*(--[-\w]+)')
+# Whitespace around ; { and }, outside quoted strings
+_PUNCTUATION = re.compile(r'("[^"]*"|\'[^\']*\')|\s*([;{}])\s*')
+
+# Changing the matching code must invalidate cached critical sets
+_CODE_KEY = content_hash(''.join(
+    Path(module).read_text(encoding='utf-8') for module in (__file__, dom.__file__, css_index.__file__)
+))
+
+
+def fold_elements(root):
+    """Elements of the first viewport: all elements up to the end of the first hero"""
+    heroes = dom.select(root, ', '.join(FOLD_ROOTS))
+    if not heroes:
+        heroes = dom.select(root, 'nav')
+    if not heroes:
+        return [element for element in root.iter() if not element.tag.startswith('#')]
+    last = max(element.index for element in heroes[0].iter())
+    return [element for element in root.iter() if element.index <= last and not element.tag.startswith('#')]
+
+
+def _display_rules(css, elements, shown, hidden, conditional=False):
+    """Sort elements by the display values rules give them: none unconditionally, or anything else"""
+    for rule in StyleIndex.parse(css, css=True, nested=False).rules:
+        prelude = rule.selector
+        if prelude.startswith('@'):
+            if prelude.split()[0].lower() in GROUP_AT_RULES:
+                _display_rules(rule.body, elements, shown, hidden, True)
+            continue
+        values = {value.lower() for value in _DISPLAY.findall(_COMMENT.sub('', rule.body))}
+        if not values:
+            continue
+        for element in elements:
+            if any(dom.matches(selector, element, dynamic=False) for selector in dom.split_selector_list(prelude)):
+                if values - {'none'} or conditional:
+                    shown.add(element.index)
+                if 'none' in values and not conditional:
+                    hidden.add(element.index)
+
+
+def _inline_display(element):
+    match = _DISPLAY.search(element.attrs.get('style') or '')
+    return match.group(1).lower() if match else None
+
+
+def visible_elements(stylesheets, elements):
+    """The elements minus those hidden at first paint, and everything inside them
+
+    An element counts as hidden when it has the hidden attribute or an inline
+    display: none, or when a rule outside any @media sets display: none on it
+    and no rule anywhere gives it another display value (a class a script
+    adds later, like .language-menu.open, never matches here).
+    """
+    shown, hidden = set(), set()
+    for css in stylesheets:
+        _display_rules(css, elements, shown, hidden)
+    hidden -= shown
+    hidden |= {
+        element.index for element in elements
+        if 'hidden' in element.attrs or _inline_display(element) == 'none'
+    }
+    return [
+        element for element in elements
+        if element.index not in hidden and not any(ancestor.index in hidden for ancestor in element.ancestors())
+    ]
+
+
+def prune_custom_properties(css):
+    """Drop :root custom properties that nothing else in the CSS uses, directly or through other properties"""
+    definitions = {}
+    for match in _ROOT_RULE.finditer(css):
+        for declaration in split_declarations(match.group(1)):
+            name = _CUSTOM_PROPERTY.match(declaration)
+            if name:
+                definitions.setdefault(name.group(1), []).append(declaration)
+    used = set(_VAR.findall(_ROOT_RULE.sub('', css)))
+    pending = list(used)
+    while pending:
+        for declaration in definitions.get(pending.pop(), ()):
+            for name in _VAR.findall(declaration):
+                if name not in used:
+                    used.add(name)
+                    pending.append(name)
+
+    def prune(match):
+        kept = [
+            declaration for declaration in split_declarations(match.group(1))
+            if not _CUSTOM_PROPERTY.match(declaration) or _CUSTOM_PROPERTY.match(declaration).group(1) in used
+        ]
+        return f':root{{{";".join(kept)};}}' if kept else ''
+
+    return _ROOT_RULE.sub(prune, css)
+
+
+def _minify_body(body):
+    """A rule body without comments, extra whitespace or the properties first paint does not need"""
+    body = _PUNCTUATION.sub(lambda match: match.group(1) or match.group(2), ' '.join(_COMMENT.sub('', body).split()))
+    if '{' in body:  # @keyframes
+        return body
+    kept = []
+    for declaration in split_declarations(body):
+        name, _, value = declaration.partition(':')
+        if name.strip().lower() not in DEFERRED_PROPERTIES:
+            kept.append(f'{name.strip()}:{value.strip()}')
+    return ';'.join(kept)
+
+
+def _critical_rules(css, elements, out, keyframes, font_faces):
+    for rule in StyleIndex.parse(css, css=True, nested=False).rules:
+        prelude = rule.selector
+        if prelude.startswith('@'):
+            at_rule = prelude.split()[0].lower()
+            if at_rule in GROUP_AT_RULES:
+                if re.match(r'@media\s+print\b', prelude, re.IGNORECASE):
+                    continue
+                inner = []
+                _critical_rules(rule.body, elements, inner, keyframes, font_faces)
+                if inner:
+                    out.append(f'{prelude}{{{"".join(inner)}}}')
+            elif at_rule.endswith('keyframes'):
+                match = _KEYFRAMES_NAME.match(prelude)
+                if match:
+                    keyframes[match.group(1)] = f'{prelude}{{{_minify_body(rule.body)}}}'
+            elif at_rule == '@font-face':
+                font_faces.append(f'@font-face{{{_minify_body(rule.body)}}}')
+            continue
+        selectors = [
+            selector for selector in dom.split_selector_list(prelude)
+            if any(dom.matches(selector, element, dynamic=False) for element in elements)
+        ]
+        body = _minify_body(rule.body) if selectors else ''
+        if body:
+            out.append(f'{",".join(selectors)}{{{body}}}')
+
+
+def critical_css(stylesheets, elements):
+    """Minimal CSS for the given elements out of a list of stylesheet texts"""
+    elements = visible_elements(stylesheets, elements)
+    out, keyframes, font_faces = [], {}, []
+    for css in stylesheets:
+        _critical_rules(css, elements, out, keyframes, font_faces)
+    css = prune_custom_properties(''.join(out))
+    used_fonts = {family.strip().lower() for family in _FONT_FAMILY.findall(css)}
+    fonts = [
+        face for face in font_faces
+        if any(family.strip().lower() in used_fonts for family in _FONT_FAMILY.findall(face))
+    ]
+    animations = [text for name, text in keyframes.items() if re.search(rf'\b{re.escape(name)}\b', css)]
+    return ''.join(fonts) + css + ''.join(animations)
+
+
+def _deferred(attrs):
+    """Preload link that becomes a stylesheet once loaded, plus a <noscript> fallback"""
+    preload = {'rel': 'preload', 'as': 'style'}
+    preload.update((name, value) for name, value in attrs.items() if name not in ('rel', 'as', 'onload'))
+    preload['onload'] = "this.onload=null;this.rel='stylesheet'"
+    return f'{dom.render_tag("link", preload)}<noscript>{dom.render_tag("link", attrs)}</noscript>'
+
+
+def process_page(dist, page, cache):
+    """Rewrite one page; returns (blocking sheets before, critical bytes, <style> blocks moved, status)"""
+    path = dist / page
+    content = path.read_text(encoding='utf-8')
+    if 'data-critical' in content:
+        return 0, 0, 0, 'done'
+    head_end = _HEAD_END.search(content)
+    head = content[:head_end.start()] if head_end else content
+    noscript = [match.span() for match in _NOSCRIPT.finditer(head)]
+
+    links = []
+    for match in _LINK.finditer(head):
+        if any(start <= match.start() < end for start, end in noscript):
+            continue
+        attrs = dom.tag_attributes(match.group())
+        if 'stylesheet' in attrs.get('rel', '').lower().split() and attrs.get('href'):
+            links.append((match, attrs))
+    if not links:
+        return 0, 0, 0, 'none'
+    inline = [
+        match for match in _STYLE_BLOCK.finditer(head)
+        if not any(start <= match.start() < end for start, end in noscript)
+    ]
+
+    inputs = []
+    sources = [(match.start(), match.group(1)) for match in inline]
+    hrefs = {}
+    for match, attrs in links:
+        source = site_file(dist, page, attrs['href'])
+        if source is None:
+            continue
+        css = bundle(dist, source, inputs)
+        sources.append((match.start(), css))
+        if '@import' in source.read_text(encoding='utf-8'):
+            hrefs[match.start()] = write_bundle(dist, source, css)
+
+    key = content_hash('\n'.join([_CODE_KEY, content_hash(content)] + [f'{p}:{h}' for p, h in inputs]))
+    critical = cache.get(key)
+    status = 'cached'
+    if critical is None:
+        critical = critical_css([css for _, css in sorted(sources)], fold_elements(dom.parse_html(content)))
+        cache.put(key, critical)
+        status = 'changed'
+
+    first_local = next(
+        (match.start() for match, attrs in links if site_file(dist, page, attrs['href']) is not None),
+        links[0][0].start(),
+    )
+    edits = []
+    for match, attrs in links:
+        if match.start() == first_local:
+            edits.append((match.start(), match.start(), f'<style data-critical>{critical}</style>\n  '))
+        attrs = dict(attrs, href=hrefs.get(match.start(), attrs['href']))
+        edits.append((match.start(), match.end(), _deferred(attrs)))
+    # Plain <style> blocks after the last link keep their cascade position at the end of <body>
+    body_end = _BODY_END.search(content)
+    moved = [match for match in inline if match.start() > links[-1][0].start()] if body_end else []
+    for match in moved:
+        edits.append((match.start(), match.end(), ''))
+    if moved:
+        edits.append((body_end.start(), body_end.start(), ''.join(match.group() for match in moved).lstrip('\n') + '\n'))
+
+    pieces = []
+    last = 0
+    for start, end, text in sorted(edits, key=lambda edit: edit[:2]):
+        pieces += [content[last:start], text]
+        last = end
+    pieces.append(content[last:])
+    path.write_text(''.join(pieces), encoding='utf-8')
+    return len(links), len(critical.encode('utf-8')), len(moved), status
+
+
+@stage('critical_css', 'Inline first-viewport CSS per page and load the full stylesheets asynchronously')
+def inline_critical_css(dist, cache):
+    groups = discover_pages(dist)
+    pages = groups['index'] + groups['services']
+    lines = []
+    total_blocking = total_critical = 0
+    for page in pages:
+        blocking, critical, moved, status = process_page(dist, page, cache)
+        if status == 'done':
+            lines.append(f'ℹ️  {page}: critical CSS already inlined')
+        elif status == 'none':
+            lines.append(f'ℹ️  {page}: no stylesheets')
+        else:
+            label = ' (cached)' if status == 'cached' else ''
+            moved = f', {moved} <style> blocks moved to the end of <body>' if moved else ''
+            lines.append(f'✅ {page}: {blocking} render-blocking sheets deferred, {critical:,} bytes inlined{moved}{label}')
+            total_blocking += blocking
+            total_critical += critical
+    summary = (
+        f'{total_blocking} blocking stylesheet links deferred on {len(pages)} pages, '
+        f'{total_critical:,} bytes of critical CSS, {cache.hits} cached / {cache.misses} computed'
+    )
+    return lines, summary
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Collapse byte-identical assets onto one canonical path
+
+The images tree ships some files twice under different names (the PPCC
+background for diplomacy and trade, the news thumbnails and the trade
+gallery), and browsers download and cache each name separately. This stage
+hashes every binary asset, hashing only files whose size collides with
+another file's and doing the large ones in a thread pool. It picks one
+canonical path per group of identical files, rewrites references to the
+other copies in HTML, CSS and JS, and removes those copies from the output.
+
+Files in the site root and in dot-directories keep their fixed URLs and are
+never deduplicated. Digests are cached by path, size and mtime.
+"""
+
+import hashlib
+import posixpath
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from ..build import site_file, stage
+
+# Files that reference assets; they are rewritten but never deduplicated themselves
+REFERENCE_SUFFIXES = ('.html', '.css', '.js', '.json', '.webmanifest')
+
+# Files at least this large are hashed in the thread pool
+LARGE_FILE = 256 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+_STOP = r'''\s"'`()<>,;='''
+_SCRIPT_SRC = re.compile(r'''<script\b[^>]*\bsrc\s*=\s*["']([^"']+)["']''', re.IGNORECASE)
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def asset_files(dist):
+    """Site path -> Path for every asset that may be deduplicated"""
+    assets = {}
+    for path in sorted(dist.rglob('*')):
+        site_path = path.relative_to(dist).as_posix()
+        if (
+            not path.is_file()
+            or '/' not in site_path
+            or any(part.startswith('.') for part in site_path.split('/'))
+            or path.suffix.lower() in REFERENCE_SUFFIXES
+        ):
+            continue
+        assets[site_path] = path
+    return assets
+
+
+def duplicate_groups(assets, cache):
+    """Lists of site paths with identical content (only files sharing a size are hashed)"""
+    by_size = defaultdict(list)
+    stats = {}
+    for site_path, path in assets.items():
+        stats[site_path] = path.stat()
+        by_size[stats[site_path].st_size].append(site_path)
+    candidates = [site_path for paths in by_size.values() if len(paths) > 1 for site_path in paths]
+
+    digests = {}
+    large = []
+    for site_path in candidates:
+        stat = stats[site_path]
+        key = f'{site_path}:{stat.st_size}:{stat.st_mtime_ns}'
+        digest = cache.get(key)
+        if digest is None:
+            if stat.st_size >= LARGE_FILE:
+                large.append((site_path, key))
+                continue
+            digest = file_digest(assets[site_path])
+            cache.put(key, digest)
+        digests[site_path] = digest
+    if large:
+        with ThreadPoolExecutor() as pool:
+            for (site_path, key), digest in zip(large, pool.map(file_digest, [assets[p] for p, _ in large])):
+                cache.put(key, digest)
+                digests[site_path] = digest
+
+    groups = defaultdict(list)
+    for site_path, digest in digests.items():
+        groups[(stats[site_path].st_size, digest)].append(site_path)
+    return [sorted(paths) for paths in groups.values() if len(paths) > 1]
+
+
+def script_loaders(dist, files):
+    """{script site path: site paths of the pages that load it with <script src>}"""
+    loaders = defaultdict(list)
+    for site_path, text in files.items():
+        if not site_path.endswith('.html'):
+            continue
+        for src in _SCRIPT_SRC.findall(text):
+            path = site_file(dist, site_path, src)
+            if path is not None:
+                loaders[path.relative_to(dist).as_posix()].append(site_path)
+    return loaders
+
+
+def reference_bases(site_path, loaders):
+    """Paths that relative references in a file resolve against
+
+    Scripts build asset URLs relative to the pages that load them, which may
+    sit in different directories; a script no page loads resolves against itself.
+    """
+    if site_path.endswith('.js'):
+        return loaders.get(site_path) or [site_path]
+    return [site_path]
+
+
+def find_references(dist, files, targets, loaders):
+    """[(site path, start, end, target)] for every reference in files to a target asset"""
+    names = sorted({posixpath.basename(target) for target in targets}, key=len, reverse=True)
+    if not names:
+        return []
+    pattern = re.compile(
+        rf'(?<![^{_STOP}])[^{_STOP}]*?(?:{"|".join(re.escape(name) for name in names)})(?=[?#{_STOP}\\]|$)'
+    )
+    references = []
+    for site_path, text in files.items():
+        bases = reference_bases(site_path, loaders)
+        for match in pattern.finditer(text):
+            for base in bases:
+                path = site_file(dist, base, match.group())
+                target = path.relative_to(dist).as_posix() if path is not None else None
+                if target in targets:
+                    references.append((site_path, match.start(), match.end(), target))
+                    break
+    return references
+
+
+def _href(bases, original, canonical):
+    """Reference to canonical written the same way (root-absolute or relative) as original
+
+    A relative reference from a script that pages in several directories load becomes root-absolute.
+    """
+    directories = {posixpath.dirname(base) for base in bases}
+    if original.startswith('/') or len(directories) > 1:
+        return '/' + canonical
+    return posixpath.relpath(canonical, directories.pop() or '.')
+
+
+@stage('dedupe_assets', 'Point references to byte-identical assets at one canonical copy and drop the others')
+def dedupe_assets(dist, cache):
+    assets = asset_files(dist)
+    groups = duplicate_groups(assets, cache)
+    if not groups:
+        return [], f'{len(assets)} assets, no duplicates'
+
+    files = {
+        path.relative_to(dist).as_posix(): path.read_text(encoding='utf-8', errors='surrogateescape')
+        for path in sorted(dist.rglob('*'))
+        if path.is_file() and path.suffix.lower() in REFERENCE_SUFFIXES
+    }
+    members = {site_path for group in groups for site_path in group}
+    loaders = script_loaders(dist, files)
+    references = find_references(dist, files, members, loaders)
+    referenced_by = defaultdict(set)
+    for site_path, _, _, target in references:
+        referenced_by[target].add(site_path)
+
+    # Canonical copy: the most referenced one, then the shortest path
+    canonical = {}
+    for group in groups:
+        keep = min(group, key=lambda path: (-len(referenced_by[path]), len(path), path))
+        for site_path in group:
+            canonical[site_path] = keep
+
+    edits = defaultdict(list)
+    for site_path, start, end, target in references:
+        if canonical[target] != target:
+            edits[site_path].append((start, end, target))
+    for site_path, spans in edits.items():
+        text = files[site_path]
+        for start, end, target in sorted(spans, reverse=True):
+            href = _href(reference_bases(site_path, loaders), text[start:end], canonical[target])
+            text = text[:start] + href + text[end:]
+        (dist / site_path).write_text(text, encoding='utf-8', errors='surrogateescape')
+
+    lines = []
+    dist_saved = download_saved = 0
+    for group in groups:
+        keep = canonical[group[0]]
+        size = assets[keep].stat().st_size
+        dropped = [site_path for site_path in group if site_path != keep]
+        for site_path in dropped:
+            assets[site_path].unlink()
+        dist_saved += size * len(dropped)
+        # A visitor of every page used to fetch each referenced copy once; now only the canonical one
+        fetched = sum(1 for site_path in group if referenced_by[site_path])
+        download_saved += size * max(fetched - 1, 0)
+        for site_path in dropped:
+            lines.append(f'🗑️  {site_path} ({size:,} bytes) → {keep}')
+    for site_path, spans in sorted(edits.items()):
+        copies = len({target for _, _, target in spans})
+        lines.append(f'✅ {site_path}: {len(spans)} references to {copies} removed copies rewritten')
+
+    summary = (
+        f'{len(groups)} duplicate groups, {sum(len(group) - 1 for group in groups)} copies removed: '
+        f'{dist_saved:,} bytes saved in the output, {download_saved:,} bytes fewer for a visitor of every page '
+        f'(hashes: {cache.hits} cached / {cache.misses} computed)'
+    )
+    return lines, summary
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Content-hashed translation files and an inline manifest in place of timestamp cache-busting
+
+i18n.js used to fetch lang/<lang>.json with ?v=<Date.now()> and no-store,
+trying up to four URLs in turn, so every language load downloaded the file
+again. This stage writes each language as lang/<lang>.<hash>.json and adds
+a <script type="application/json" id="i18n-manifest"> map to every page,
+which i18n.js resolves with a single request. Every hashed file under lang/,
+the per-page subsets included, is marked immutable in _headers.
+"""
+
+import hashlib
+import json
+import re
+
+from ..build import IMMUTABLE, add_headers, stage
+from ..pages import discover_pages
+
+LANG_DIR = 'lang'
+MANIFEST_ID = 'i18n-manifest'
+
+_HASHED = re.compile(r'^[-\w]+\.[0-9a-f]{10}\.json$')
+_HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+
+
+def write_hashed(path):
+    """Write lang/<lang>.<hash>.json next to path; returns its file name"""
+    data = json.dumps(
+        json.loads(path.read_text(encoding='utf-8')), ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+    name = f'{path.stem}.{hashlib.sha256(data).hexdigest()[:10]}.json'
+    target = path.with_name(name)
+    if not target.exists():
+        target.write_bytes(data)
+    return name
+
+
+def manifest_script(manifest):
+    return (
+        f'<script type="application/json" id="{MANIFEST_ID}">'
+        f'{json.dumps(manifest, separators=(",", ":"), sort_keys=True)}</script>'
+    )
+
+
+@stage('hashed_translations', 'Write content-hashed lang/<lang>.<hash>.json files and a manifest i18n.js reads')
+def hash_translations(dist, cache):
+    lang_dir = dist / LANG_DIR
+    sources = [path for path in sorted(lang_dir.glob('*.json')) if '.' not in path.stem]
+    if not sources:
+        return [f'ℹ️  No {LANG_DIR}/*.json files'], 'skipped: no translations'
+
+    lines = []
+    manifest = {}
+    for path in sources:
+        name = write_hashed(path)
+        manifest[path.stem] = f'/{LANG_DIR}/{name}'
+        lines.append(f'✅ {LANG_DIR}/{path.name} → {LANG_DIR}/{name}')
+
+    groups = discover_pages(dist)
+    pages = 0
+    for page in groups['index'] + groups['services']:
+        content = (dist / page).read_text(encoding='utf-8')
+        head_end = _HEAD_END.search(content)
+        if f'id="{MANIFEST_ID}"' in content or head_end is None:
+            continue
+        content = f'{content[:head_end.start()]}  {manifest_script(manifest)}\n{content[head_end.start():]}'
+        (dist / page).write_text(content, encoding='utf-8')
+        pages += 1
+
+    hashed = sorted(path.name for path in lang_dir.glob('*.json') if _HASHED.match(path.name))
+    added = sum(
+        add_headers(dist, f'/{LANG_DIR}/{name}', [('Cache-Control', IMMUTABLE)])
+        for name in hashed
+    )
+    summary = (
+        f'{len(manifest)} languages hashed, manifest inlined on {pages} pages, '
+        f'{added} immutable _headers entries ({len(hashed)} hashed files)'
+    )
+    return lines, summary
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Replace the Font Awesome stylesheet and webfonts with an SVG sprite of the icons in use
+
+Every page loads all.min.css (about 90 KB) from cdnjs, blocking rendering,
+plus a webfont per icon style, to draw a few dozen icons. This stage:
+
+1. collects the icons the pages use: empty <i>/<span> elements with fa-*
+   classes, and icon class strings in src/js and inline scripts (the form
+   handler's 'fas fa-spinner fa-spin');
+2. reads each icon's SVG from the Font Awesome package in the vendor/
+   mirror, following the stylesheet's aliases from v5 names to v6 files, and
+   writes the page icons as <symbol>s into one assets/icons.<hash>.svg;
+3. puts <svg><use href="...#solid-globe"></use></svg> inside each icon
+   element. The element and its classes stay, so the site's own rules
+   (.contact-item i, .service-card__icon) still size and colour it;
+4. swaps the stylesheet link for a small <style data-icons> block: the SVG
+   sizing rules, the fa-spin and other modifiers in use, and a CSS mask per
+   icon that only scripts create.
+
+A page keeps the stylesheet when any of its icons (or a script icon) is
+missing from the mirror. `python -m cravelle_tools vendor --fetch` downloads
+the SVGs of the icons in use.
+"""
+
+import hashlib
+import re
+from urllib.parse import quote
+
+from .. import dom
+from ..build import ASSETS_DIR, stage
+from ..icons import MODIFIERS, IconSet, icon_set, markup_icons, script_icons
+from ..pages import discover_pages
+from ..vendor import VENDOR_DIR, css_references, mirror_path
+
+SPRITE_NAME = 'icons'
+
+BASE_CSS = (
+    '.fa,.fas,.far,.fab,.fa-solid,.fa-regular,.fa-brands{display:inline-block;font-style:normal;line-height:1}'
+    '.svg-inline--fa{display:inline-block;height:1em;overflow:visible;vertical-align:-.125em;fill:currentColor}'
+)
+
+_LINK = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_SCRIPT_BLOCK = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def _stylesheet(content):
+    """(link match, icon set base URL) of a page's Font Awesome stylesheet, or (None, None)"""
+    for match in _LINK.finditer(content):
+        attrs = dom.tag_attributes(match.group())
+        base = icon_set(attrs.get('href'))
+        if base is not None and 'stylesheet' in attrs.get('rel', '').lower().split():
+            return match, base
+    return None, None
+
+
+def _symbol_id(style, name):
+    return f'{style}-{name}'
+
+
+def _aspect(view_box):
+    _, _, width, height = (float(value) for value in view_box.split())
+    return f'{width / height:.4g}em'
+
+
+def _mask_rule(name, view_box, inner):
+    svg = f"<svg xmlns='http://www.w3.org/2000/svg' viewBox='{view_box}'>{inner.replace(chr(34), chr(39))}</svg>"
+    url = f'url("data:image/svg+xml,{quote(svg, safe=" =/:;,.-_()")}") center/contain no-repeat'
+    # Script-built elements are empty; markup icons already hold an <svg>
+    return (
+        f'.fa-{name}:empty::before{{content:"";display:inline-block;width:{_aspect(view_box)};height:1em;'
+        f'vertical-align:-.125em;background-color:currentColor;-webkit-mask:{url};mask:{url}}}'
+    )
+
+
+def _font_bytes(dist, base):
+    """Bytes of the Font Awesome stylesheet and the woff2 files it loads, as the mirror has them"""
+    stylesheet_url = f'{base}/css/all.min.css'
+    path = dist / VENDOR_DIR / mirror_path(stylesheet_url)
+    if not path.is_file():
+        return 0, 0
+    total = path.stat().st_size
+    fonts = 0
+    for _, _, url in css_references(path.read_text(encoding='utf-8'), stylesheet_url):
+        font = dist / VENDOR_DIR / mirror_path(url.split('#')[0])
+        if url.split('?')[0].endswith('.woff2') and font.is_file():
+            total += font.stat().st_size
+            fonts += 1
+    return total, fonts
+
+
+@stage('icon_sprite', 'Replace the Font Awesome stylesheet and webfonts with an SVG sprite of the icons in use')
+def build_icon_sprite(dist, cache):
+    groups = discover_pages(dist)
+    contents = {page: (dist / page).read_text(encoding='utf-8') for page in groups['index'] + groups['services']}
+    pages = {}
+    for page, content in contents.items():
+        match, base = _stylesheet(content)
+        if match is not None:
+            pages[page] = (match, base, markup_icons(content, match.end()))
+    if not pages:
+        return [], 'no page loads Font Awesome'
+
+    scripts = [path.read_text(encoding='utf-8') for path in sorted((dist / 'src').rglob('*.js'))]
+    scripts += [block for content in contents.values() for block in _SCRIPT_BLOCK.findall(content)]
+    runtime = set()
+    runtime_modifiers = set()
+    for js in scripts:
+        icons, modifiers = script_icons(js)
+        runtime |= icons
+        runtime_modifiers |= modifiers
+
+    icon_sets = {}
+    glyphs = {}
+
+    def glyph(base, style, name):
+        key = (base, style, name)
+        if key not in glyphs:
+            if base not in icon_sets:
+                icon_sets[base] = IconSet(dist, base)
+            glyphs[key] = icon_sets[base].load(style, name)
+        return glyphs[key]
+
+    lines = []
+    bases = {base for _, base, _ in pages.values()}
+    missing = {(base, style, name) for base in bases for style, name in runtime if glyph(base, style, name) is None}
+    for page, (_, base, icons) in sorted(pages.items()):
+        missing |= {(base, style, name) for _, style, name, _ in icons if glyph(base, style, name) is None}
+    absent = {base for base in bases if not (dist / VENDOR_DIR / mirror_path(f'{base}/svgs')).is_dir()}
+    for base in sorted(absent):
+        lines.append(f'⚠️  {base} has no icons in {VENDOR_DIR}/ (expected {VENDOR_DIR}/{mirror_path(base)}/svgs/)')
+    for base, style, name in sorted(missing):
+        if base not in absent:
+            expected = mirror_path(icon_sets[base].candidates(style, name)[0])
+            lines.append(f'⚠️  fa-{name} ({style}) is not in {VENDOR_DIR}/ (expected {VENDOR_DIR}/{expected})')
+    done = {
+        page: entry for page, entry in pages.items()
+        if not any((entry[1], style, name) in missing for _, style, name, _ in entry[2])
+        and not any((entry[1], style, name) in missing for style, name in runtime)
+    }
+
+    symbols = {}
+    notice = None
+    for _, base, icons in done.values():
+        for _, style, name, _ in icons:
+            view_box, inner, comment = glyph(base, style, name)
+            symbol_id = _symbol_id(style, name)
+            symbols[symbol_id] = f'<symbol id="{symbol_id}" viewBox="{view_box}">{inner}</symbol>'
+            notice = notice or comment
+    sprite = ''
+    sprite_href = None
+    if symbols:
+        # Font Awesome's free icons are CC BY 4.0: the sprite keeps their notice
+        header = f'<!--{notice}-->' if notice else ''
+        sprite = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" style="display:none">{header}'
+            f'{"".join(symbols[key] for key in sorted(symbols))}</svg>\n'
+        )
+        digest = hashlib.sha256(sprite.encode('utf-8')).hexdigest()[:10]
+        (dist / ASSETS_DIR).mkdir(parents=True, exist_ok=True)
+        (dist / ASSETS_DIR / f'{SPRITE_NAME}.{digest}.svg').write_text(sprite, encoding='utf-8')
+        sprite_href = f'/{ASSETS_DIR}/{SPRITE_NAME}.{digest}.svg'
+
+    replaced = set()
+    for page, (link, base, icons) in sorted(done.items()):
+        content = contents[page]
+        modifiers = set(runtime_modifiers)
+        pieces = []
+        last = link.end()
+        for match, style, name, used in icons:
+            modifiers.update(used)
+            view_box = glyph(base, style, name)[0]
+            svg = (
+                f'<svg class="svg-inline--fa" viewBox="{view_box}" aria-hidden="true" focusable="false">'
+                f'<use href="{sprite_href}#{_symbol_id(style, name)}"></use></svg>'
+            )
+            tag = match.group(1)
+            pieces += [content[last:match.start()], f'<{tag}{match.group(2)}>{svg}</{tag}>']
+            last = match.end()
+        pieces.append(content[last:])
+        css = BASE_CSS + ''.join(dict.fromkeys(MODIFIERS[name] for name in sorted(modifiers)))
+        css += ''.join(_mask_rule(name, *glyph(base, style, name)[:2]) for style, name in sorted(runtime))
+        content = content[:link.start()] + f'<style data-icons>{css}</style>' + ''.join(pieces)
+        (dist / page).write_text(content, encoding='utf-8')
+        replaced.add(base)
+        lines.append(f'✅ {page}: {len(icons)} icons drawn from the sprite, Font Awesome stylesheet removed')
+    for page in sorted(set(pages) - set(done)):
+        lines.append(f'ℹ️  {page}: keeps the Font Awesome stylesheet (icons missing from {VENDOR_DIR}/)')
+
+    if not done:
+        return lines, f'{len(pages)} pages keep the Font Awesome stylesheet: the icon set is not in {VENDOR_DIR}/'
+    before = [_font_bytes(dist, base) for base in replaced]
+    summary = (
+        f'{len(symbols)} page icons in {sprite_href} ({len(sprite.encode("utf-8")):,} bytes), '
+        f'{len(runtime)} script icons as CSS masks, on {len(done)} of {len(pages)} pages; '
+        f'replaces the stylesheet and {sum(fonts for _, fonts in before)} webfonts '
+        f'({sum(size for size, _ in before):,} bytes)'
+    )
+    return lines, summary
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Intrinsic sizes, decoding and loading hints on every <img>
+
+The gallery and feature images carry no width/height, so the page reflows
+as each one arrives, and nothing tells the browser which images can wait.
+Per page this stage reads each local image's size from its header (see
+cravelle_tools.imagesize; a 1.6 MB JPEG costs about a hundred bytes) and
+rewrites every <img>:
+
+- width and height from the file, unless the tag has both already (one of
+  them alone is completed from the aspect ratio). base.css gives every img
+  height: auto, so the attributes only reserve space. Images whose CSS limits
+  the height in px and leaves the width auto, like .nav__logo's
+  height: 48px or the logo strip's max-height: 100%, get none: there the
+  width attribute would become the rendered width (see
+  cravelle_tools.layout);
+- decoding="async";
+- loading="eager" inside the first viewport (the nav and the hero, as
+  critical_css defines it) and loading="lazy" below it;
+- fetchpriority="high" on the largest first-viewport image outside the
+  nav, the likely LCP element.
+
+Sizes are cached by path, size and mtime, so only new or changed files are
+opened.
+"""
+
+from .. import dom
+from ..build import site_file, stage
+from ..imagesize import image_size
+from ..layout import aligned_images, declared_sizes, height_constrained
+from ..pages import discover_pages
+from ..stylesheets import page_stylesheets
+from .critical_css import fold_elements
+
+
+class Sizes:
+    """Header-parsed image sizes keyed by site path, backed by the stage cache"""
+
+    def __init__(self, dist, cache):
+        self.dist = dist
+        self.cache = cache
+        self.bytes_read = self.bytes_total = 0
+
+    def get(self, path):
+        stat = path.stat()
+        key = f'{path.relative_to(self.dist).as_posix()}:{stat.st_size}:{stat.st_mtime_ns}'
+        size = self.cache.get(key)
+        if size is None:
+            size, read = image_size(path)
+            size = list(size) if size else []
+            self.cache.put(key, size)
+            self.bytes_read += read
+            self.bytes_total += stat.st_size
+        return tuple(size) or None
+
+
+def _complete(attrs, size):
+    """width/height attributes for an image of the given size, keeping the ones the tag has"""
+    width, height = attrs.get('width', ''), attrs.get('height', '')
+    if width.isdigit() and height.isdigit():
+        return width, height
+    if width.isdigit():
+        return width, str(round(int(width) * size[1] / size[0]))
+    if height.isdigit():
+        return str(round(int(height) * size[0] / size[1])), height
+    return str(size[0]), str(size[1])
+
+
+def plan_images(dist, page, content, sizes):
+    """[(tag match, new attrs)] for a page's <img> tags"""
+    tags, elements, root = aligned_images(content)
+    # The regex and the parser see the same tags; if they ever disagree, nothing is above the fold
+    aligned = elements is not None
+    fold = {element.index for element in fold_elements(root)} if aligned else set()
+    declared = {}
+    if aligned:
+        parents = [element.parent for element in elements if element.parent is not None]
+        declared = declared_sizes(page_stylesheets(dist, page, content), elements + parents)
+
+    plans = []
+    hero = None
+    for position, tag in enumerate(tags):
+        attrs = dom.tag_attributes(tag.group())
+        element = elements[position] if aligned else None
+        source = site_file(dist, page, attrs.get('src'))
+        size = sizes.get(source) if source is not None else None
+        # The CSS sizes it by its height; a width attribute would override the aspect ratio
+        styled = element is not None and height_constrained(
+            declared.get(element.index, []), declared.get(element.parent.index, [])
+        )
+        if size is not None and not styled:
+            attrs['width'], attrs['height'] = _complete(attrs, size)
+        attrs['decoding'] = 'async'
+        above = element is not None and element.index in fold
+        attrs['loading'] = 'eager' if above else 'lazy'
+        in_nav = element is not None and any(ancestor.tag == 'nav' for ancestor in element.ancestors())
+        if above and not in_nav and size is not None:
+            area = size[0] * size[1]
+            if hero is None or area > hero[0]:
+                hero = (area, len(plans))
+        plans.append((tag, attrs))
+    if hero is not None:
+        plans[hero[1]][1]['fetchpriority'] = 'high'
+    return plans
+
+
+@stage('image_dimensions', 'Add header-read width/height, decoding="async", lazy/eager loading and fetchpriority to <img> tags')
+def add_image_dimensions(dist, cache):
+    groups = discover_pages(dist)
+    sizes = Sizes(dist, cache)
+    lines = []
+    totals = {'tags': 0, 'sized': 0, 'lazy': 0}
+    for page in groups['index'] + groups['services']:
+        content = (dist / page).read_text(encoding='utf-8')
+        plans = plan_images(dist, page, content, sizes)
+        if not plans:
+            continue
+        pieces = []
+        last = 0
+        for tag, attrs in plans:
+            pieces += [content[last:tag.start()], dom.render_tag('img', attrs)]
+            last = tag.end()
+        pieces.append(content[last:])
+        rewritten = ''.join(pieces)
+        if rewritten != content:
+            (dist / page).write_text(rewritten, encoding='utf-8')
+        sized = sum('width' in attrs for _, attrs in plans)
+        lazy = sum(attrs['loading'] == 'lazy' for _, attrs in plans)
+        hero = next((attrs['src'] for _, attrs in plans if attrs.get('fetchpriority') == 'high'), None)
+        totals['tags'] += len(plans)
+        totals['sized'] += sized
+        totals['lazy'] += lazy
+        lines.append(
+            f'✅ {page}: {len(plans)} <img>, {sized} sized, {lazy} lazy, {len(plans) - lazy} eager'
+            + (f', fetchpriority=high on {hero}' if hero else '')
+        )
+    summary = (
+        f'{totals["tags"]} <img> tags, {totals["sized"]} sized, {totals["lazy"]} lazy; '
+        f'{sizes.bytes_read:,} header bytes read from {sizes.bytes_total:,} bytes of images '
+        f'({cache.hits} sizes cached / {cache.misses} read)'
+    )
+    return lines, summary
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Dominant-colour and tiny blurred previews behind gallery and hero images
+
+The service-page galleries (academy/preschool*.jpg, trade/gallery/*) and the
+service-card backgrounds are blank boxes until each 150-500 KB JPEG arrives.
+This stage decodes every such image once, at 1/8 scale where the JPEG decoder
+allows it, in a process pool, and derives:
+
+- its dominant colour: the mean of the pixels in the most populated bin of a
+  3-bit-per-channel histogram of a 32×32 thumbnail. The thumbnails of all
+  images are stacked into one array and binned in a single NumPy pass (a
+  plain-Python loop gives the same colours when NumPy is missing);
+- a 16 px wide WebP preview, a couple of hundred bytes as a data: URI, which
+  the browser's upscaling blurs.
+
+Both go into the markup as a background the real image paints over:
+
+- an <img> gets background:<colour> url(<preview>) center/cover;
+- an element whose inline style sets background-image gets the preview as a
+  second, lower layer and the colour as background-color;
+- an element the page's critical CSS (see critical_css) gives a background
+  image, like the home page's header.hero-banner::before, gets the colour,
+  plus the preview when the image is on its ::before/::after.
+
+Images with transparency, images in the nav and files under MIN_BYTES are
+left alone. Results are cached by path, size and mtime. Pillow is required,
+NumPy is optional.
+"""
+
+import base64
+import io
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .. import dom
+from ..build import site_file, stage
+from ..css_index import StyleIndex
+from ..pages import discover_pages
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is optional
+    Image = features = None
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; colours are binned in plain Python without it
+    numpy = None
+
+RASTER_SUFFIXES = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Smaller files arrive about as fast as their placeholder would paint
+MIN_BYTES = 16 * 1024
+
+GRID = 32
+BITS = 3
+PREVIEW_WIDTH = 16
+PREVIEW_QUALITY = 40
+
+_SETTINGS = f'{GRID}:{BITS}:{PREVIEW_WIDTH}:{PREVIEW_QUALITY}'
+
+_START_TAG = re.compile(r'<([a-zA-Z][-\w]*)\b[^>]*>')
+# Tag-like text the parser does not turn into elements: comments and script/style contents
+_NOT_MARKUP = re.compile(r'<!--.*?-->|<(script|style)\b[^>]*>(.*?)</\1\s*>', re.IGNORECASE | re.DOTALL)
+_CRITICAL = re.compile(r'<style data-critical>(.*?)</style\s*>', re.IGNORECASE | re.DOTALL)
+_BACKGROUND_URL = re.compile(r'background(?:-image)?\s*:[^;]*?url\(\s*([\'"]?)([^\'")]+)\1\s*\)', re.IGNORECASE)
+_PSEUDO_ELEMENT = re.compile(r'::?(?:before|after)\s*$', re.IGNORECASE)
+
+
+def start_tags(content):
+    """Start tag matches in document order, one per element dom.parse_html builds"""
+    skipped = [
+        match.span(2) if match.group(1) else match.span()
+        for match in _NOT_MARKUP.finditer(content)
+    ]
+    return [
+        match for match in _START_TAG.finditer(content)
+        if not any(start <= match.start() < end for start, end in skipped)
+    ]
+
+
+def decode_image(source):
+    """Worker: (GRID×GRID RGB bytes, WebP preview bytes or b'') for one image, or None when it has alpha"""
+    with Image.open(source) as image:
+        # JPEGs decode straight at 1/2, 1/4 or 1/8 scale, still at least GRID px
+        image.draft('RGB', (GRID, GRID))
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            return None
+        image = image.convert('RGB')
+        grid = image.resize((GRID, GRID), Image.BOX).tobytes()
+        preview = b''
+        if features.check('webp'):
+            height = max(1, round(image.height * PREVIEW_WIDTH / image.width))
+            out = io.BytesIO()
+            image.resize((PREVIEW_WIDTH, height), Image.BOX).save(out, 'WEBP', quality=PREVIEW_QUALITY)
+            preview = out.getvalue()
+    return grid, preview
+
+
+def dominant_colors(grids):
+    """'#rrggbb' per GRID×GRID RGB thumbnail: the mean of its most populated histogram bin"""
+    shift = 8 - BITS
+    if numpy is not None:
+        count = len(grids)
+        pixels = numpy.frombuffer(b''.join(grids), dtype=numpy.uint8).reshape(count, GRID * GRID, 3)
+        bins = (pixels >> shift).astype(numpy.int64)
+        codes = (bins[..., 0] << 2 * BITS) | (bins[..., 1] << BITS) | bins[..., 2]
+        # One bincount for the whole batch: each image gets its own range of bins
+        offsets = numpy.arange(count)[:, None] << 3 * BITS
+        counts = numpy.bincount((codes + offsets).ravel(), minlength=count << 3 * BITS).reshape(count, -1)
+        chosen = codes == counts.argmax(axis=1)[:, None]
+        means = (pixels * chosen[..., None]).sum(axis=1) / chosen.sum(axis=1)[:, None]
+        return ['#%02x%02x%02x' % tuple(round(float(value)) for value in row) for row in means]
+
+    colors = []
+    for grid in grids:
+        pixels = [grid[i:i + 3] for i in range(0, len(grid), 3)]
+        codes = [(r >> shift) << 2 * BITS | (g >> shift) << BITS | b >> shift for r, g, b in pixels]
+        counts = Counter(codes)
+        # Ties go to the lowest bin, as numpy's argmax does
+        top = max(counts, key=lambda code: (counts[code], -code))
+        chosen = [pixel for pixel, code in zip(pixels, codes) if code == top]
+        colors.append('#%02x%02x%02x' % tuple(round(sum(channel) / len(chosen)) for channel in zip(*chosen)))
+    return colors
+
+
+def _with_declarations(style, declarations):
+    style = (style or '').strip().rstrip(';').strip()
+    return f'{style};{declarations}' if style else declarations
+
+
+def _critical_backgrounds(dist, page, content, elements):
+    """{element index: (source, on a pseudo-element)} for backgrounds set by the page's critical CSS"""
+    found = {}
+    for block in _CRITICAL.findall(content):
+        for rule in StyleIndex.parse(block, css=True, nested=False).rules:
+            background = _BACKGROUND_URL.search(rule.body)
+            if rule.selector.startswith('@') or background is None:
+                continue
+            source = site_file(dist, page, background.group(2))
+            if source is None:
+                continue
+            for selector in dom.split_selector_list(rule.selector):
+                pseudo = _PSEUDO_ELEMENT.search(selector)
+                selector = selector[:pseudo.start()] if pseudo else selector
+                for element in elements:
+                    if element.index not in found and dom.matches(selector, element, dynamic=False):
+                        found[element.index] = (source, pseudo is not None)
+    return found
+
+
+def plan_placeholders(dist, page, content):
+    """[(tag match, kind, source, on a pseudo-element)] for a page, or None when tags and elements disagree"""
+    root = dom.parse_html(content)
+    elements = [element for element in root.iter() if not element.tag.startswith('#')]
+    tags = start_tags(content)
+    if len(tags) != len(elements) or any(
+        tag.group(1).lower() != element.tag for tag, element in zip(tags, elements)
+    ):
+        return None
+
+    critical = _critical_backgrounds(dist, page, content, elements)
+    plans = []
+    for tag, element in zip(tags, elements):
+        if any(ancestor.tag == 'nav' for ancestor in element.ancestors()):
+            continue
+        if element.tag == 'img':
+            source = site_file(dist, page, element.attrs.get('src'))
+            kind = 'img'
+        else:
+            inline = _BACKGROUND_URL.search(element.attrs.get('style') or '')
+            source = site_file(dist, page, inline.group(2)) if inline else None
+            kind = 'layer'
+        pseudo = False
+        if source is None and element.index in critical:
+            source, pseudo = critical[element.index]
+            kind = 'critical'
+        if source is not None and source.suffix.lower() in RASTER_SUFFIXES and source.stat().st_size >= MIN_BYTES:
+            plans.append((tag, kind, source, pseudo))
+    return plans
+
+
+def placeholder_tag(tag, kind, pseudo, color, preview):
+    """The start tag with the placeholder added to its style attribute"""
+    attrs = dom.tag_attributes(tag.group())
+    preview = f'url({preview})' if preview else ''
+    if kind == 'img':
+        declarations = f'background:{color} {preview} center/cover no-repeat' if preview else f'background:{color}'
+    elif kind == 'layer':
+        style = attrs.get('style', '')
+        if preview:
+            background = _BACKGROUND_URL.search(style)
+            style = style[:background.end()] + f',{preview}' + style[background.end():]
+        attrs['style'] = style
+        declarations = f'background-color:{color}'
+    elif pseudo and preview:
+        # The image is painted by ::before/::after, above the element's own background
+        declarations = f'background:{color} {preview} center/cover no-repeat'
+    else:
+        declarations = f'background-color:{color}'
+    attrs['style'] = _with_declarations(attrs.get('style'), declarations)
+    return dom.render_tag(tag.group(1).lower(), attrs)
+
+
+@stage('image_placeholders', 'Inline dominant-colour and tiny WebP previews behind gallery and hero images')
+def add_image_placeholders(dist, cache):
+    groups = discover_pages(dist)
+    pages = groups['index'] + groups['services']
+    contents = {page: (dist / page).read_text(encoding='utf-8') for page in pages}
+    lines = []
+    plans = {}
+    for page, content in contents.items():
+        plan = plan_placeholders(dist, page, content)
+        if plan is None:
+            lines.append(f'⚠️  {page}: markup and parsed elements disagree; no placeholders')
+        elif plan:
+            plans[page] = plan
+    sources = sorted({source for plan in plans.values() for _, _, source, _ in plan})
+
+    if Image is None:
+        return (
+            lines + [f'ℹ️  Pillow is not installed (pip install Pillow); {len(sources)} images get no placeholder'],
+            'skipped: Pillow not installed',
+        )
+
+    placeholders = {}
+    keys = {}
+    for source in sources:
+        stat = source.stat()
+        keys[source] = f'{_SETTINGS}:{source.relative_to(dist).as_posix()}:{stat.st_size}:{stat.st_mtime_ns}'
+        entry = cache.get(keys[source])
+        if entry is not None:
+            placeholders[source] = entry or None
+    todo = [source for source in sources if source not in placeholders]
+    if todo:
+        with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            decoded = list(pool.map(decode_image, todo))
+        opaque = [(source, result) for source, result in zip(todo, decoded) if result is not None]
+        colors = dominant_colors([grid for _, (grid, _) in opaque]) if opaque else []
+        for (source, (_, preview)), color in zip(opaque, colors):
+            uri = f'data:image/webp;base64,{base64.b64encode(preview).decode("ascii")}' if preview else ''
+            placeholders[source] = [color, uri]
+        for source in todo:
+            placeholders.setdefault(source, None)
+            cache.put(keys[source], placeholders[source] or [])
+
+    total = inlined = 0
+    for page, plan in plans.items():
+        content = contents[page]
+        pieces = []
+        last = 0
+        kinds = Counter()
+        for tag, kind, source, pseudo in plan:
+            if placeholders[source] is None:
+                continue
+            color, preview = placeholders[source]
+            replacement = placeholder_tag(tag, kind, pseudo, color, preview)
+            pieces += [content[last:tag.start()], replacement]
+            last = tag.end()
+            kinds[kind] += 1
+            inlined += len(replacement) - len(tag.group())
+        pieces.append(content[last:])
+        if kinds:
+            (dist / page).write_text(''.join(pieces), encoding='utf-8')
+            total += sum(kinds.values())
+            lines.append(
+                f'✅ {page}: {kinds["img"]} <img>, {kinds["layer"]} background layers, '
+                f'{kinds["critical"]} first-viewport backgrounds'
+            )
+    skipped = sum(placeholder is None for placeholder in placeholders.values())
+    summary = (
+        f'{total} placeholders ({inlined:,} bytes of markup) for {len(sources) - skipped} images '
+        f'({len(todo)} decoded, {len(sources) - len(todo)} cached, {skipped} with transparency skipped); '
+        f'colours binned with {"NumPy" if numpy is not None else "plain Python"}'
+    )
+    return lines, summary
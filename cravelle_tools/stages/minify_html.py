@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Conservative HTML minification of every page in the output
+
+Vite's createHtmlPlugin only minifies the pages Vite itself builds. The
+pre-rendered language copies and the pages `build` writes go out with their
+indentation, comments and CSS comments intact. This stage keeps anything
+whose whitespace can matter verbatim: <pre>, <textarea> and <script> (inline
+JSON included) are never touched, and neither are the tags themselves, so
+attribute values stay exactly as written. Elsewhere it drops HTML comments
+(except conditional comments) and collapses every whitespace run between tags
+to a single character, which renders the same. In <style> blocks it drops
+comments and line indentation.
+
+Results are cached by page content hash.
+"""
+
+import re
+
+from ..build import stage
+from ..cache import content_hash
+
+# Comments first, so a commented-out <script> is not taken for a real one
+_BLOCK = re.compile(r'<!--.*?-->|<(pre|textarea|script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_STYLE = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.IGNORECASE | re.DOTALL)
+_CONDITIONAL_COMMENT = ('<!--[if', '<!--<![endif')
+# A tag, with quoted attribute values allowed to contain '>'
+_TAG = re.compile(r'''<[a-zA-Z/!](?:[^>"']|"[^"]*"|'[^']*')*>''')
+_WHITESPACE = re.compile(r'\s+')
+_CSS_COMMENT = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/''', re.DOTALL)
+
+
+def _collapse(match):
+    return '\n' if '\n' in match.group() else ' '
+
+
+def minify_css(css):
+    css = _CSS_COMMENT.sub(lambda m: m.group(1) or '', css)
+    return '\n'.join(line.strip() for line in css.splitlines() if line.strip())
+
+
+def _minify_markup(text):
+    """Markup outside comments and the verbatim elements: tags kept as written, text whitespace collapsed"""
+    out = []
+    position = 0
+    for tag in _TAG.finditer(text):
+        out.append(_WHITESPACE.sub(_collapse, text[position:tag.start()]))
+        out.append(tag.group())
+        position = tag.end()
+    out.append(_WHITESPACE.sub(_collapse, text[position:]))
+    return ''.join(out)
+
+
+def minify_html(content):
+    parts = []
+    # Markup on both sides of a dropped comment is collapsed as one run
+    markup = []
+    position = 0
+    for block in _BLOCK.finditer(content):
+        markup.append(content[position:block.start()])
+        position = block.end()
+        element = (block.group(1) or '').lower()
+        if not element and not block.group().startswith(_CONDITIONAL_COMMENT):
+            continue
+        parts.append(_minify_markup(''.join(markup)))
+        markup = []
+        if element == 'style':
+            parts.append(_STYLE.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), block.group()))
+        else:
+            parts.append(block.group())
+    markup.append(content[position:])
+    parts.append(_minify_markup(''.join(markup)))
+    return ''.join(parts)
+
+
+@stage('minify_html', 'Strip comments and collapse whitespace in every page, keeping <pre>, <textarea> and scripts')
+def minify_pages(dist, cache):
+    pages = sorted(dist.rglob('*.html'))
+    lines = []
+    before_total = after_total = 0
+    for path in pages:
+        content = path.read_text(encoding='utf-8')
+        key = content_hash(content)
+        minified = cache.get(key)
+        if minified is None:
+            minified = minify_html(content)
+            cache.put(key, minified)
+            # Minified output is its own fixed point, so --no-copy reruns hit the cache too
+            cache.put(content_hash(minified), minified)
+        before = len(content.encode('utf-8'))
+        after = len(minified.encode('utf-8'))
+        before_total += before
+        after_total += after
+        if minified != content:
+            path.write_text(minified, encoding='utf-8')
+        lines.append(f'✅ {path.relative_to(dist).as_posix()}: {before:,} → {after:,} bytes')
+
+    saved = before_total - after_total
+    summary = (
+        f'{len(pages)} pages, {before_total:,} → {after_total:,} bytes '
+        f'({saved / (before_total or 1) * 100:.1f}% smaller), {cache.hits} cached / {cache.misses} minified'
+    )
+    return lines, summary
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Precompressed .gz (and .br) siblings for every text asset in the output
+
+Without precompressed files the CDN compresses on the fly at the edge, at
+whatever level it picks per request. This stage writes <file>.gz at gzip
+level 9 next to every HTML, CSS, JS, JSON, SVG, XML and text file of at least
+MIN_SIZE bytes, and <file>.br at Brotli quality 11 when the brotli module is
+installed. The work runs in a process pool. A sibling that would not be
+smaller than the file is not written.
+
+Files are keyed by content hash. The compressed bytes are kept as
+<hash>.gz / <hash>.br in the stage's cache directory,
+.cravelle_cache/stage-precompress/, because the output directory starts
+empty on every build. When the cache says a hash was already compressed, the
+siblings are copied from there (or left alone when a `build --no-copy` rerun
+still has them at the recorded sizes) instead of being compressed again.
+Stored siblings of files no build output has any more are deleted.
+"""
+
+import gzip
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ..build import stage
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; only .gz files are written without it
+    brotli = None
+
+SUFFIXES = ('.html', '.css', '.js', '.mjs', '.json', '.webmanifest', '.svg', '.xml', '.txt', '.map')
+MIN_SIZE = 1024
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def compress_file(path):
+    """Worker: write the .gz (and .br) siblings of one file; returns {encoding: size or None}"""
+    path = Path(path)
+    data = path.read_bytes()
+    outputs = {'gz': gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        outputs['br'] = brotli.compress(data, quality=BROTLI_QUALITY)
+    sizes = {}
+    for encoding, compressed in outputs.items():
+        sibling = _sibling(path, encoding)
+        if len(compressed) < len(data):
+            sibling.write_bytes(compressed)
+            sizes[encoding] = len(compressed)
+        else:
+            sibling.unlink(missing_ok=True)
+            sizes[encoding] = None
+    return sizes
+
+
+def _sibling(path, encoding):
+    return path.with_name(f'{path.name}.{encoding}')
+
+
+def _siblings_current(path, sizes):
+    for encoding, size in sizes.items():
+        sibling = _sibling(path, encoding)
+        if size is None:
+            continue
+        if not sibling.is_file() or sibling.stat().st_size != size:
+            return False
+    return True
+
+
+def _restore(path, digest, sizes, store):
+    """Copy a file's stored siblings next to it; False when one is missing or has another size"""
+    stored = {encoding: store / f'{digest}.{encoding}' for encoding, size in sizes.items() if size is not None}
+    if any(not blob.is_file() or blob.stat().st_size != sizes[encoding] for encoding, blob in stored.items()):
+        return False
+    for encoding, blob in stored.items():
+        shutil.copyfile(blob, _sibling(path, encoding))
+    return True
+
+
+@stage('precompress', 'Write gzip -9 (and Brotli 11 when available) siblings of every text asset')
+def precompress(dist, cache):
+    files = sorted(
+        path for path in dist.rglob('*')
+        if path.suffix.lower() in SUFFIXES and path.is_file() and path.stat().st_size >= MIN_SIZE
+    )
+    encodings = ['gz'] + (['br'] if brotli is not None else [])
+    store = cache.files
+    results = {}
+    digests = {}
+    keys = {}
+    tasks = []
+    for path in files:
+        digests[path] = digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        keys[path] = key = f'{digest}:{",".join(encodings)}'
+        sizes = cache.get(key)
+        if sizes is not None and (
+            _siblings_current(path, sizes) or (store is not None and _restore(path, digest, sizes, store))
+        ):
+            results[path] = sizes
+        else:
+            tasks.append(path)
+    skipped = len(results)
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            for path, sizes in zip(tasks, pool.map(compress_file, tasks, chunksize=8)):
+                cache.put(keys[path], sizes)
+                results[path] = sizes
+                if store is not None:
+                    store.mkdir(parents=True, exist_ok=True)
+                    for encoding, size in sizes.items():
+                        if size is not None:
+                            shutil.copyfile(_sibling(path, encoding), store / f'{digests[path]}.{encoding}')
+    if store is not None:
+        cache.prune_files({
+            f'{digests[path]}.{encoding}' for path, sizes in results.items()
+            for encoding, size in sizes.items() if size is not None
+        })
+
+    by_type = {}
+    for path in files:
+        totals = by_type.setdefault(path.suffix.lower(), {'files': 0, 'bytes': 0, 'gz': 0, 'br': 0})
+        size = path.stat().st_size
+        totals['files'] += 1
+        totals['bytes'] += size
+        for encoding in encodings:
+            # A file without a sibling is served as is
+            totals[encoding] += results[path].get(encoding) or size
+
+    lines = []
+    for suffix, totals in sorted(by_type.items(), key=lambda item: -item[1]['bytes']):
+        ratios = ', '.join(
+            f'{encoding} {totals[encoding]:,} ({totals[encoding] / totals["bytes"] * 100:.1f}%)'
+            for encoding in encodings
+        )
+        lines.append(f'✅ {suffix:6} {totals["files"]:4} files {totals["bytes"]:>12,} bytes → {ratios}')
+    if brotli is None:
+        lines.append('ℹ️  brotli is not installed (pip install brotli); only .gz files written')
+
+    original = sum(totals['bytes'] for totals in by_type.values())
+    gzipped = sum(totals['gz'] for totals in by_type.values())
+    summary = (
+        f'{len(files)} files, {original:,} → {gzipped:,} bytes gzipped '
+        f'({gzipped / (original or 1) * 100:.1f}%), {skipped} already compressed / {len(tasks)} compressed'
+    )
+    return lines, summary
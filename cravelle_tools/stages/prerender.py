@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Pre-render every page in every language, with lang/dir set and hreflang alternates
+
+Non-English visitors get English HTML first. i18n.js then fetches the
+language file, swaps the text of every data-key element and flips dir for
+Arabic. This stage does that swap at build time, exactly as updatePage()
+does it: data-key text, data-placeholder attributes, the title, and #motto.
+It writes the result to <lang>/index.html and <lang>/services/*.html. Each
+copy sets <html lang dir>, makes its relative URLs root-absolute, and points
+links to other pages at the same language. Every variant, English included,
+lists all the others as <link rel="alternate" hreflang>. i18n.js switches
+languages by navigating between them.
+
+Shared include blocks (see includes.py) are translated once per language and
+spliced into every page that has them. Renders are cached by the hashes of
+the page, the language file and this module.
+"""
+
+import html
+import json
+import posixpath
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+
+from .. import dom, includes
+from ..build import stage
+from ..cache import content_hash
+from ..css_index import absolute_urls
+from ..pages import INDEX_PAGE, discover_pages
+
+LANG_DIR = 'lang'
+DEFAULT_LANG = 'en'
+RTL_LANGS = ('ar', 'fa', 'he', 'ur')
+
+# Keys i18n.js reads outside the data-key walk, and the element it puts the slogan in
+TITLE_KEY = 'title'
+SLOGAN_KEY = 'slogan'
+SLOGAN_ELEMENT_ID = 'motto'
+
+URL_ATTRIBUTES = ('src', 'href', 'srcset', 'poster', 'action', 'data-src', 'data-bg', 'data-lightbox-src')
+
+_START_TAG = re.compile(r'<([a-zA-Z][-\w]*)\b[^>]*>')
+_URL_ATTRIBUTE = re.compile(rf'(\s(?:{"|".join(URL_ATTRIBUTES)})\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+_STYLE_BLOCK = re.compile(r'(<style\b[^>]*>)(.*?)(</style>)', re.IGNORECASE | re.DOTALL)
+# Inline scripts; src= scripts are covered by the attribute pass, JSON-LD holds absolute URLs
+_SCRIPT_BLOCK = re.compile(
+    r'(<script\b(?![^>]*\bsrc\s*=)(?![^>]*\btype\s*=\s*["\']?application/(?:ld\+)?json)[^>]*>)(.*?)(</script\s*>)',
+    re.IGNORECASE | re.DOTALL,
+)
+# A string literal holding a ./ or ../ path: an import specifier or an asset URL
+_SCRIPT_PATH = re.compile(r'(["\'`])(\.{1,2}/[^"\'`\s$]*)\1')
+_STYLE_ATTRIBUTE = re.compile(r'(\sstyle\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+_OG_URL = re.compile(r'<meta\b[^>]*property=["\']og:url["\'][^>]*content=["\']([^"\']+)', re.IGNORECASE)
+_HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+_HTML_TAG = re.compile(r'<html\b[^>]*>', re.IGNORECASE)
+_UNTOUCHED = ('http:', 'https:', '//', 'data:', 'mailto:', 'tel:', 'javascript:', '#', '{')
+
+_CODE_KEY = content_hash(Path(__file__).read_text(encoding='utf-8'))
+
+
+class _Spans(HTMLParser):
+    """Source offsets of everything updatePage() rewrites"""
+
+    def __init__(self, text):
+        super().__init__(convert_charrefs=False)
+        self.line_starts = [0] + [match.end() for match in re.finditer('\n', text)]
+        self.stack = []
+        # [key, tag, content start, content end]; end stays None if never closed
+        self.text_spans = []
+        # (tag start, tag end, tag, key)
+        self.placeholders = []
+        self.title = None
+        self.motto = None
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        start = self._offset()
+        end = start + len(self.get_starttag_text())
+        attrs = dict(attrs)
+        if attrs.get('data-placeholder'):
+            self.placeholders.append((start, end, tag, attrs['data-placeholder']))
+        if tag in dom.VOID_ELEMENTS:
+            return
+        span = None
+        if attrs.get('id') == SLOGAN_ELEMENT_ID and self.motto is None:
+            span = self.motto = [SLOGAN_KEY, tag, end, None]
+        elif attrs.get('data-key'):
+            span = [attrs['data-key'], tag, end, None]
+            self.text_spans.append(span)
+        elif tag == 'title' and self.title is None:
+            span = self.title = [TITLE_KEY, tag, end, None]
+        self.stack.append((tag, span))
+
+    def handle_endtag(self, tag):
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        start = self._offset()
+        while self.stack:
+            open_tag, span = self.stack.pop()
+            if open_tag == tag:
+                if span is not None:
+                    span[3] = start
+                return
+
+
+def translate(content, translations):
+    """Apply one language the way I18nManager.updatePage() does"""
+    spans = _Spans(content)
+    spans.feed(content)
+    spans.close()
+
+    edits = []
+    for key, tag, start, end in spans.text_spans:
+        if end is None or key not in translations:
+            continue
+        value = str(translations[key])
+        if tag == 'a':
+            value = value.split(':')[0].strip()
+        edits.append((start, end, html.escape(value, quote=False)))
+    for start, end, tag, key in spans.placeholders:
+        if key in translations:
+            attrs = dom.tag_attributes(content[start:end])
+            attrs['placeholder'] = html.escape(str(translations[key]))
+            edits.append((start, end, dom.render_tag(tag, attrs)))
+    for span in (spans.title, spans.motto):
+        if span is not None and span[3] is not None and translations.get(span[0]):
+            edits.append((span[2], span[3], html.escape(str(translations[span[0]]), quote=False)))
+
+    # An element inside a translated element is replaced along with it, as with textContent
+    kept = []
+    for edit in sorted(edits, key=lambda edit: (edit[0], -edit[1])):
+        if not kept or edit[0] >= kept[-1][1]:
+            kept.append(edit)
+    for start, end, text in reversed(kept):
+        content = content[:start] + text + content[end:]
+    return content
+
+
+def localized_path(page, lang):
+    """Site path of a page's variant in one language"""
+    return page if lang == DEFAULT_LANG else f'{lang}/{page}'
+
+
+def page_url(page, lang, site=''):
+    path = '/' + localized_path(page, lang)
+    if path.endswith('/' + INDEX_PAGE):
+        path = path[:-len(INDEX_PAGE)]
+    return site + path
+
+
+def rebase_urls(content, page, lang, pages):
+    """Make relative URLs root-absolute and point links to other pages at their `lang` variant
+
+    Covers URL attributes, CSS in <style> blocks and style attributes, and
+    ./ and ../ string literals in inline scripts (module import specifiers
+    resolve against the page, as asset URLs built in script do).
+    """
+    base = posixpath.dirname('/' + page)
+
+    def rebase(url, link):
+        url = url.strip()
+        if not url or url.startswith(_UNTOUCHED):
+            return url
+        path, rest = re.match(r'([^?#]*)(.*)', url, re.DOTALL).groups()
+        target = path if path.startswith('/') else posixpath.normpath(posixpath.join(base, path))
+        site_path = target.lstrip('/')
+        if not site_path or site_path.endswith('/'):
+            site_path += INDEX_PAGE
+        if link and site_path in pages:
+            target = page_url(site_path, lang)
+        return target + rest
+
+    def rewrite_attribute(match, tag):
+        prefix, quote, value = match.groups()
+        name = prefix.strip().rstrip('=').strip().lower()
+        if name == 'srcset':
+            candidates = [candidate.strip().split(None, 1) for candidate in value.split(',') if candidate.strip()]
+            value = ', '.join(' '.join([rebase(parts[0], False)] + parts[1:]) for parts in candidates)
+        else:
+            value = rebase(value, tag == 'a' and name == 'href')
+        return f'{prefix}{quote}{value}{quote}'
+
+    def rewrite_tag(match):
+        tag = match.group(1).lower()
+        return _URL_ATTRIBUTE.sub(lambda attribute: rewrite_attribute(attribute, tag), match.group())
+
+    def rewrite_script(match):
+        code = _SCRIPT_PATH.sub(
+            lambda path: path.group(1) + rebase(path.group(2), False) + path.group(1), match.group(2)
+        )
+        return match.group(1) + code + match.group(3)
+
+    content = _SCRIPT_BLOCK.sub(rewrite_script, content)
+    content = _START_TAG.sub(rewrite_tag, content)
+    content = _STYLE_BLOCK.sub(lambda m: m.group(1) + absolute_urls(m.group(2), page) + m.group(3), content)
+    return _START_TAG.sub(
+        lambda m: _STYLE_ATTRIBUTE.sub(
+            lambda s: s.group(1) + s.group(2) + absolute_urls(s.group(3), page) + s.group(2), m.group()
+        ),
+        content,
+    )
+
+
+def set_language(content, lang):
+    """Set lang and dir on the <html> element"""
+    def replace(match):
+        attrs = dom.tag_attributes(match.group())
+        attrs['lang'] = lang
+        attrs['dir'] = 'rtl' if lang in RTL_LANGS else 'ltr'
+        return dom.render_tag('html', attrs)
+
+    return _HTML_TAG.sub(replace, content, count=1)
+
+
+def alternate_links(page, languages, site):
+    links = [
+        dom.render_tag('link', {'rel': 'alternate', 'hreflang': lang, 'href': page_url(page, lang, site)})
+        for lang in languages
+    ]
+    links.append(dom.render_tag('link', {
+        'rel': 'alternate', 'hreflang': 'x-default', 'href': page_url(page, DEFAULT_LANG, site),
+    }))
+    return '\n  '.join(links)
+
+
+def add_alternates(content, page, languages, site):
+    if 'hreflang=' in content:
+        return content
+    head_end = _HEAD_END.search(content)
+    if head_end is None:
+        return content
+    links = alternate_links(page, languages, site)
+    return f'{content[:head_end.start()]}  {links}\n{content[head_end.start():]}'
+
+
+def render(content, page, lang, translations, pages, blocks=None):
+    """One page's variant in one language
+
+    Include blocks (nav, footer, ...) are translated once per language and
+    spliced back in; blocks caches them across pages by their text.
+    """
+    blocks = {} if blocks is None else blocks
+    content, page_blocks = includes.split_blocks(content)
+    translated = []
+    for block in page_blocks:
+        key = (lang, block)
+        if key not in blocks:
+            blocks[key] = translate(block, translations)
+        translated.append(blocks[key])
+    content = includes.join_blocks(translate(content, translations), translated)
+    return rebase_urls(set_language(content, lang), page, lang, pages)
+
+
+@stage('prerender', 'Write a pre-rendered copy of every page per language under /<lang>/, with hreflang links')
+def prerender_languages(dist, cache):
+    lang_files = {
+        path.stem: path for path in sorted((dist / LANG_DIR).glob('*.json'))
+        if '.' not in path.stem
+    }
+    languages = [DEFAULT_LANG] + sorted(lang for lang in lang_files if lang != DEFAULT_LANG)
+    if len(languages) < 2:
+        return [f'ℹ️  No translations in {LANG_DIR}/'], 'skipped: no translations'
+
+    groups = discover_pages(dist)
+    pages = groups['index'] + groups['services']
+    home = (dist / INDEX_PAGE).read_text(encoding='utf-8') if INDEX_PAGE in pages else ''
+    og_url = _OG_URL.search(home)
+    site = og_url.group(1).rstrip('/') if og_url else ''
+
+    lang_hashes = {lang: content_hash(path.read_text(encoding='utf-8')) for lang, path in lang_files.items()}
+    translations = {}
+    blocks = {}
+    lines = []
+    rendered = 0
+    for page in pages:
+        path = dist / page
+        content = add_alternates(path.read_text(encoding='utf-8'), page, languages, site)
+        path.write_text(content, encoding='utf-8')
+        page_hash = content_hash(content)
+        for lang in languages[1:]:
+            key = content_hash('\n'.join((_CODE_KEY, page_hash, lang_hashes[lang], lang)))
+            output = cache.get(key)
+            if output is None:
+                if lang not in translations:
+                    translations[lang] = json.loads(lang_files[lang].read_text(encoding='utf-8'))
+                output = render(content, page, lang, translations[lang], pages, blocks)
+                cache.put(key, output)
+            target = dist / localized_path(page, lang)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(output, encoding='utf-8')
+            rendered += 1
+        lines.append(f'✅ {page}: {", ".join("/" + localized_path(page, lang) for lang in languages[1:])}')
+
+    summary = (
+        f'{rendered} pages pre-rendered in {len(languages) - 1} languages, '
+        f'{cache.hits} cached / {cache.misses} rendered, {len(blocks)} include blocks translated'
+    )
+    return lines, summary
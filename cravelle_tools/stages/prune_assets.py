@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""Drop images and src/ files that no page can reach from the output
+
+The copy step takes images/ and src/ wholesale, including the modules and
+pictures nothing links to any more. This stage builds the asset reference
+graph of the output (see assets.py), deletes every file under images/ and
+src/ that no page, stylesheet or script reaches, and lists references to
+files that do not exist. It runs right after dedupe_assets, so the image and
+CSS stages do not process files that are about to go.
+"""
+
+from ..assets import AssetGraph, unused_report
+from ..build import stage
+
+
+@stage('prune_assets', 'Delete images and src/ files no page, stylesheet or script references')
+def prune_assets(dist, cache):
+    graph = AssetGraph.scan(dist)
+    lines, unused, total = unused_report(graph)
+    for site_path in unused:
+        graph.files[site_path].unlink()
+    summary = (
+        f'{len(unused)} of {len(graph.files)} files unreachable, {total:,} bytes removed from the output, '
+        f'{len(set(graph.broken))} broken references'
+    )
+    return lines, summary
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Drop the CSS rules no element of a page can ever match
+
+main.css @imports every component (staggered menu, logo loop, map, globe,
+...) into every page, so a service page downloads and parses the rules for
+widgets it does not have. Per page group (the home page, the service pages)
+this stage:
+
+1. parses the group's pages into element trees and scans src/js and the
+   inline scripts for what scripts add at runtime: classList and className
+   classes, class="..." in markup strings, createElement tags, and
+   attributes set through setAttribute, dataset and properties such as
+   .hidden (plus SAFELIST for anything built from variables or created by
+   a library, such as globe.gl's <canvas>);
+2. flattens each local stylesheet's @import chain and drops every selector
+   that matches no element of the group. In a selector, runtime classes,
+   tags and attributes match any element (also inside :not()), and states
+   such as :hover always match, so only selectors that can never apply are
+   removed. A compound made of runtime names alone (#map canvas) is left
+   out of the match, since the markup holds no such element yet;
+3. writes the purged sheet as assets/<stem>.<hash>.css, shared by every
+   page of the group, and purges each page's inline <style> blocks against
+   that page alone.
+
+Results are cached by the hashes of the sheet, the group's pages and the
+runtime names.
+"""
+
+import re
+from pathlib import Path
+
+from .. import dom
+from ..build import site_file, stage
+from ..cache import content_hash
+from ..css_index import StyleIndex
+from ..pages import discover_pages
+from ..stylesheets import bundle, retire_bundles, write_bundle
+
+GROUP_AT_RULES = ('@media', '@supports', '@layer', '@container', '@document')
+
+# Classes, ids, tags or attributes the scan cannot see: names scripts build from variables,
+# and elements that imported libraries create (globe.gl and ogl render into a <canvas>
+# they append themselves, which the #map canvas rules in map.css size)
+SAFELIST = frozenset({'canvas'})
+
+# Stands in for runtime names: dom.matches treats unknown pseudo-classes (and :not() of them) as matching
+RUNTIME = ':scripted'
+
+# Element properties that reflect to attributes of the same name
+REFLECTED = ('hidden', 'dir', 'lang', 'disabled', 'checked', 'open', 'title', 'placeholder')
+
+_LINK = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_STYLE_BLOCK = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.IGNORECASE | re.DOTALL)
+_SCRIPT_BLOCK = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+_STRING = re.compile(r'''(["'`])((?:\\.|(?!\1).)*)\1''', re.DOTALL)
+_CLASS_LIST = re.compile(r'classList\.(?:add|remove|toggle|replace)\(([^)]*)\)')
+_CLASS_NAME = re.compile(r'className\s*\+?=\s*([^;\n]+)')
+_MARKUP_CLASS = re.compile(r'\bclass=\\?["\']([^"\'\\]*)')
+_MARKUP_ID = re.compile(r'\bid=\\?["\']([-\w]+)')
+_MARKUP_TAG = re.compile(r'<([a-zA-Z][-\w]*)')
+_CREATE_ELEMENT = re.compile(r'createElement(?:NS)?\(\s*(?:[^,)]*,\s*)?["\']([-\w]+)["\']')
+_SET_ATTRIBUTE = re.compile(r'(?:setAttribute|toggleAttribute)\(\s*(?:["\']([-\w:]+)["\']|([A-Za-z_$][\w$]*))')
+_CONSTANT = re.compile(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*["\']([-\w:]+)["\']')
+_DATASET = re.compile(r'\.dataset\.([A-Za-z_$][\w$]*)|\.dataset\[\s*["\']([-\w]+)["\']')
+_PROPERTY = re.compile(rf'\.({"|".join(REFLECTED)})\s*=(?!=)')
+_IDENTIFIER = re.compile(r'^-?[_a-zA-Z][-\w]*$')
+# Class, id and attribute names and type selectors, skipping quoted values
+_SELECTOR_NAME = re.compile(
+    r'''("[^"]*"|'[^']*')|\[\s*([-\w:]+)[^\]]*\]|([.#])(-?[_a-zA-Z][-\w]*)|(?:^|(?<=[\s>+~(,]))([a-zA-Z][-\w]*)'''
+)
+# What may follow RUNTIME in a compound that names nothing the markup has: pseudo-classes only
+_PSEUDO_ONLY = re.compile(r'^(?::[-\w]+(?:\([^()]*\))?)*$')
+_EMPTY_GROUP = re.compile(r'@(?:media|supports|container|layer|document)\b[^{};]*\{\s*\}')
+
+# Changing the matching code must invalidate cached purges
+_CODE_KEY = content_hash(Path(__file__).read_text(encoding='utf-8') + Path(dom.__file__).read_text(encoding='utf-8'))
+
+
+def _words(text):
+    return [word for word in text.split() if _IDENTIFIER.match(word)]
+
+
+def runtime_names(scripts):
+    """Classes, ids, tags and attributes that scripts can add, as one set of selector names
+
+    Classes are returned as '.name', ids as '#name', attributes as '[name' and
+    tags as plain names, so one set answers for every kind of selector.
+    """
+    names = set(SAFELIST)
+    for js in scripts:
+        constants = dict(_CONSTANT.findall(js))
+        for match in _CLASS_LIST.finditer(js):
+            for string in _STRING.finditer(match.group(1)):
+                names.update(f'.{word}' for word in _words(string.group(2)))
+        for match in _CLASS_NAME.finditer(js):
+            for string in _STRING.finditer(match.group(1)):
+                names.update(f'.{word}' for word in _words(string.group(2)))
+        for string in _STRING.finditer(js):
+            text = string.group(2)
+            for match in _MARKUP_CLASS.finditer(text):
+                names.update(f'.{word}' for word in _words(match.group(1)))
+            names.update(f'#{name}' for name in _MARKUP_ID.findall(text))
+            names.update(tag.lower() for tag in _MARKUP_TAG.findall(text))
+        names.update(tag.lower() for tag in _CREATE_ELEMENT.findall(js))
+        for literal, variable in _SET_ATTRIBUTE.findall(js):
+            attribute = literal or constants.get(variable)
+            if attribute:
+                names.add(f'[{attribute.lower()}')
+        for camel, dashed in _DATASET.findall(js):
+            attribute = dashed or re.sub(r'[A-Z]', lambda m: '-' + m.group().lower(), camel)
+            names.add(f'[data-{attribute}')
+        names.update(f'[{name}' for name in _PROPERTY.findall(js))
+    return names
+
+
+def generalize(selector, runtime):
+    """Selector with every runtime class, id, tag and attribute replaced by RUNTIME"""
+
+    def replace(match):
+        quoted, attribute, prefix, name, tag = match.groups()
+        if quoted:
+            return quoted
+        if attribute:
+            return RUNTIME if f'[{attribute.lower()}' in runtime else match.group()
+        if name:
+            return RUNTIME if f'{prefix}{name}' in runtime else match.group()
+        return RUNTIME if tag.lower() in runtime else match.group()
+
+    return _SELECTOR_NAME.sub(replace, selector)
+
+
+def without_created(selector):
+    """A generalized selector without the compounds that are runtime names alone
+
+    Scripts and libraries create those elements, so the markup has none to
+    match: #map canvas keeps its rules because #map exists, whatever globe.gl
+    appends to it. A compound after a removed one becomes a descendant of the
+    nearest ancestor kept; siblings of a removed compound go with it.
+    """
+    parts = dom.split_complex(selector)
+    dropped = set()
+    for i, (compound, _) in enumerate(parts):
+        if compound.startswith(RUNTIME) and _PSEUDO_ONLY.match(compound[len(RUNTIME):]):
+            j = i
+            dropped.add(j)
+            while j > 0 and parts[j][1] in '+~':
+                j -= 1
+                dropped.add(j)
+    if not dropped:
+        return selector
+    kept = []
+    for i, (compound, combinator) in enumerate(parts):
+        if i in dropped:
+            continue
+        if kept:
+            kept.append(' ' if i - 1 in dropped or combinator == ' ' else f' {combinator} ')
+        kept.append(compound)
+    return ''.join(kept) or RUNTIME
+
+
+class Matcher:
+    """Answers whether a selector can match any element of a set of pages"""
+
+    def __init__(self, roots, runtime):
+        self.elements = [element for root in roots for element in root.iter() if not element.tag.startswith('#')]
+        self.runtime = runtime
+        self._answers = {}
+
+    def can_match(self, selector):
+        answer = self._answers.get(selector)
+        if answer is None:
+            general = without_created(generalize(selector, self.runtime))
+            answer = self._answers[selector] = any(dom.matches(general, element) for element in self.elements)
+        return answer
+
+
+def purge_css(css, matcher):
+    """Stylesheet text without the selectors the matcher rejects; returns (css, selectors removed)"""
+    index = StyleIndex.parse(css, css=True, nested=False)
+    removed = 0
+    for rule in index.rules:
+        prelude = rule.selector
+        if prelude.startswith('@'):
+            if prelude.split()[0].lower() in GROUP_AT_RULES:
+                body, count = purge_css(rule.body, matcher)
+                removed += count
+                if count:
+                    index.set_body(rule, body)
+            continue
+        selectors = dom.split_selector_list(rule.prelude)
+        kept = [selector for selector in selectors if matcher.can_match(selector)]
+        removed += len(selectors) - len(kept)
+        if not kept:
+            index.remove_rule(rule, comment=True)
+        elif len(kept) < len(selectors):
+            index.replace_rule(rule, f'{", ".join(kept)} {{{rule.body}}}')
+    css = index.render()
+    while True:
+        purged = _EMPTY_GROUP.sub('', css)
+        if purged == css:
+            return css, removed
+        css = purged
+
+
+def _stylesheets(dist, page, content):
+    """(link match, local stylesheet path) for every local stylesheet link of a page"""
+    sheets = []
+    for match in _LINK.finditer(content):
+        attrs = dom.tag_attributes(match.group())
+        if 'stylesheet' not in attrs.get('rel', '').lower().split():
+            continue
+        source = site_file(dist, page, attrs.get('href'))
+        if source is not None:
+            sheets.append((match, source))
+    return sheets
+
+
+def _purge_group(dist, pages, contents, runtime, runtime_key, cache):
+    """Purge one group's sheets and inline styles; returns {page: (before, after, selectors removed)}"""
+    matcher = Matcher([dom.parse_html(contents[page]) for page in pages], runtime)
+    group_key = content_hash('\n'.join([_CODE_KEY, runtime_key] + [content_hash(contents[page]) for page in pages]))
+    hrefs = {}
+    sizes = {}
+    for page in pages:
+        for _, source in _stylesheets(dist, page, contents[page]):
+            if source in sizes:
+                continue
+            css = bundle(dist, source, [])
+            key = content_hash(f'{group_key}\n{content_hash(css)}')
+            entry = cache.get(key)
+            if entry is None:
+                purged, removed = purge_css(css, matcher)
+                entry = {'css': purged, 'removed': removed}
+                cache.put(key, entry)
+            hrefs[source] = write_bundle(dist, source, entry['css'])
+            sizes[source] = (len(css.encode('utf-8')), len(entry['css'].encode('utf-8')), entry['removed'])
+
+    results = {}
+    for page in pages:
+        content = contents[page]
+        pieces = []
+        last = 0
+        before = after = removed = 0
+        for match, source in _stylesheets(dist, page, content):
+            attrs = dict(dom.tag_attributes(match.group()), href=hrefs[source])
+            pieces += [content[last:match.start()], dom.render_tag('link', attrs)]
+            last = match.end()
+            before += sizes[source][0]
+            after += sizes[source][1]
+            removed += sizes[source][2]
+        pieces.append(content[last:])
+        content = ''.join(pieces)
+
+        styles = ''.join(block.group(2) for block in _STYLE_BLOCK.finditer(content))
+        if styles:
+            key = content_hash(f'{_CODE_KEY}\n{runtime_key}\n{content_hash(content)}')
+            entry = cache.get(key)
+            if entry is None:
+                page_matcher = Matcher([dom.parse_html(content)], runtime)
+                counts = []
+
+                def purge_block(block):
+                    css, count = purge_css(block.group(2), page_matcher)
+                    counts.append(count)
+                    return block.group(1) + css + block.group(3)
+
+                entry = {'content': _STYLE_BLOCK.sub(purge_block, content), 'removed': sum(counts)}
+                cache.put(key, entry)
+            content = entry['content']
+            before += len(styles.encode('utf-8'))
+            after += sum(len(block.group(2).encode('utf-8')) for block in _STYLE_BLOCK.finditer(content))
+            removed += entry['removed']
+
+        if content != contents[page]:
+            (dist / page).write_text(content, encoding='utf-8')
+        results[page] = (before, after, removed)
+    return results
+
+
+@stage('purge_css', 'Drop CSS selectors no element of the page (or its scripts) can match')
+def purge_unused_css(dist, cache):
+    groups = discover_pages(dist)
+    contents = {page: (dist / page).read_text(encoding='utf-8') for pages in groups.values() for page in pages}
+    scripts = [path.read_text(encoding='utf-8') for path in sorted((dist / 'src').rglob('*.js'))]
+    scripts += [block for content in contents.values() for block in _SCRIPT_BLOCK.findall(content)]
+    runtime = runtime_names(scripts)
+    runtime_key = content_hash('\n'.join(sorted(runtime)))
+
+    linked = {source for page, content in contents.items() for _, source in _stylesheets(dist, page, content)}
+    lines = []
+    before_total = after_total = 0
+    for name in ('index', 'services'):
+        if not groups[name]:
+            continue
+        results = _purge_group(dist, groups[name], contents, runtime, runtime_key, cache)
+        for page, (before, after, removed) in results.items():
+            before_total += before
+            after_total += after
+            lines.append(
+                f'✅ {page}: {before:,} → {after:,} CSS bytes ({before - after:,} removed, {removed} selectors)'
+            )
+    pages = len(lines)
+    # shared_css's hashed sheets, now replaced by their purged copies
+    for site_path in retire_bundles(dist, linked, list(contents)):
+        lines.append(f'🗑️  {site_path} replaced by its purged copy')
+    lines.append(f'ℹ️  {len(runtime)} class, id, tag and attribute names added by scripts kept')
+    summary = (
+        f'{pages} pages, {before_total:,} → {after_total:,} CSS bytes loaded '
+        f'({(before_total - after_total) / (before_total or 1) * 100:.1f}% removed), '
+        f'{cache.hits} cached / {cache.misses} purged'
+    )
+    return lines, summary
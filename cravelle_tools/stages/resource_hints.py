@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Preload, preconnect and fetchpriority hints per page, mirrored as Link headers for 103 Early Hints
+
+index.html preloads its hero banner by hand and the service pages preload
+nothing. Per page (the pre-rendered copies included) this stage works out:
+
+- the largest local image the first viewport shows: <img> and style
+  attributes on the fold elements outside the nav (see critical_css),
+  background url()s in the page's <style data-critical> block and in inline
+  rules that match a fold element. It is preloaded with
+  fetchpriority="high"; an <img> also gets fetchpriority="high" and loses
+  loading="lazy";
+- critical fonts: local @font-face files in the critical CSS are preloaded,
+  and a fonts.googleapis.com stylesheet brings a preconnect to
+  fonts.gstatic.com, where the font files are served from;
+- the third-party origins of the head's stylesheets and scripts, which
+  get a preconnect (at most MAX_PRECONNECTS, fonts first);
+- first-party CSS and module scripts, which get preload and modulepreload.
+
+The hints are inserted ahead of the first <link> in <head>, skipping any the
+page already has. The same list goes into _headers as a Link entry for the
+page's path, so a CDN that supports it can send them as 103 Early Hints.
+"""
+
+import re
+from pathlib import Path
+
+from .. import dom
+from ..build import HEADERS_FILE, add_headers, site_file, stage
+from ..cache import content_hash
+from ..css_index import StyleIndex
+from ..pages import INDEX_PAGE
+from .critical_css import fold_elements
+
+FONT_STYLESHEET_ORIGIN = 'https://fonts.googleapis.com'
+FONT_FILE_ORIGIN = 'https://fonts.gstatic.com'
+MAX_PRECONNECTS = 4
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.webp', '.avif', '.gif', '.svg')
+FONT_TYPES = {'.woff2': 'font/woff2', '.woff': 'font/woff', '.ttf': 'font/ttf', '.otf': 'font/otf'}
+
+_HEAD_END = re.compile(r'</head\s*>', re.IGNORECASE)
+_LINK = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_SCRIPT = re.compile(r'<script\b[^>]*>', re.IGNORECASE)
+_IMG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+_STYLE_BLOCK = re.compile(r'<style\b([^>]*)>(.*?)</style\s*>', re.IGNORECASE | re.DOTALL)
+_BACKGROUND_URL = re.compile(r'background(?:-image)?\s*:[^;{}]*?url\(\s*([\'"]?)([^\'")]+)\1\s*\)', re.IGNORECASE)
+_FONT_FACE = re.compile(r'@font-face\s*\{([^}]*)\}', re.IGNORECASE)
+_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_ORIGIN = re.compile(r'^(https?:)?//([^/?#]+)')
+
+_CODE_KEY = content_hash(Path(__file__).read_text(encoding='utf-8'))
+
+
+def page_path(page):
+    """URL path a page is served at: /services/connect.html, / or /ar/ for index pages"""
+    path = '/' + page
+    return path[:-len(INDEX_PAGE)] if path.endswith('/' + INDEX_PAGE) else path
+
+
+def _origin(url):
+    match = _ORIGIN.match(url)
+    return f'{match.group(1) or "https:"}//{match.group(2)}' if match else None
+
+
+def _site_path(dist, page, url):
+    path = site_file(dist, page, url)
+    return '/' + path.relative_to(dist).as_posix() if path is not None else None
+
+
+def hero_image(dist, page, content, root):
+    """(site path, <img> tag text or None) of the largest local image in the first viewport"""
+    fold = fold_elements(root)
+    candidates = []
+    for element in fold:
+        # The nav logo is above the fold on every page but never the largest paint
+        if any(ancestor.tag == 'nav' for ancestor in element.ancestors()):
+            continue
+        if element.tag == 'img' and element.attrs.get('src'):
+            candidates.append((element.attrs['src'], element))
+        for match in _URL.finditer(element.attrs.get('style') or ''):
+            candidates.append((match.group(2), None))
+    for match in _STYLE_BLOCK.finditer(content):
+        attributes, css = match.groups()
+        if 'data-critical' in attributes:
+            candidates += [(url.group(2), None) for url in _BACKGROUND_URL.finditer(css)]
+            continue
+        for rule in StyleIndex.parse(css, css=True).rules:
+            urls = [url.group(2) for url in _BACKGROUND_URL.finditer(rule.body)]
+            if not urls or rule.selector.startswith('@'):
+                continue
+            selectors = dom.split_selector_list(rule.prelude)
+            if any(dom.matches(selector, element, dynamic=False) for selector in selectors for element in fold):
+                candidates += [(url, None) for url in urls]
+
+    best = None
+    for url, element in candidates:
+        path = site_file(dist, page, url)
+        if path is None or path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        size = path.stat().st_size
+        if best is None or size > best[0]:
+            best = (size, '/' + path.relative_to(dist).as_posix(), element)
+    if best is None:
+        return None, None
+    _, site_path, element = best
+    if element is None:
+        return site_path, None
+    # The element tree has no offsets; the tag is the first <img> with the same src
+    tags = (match.group() for match in _IMG.finditer(content))
+    return site_path, next((tag for tag in tags if dom.tag_attributes(tag).get('src') == element.attrs['src']), None)
+
+
+def plan_hints(dist, page, content):
+    """[(tag attrs, Link header entry)] for a page, plus the hero <img> tag to prioritise"""
+    head_end = _HEAD_END.search(content)
+    head = content[:head_end.start()] if head_end else content
+    hints = []
+
+    image, image_tag = hero_image(dist, page, content, dom.parse_html(content))
+    if image is not None:
+        hints.append(({'rel': 'preload', 'as': 'image', 'href': image, 'fetchpriority': 'high'},
+                      f'<{image}>; rel=preload; as=image; fetchpriority=high'))
+
+    for match in _STYLE_BLOCK.finditer(head):
+        if 'data-critical' not in match.group(1):
+            continue
+        for face in _FONT_FACE.findall(match.group(2)):
+            for url in _URL.finditer(face):
+                path = site_file(dist, page, url.group(2))
+                if path is not None and path.suffix.lower() in FONT_TYPES:
+                    href = '/' + path.relative_to(dist).as_posix()
+                    font_type = FONT_TYPES[path.suffix.lower()]
+                    hints.append(({'rel': 'preload', 'as': 'font', 'href': href, 'type': font_type, 'crossorigin': ''},
+                                  f'<{href}>; rel=preload; as=font; type="{font_type}"; crossorigin'))
+                    break
+
+    origins = []
+    styles = []
+    for match in _LINK.finditer(head):
+        attrs = dom.tag_attributes(match.group())
+        rels = attrs.get('rel', '').lower().split()
+        if not ('stylesheet' in rels or ('preload' in rels and attrs.get('as') == 'style')):
+            continue
+        href = attrs.get('href', '')
+        origin = _origin(href)
+        if origin == FONT_STYLESHEET_ORIGIN:
+            origins[:0] = [FONT_STYLESHEET_ORIGIN, FONT_FILE_ORIGIN]
+        elif origin is not None:
+            origins.append(origin)
+        else:
+            site_path = _site_path(dist, page, href)
+            if site_path is not None and site_path not in styles:
+                styles.append(site_path)
+    scripts = []
+    for match in _SCRIPT.finditer(content):
+        attrs = dom.tag_attributes(match.group())
+        src = attrs.get('src', '')
+        origin = _origin(src)
+        if origin is not None and match.start() < len(head):
+            origins.append(origin)
+        elif origin is None and src and attrs.get('type') == 'module':
+            site_path = _site_path(dist, page, src)
+            if site_path is not None and site_path not in scripts:
+                scripts.append(site_path)
+
+    for origin in list(dict.fromkeys(origins))[:MAX_PRECONNECTS]:
+        # Font files are fetched in CORS mode; the connection must be opened that way too
+        cors = origin == FONT_FILE_ORIGIN
+        attrs = {'rel': 'preconnect', 'href': origin}
+        if cors:
+            attrs['crossorigin'] = ''
+        hints.append((attrs, f'<{origin}>; rel=preconnect' + ('; crossorigin' if cors else '')))
+    hints += [({'rel': 'preload', 'as': 'style', 'href': href}, f'<{href}>; rel=preload; as=style') for href in styles]
+    hints += [({'rel': 'modulepreload', 'href': src}, f'<{src}>; rel=modulepreload') for src in scripts]
+    return hints, image_tag
+
+
+def apply_hints(content, hints, image_tag):
+    """Page with the hints it does not have yet inserted before the first <link> in <head>"""
+    head_end = _HEAD_END.search(content)
+    if head_end is None:
+        return content, 0
+    head = content[:head_end.start()]
+    existing = {}
+    for match in _LINK.finditer(head):
+        attrs = dom.tag_attributes(match.group())
+        existing[(attrs.get('rel', '').lower(), attrs.get('href'))] = match
+    added = []
+    for attrs, _ in hints:
+        match = existing.get((attrs['rel'], attrs['href']))
+        if match is None:
+            added.append(dom.render_tag('link', attrs))
+        elif attrs.get('fetchpriority') and 'fetchpriority' not in dom.tag_attributes(match.group()):
+            updated = dom.render_tag('link', dict(dom.tag_attributes(match.group()), fetchpriority='high'))
+            content = content.replace(match.group(), updated, 1)
+    if image_tag is not None and image_tag in content:
+        attrs = dom.tag_attributes(image_tag)
+        attrs.pop('loading', None)
+        attrs['fetchpriority'] = 'high'
+        content = content.replace(image_tag, dom.render_tag('img', attrs), 1)
+    if added:
+        head_end = _HEAD_END.search(content)
+        head = content[:head_end.start()]
+        first_link = _LINK.search(head)
+        at = first_link.start() if first_link else head_end.start()
+        content = content[:at] + '\n  '.join(added) + '\n  ' + content[at:]
+    return content, len(added)
+
+
+@stage('resource_hints', 'Preload the hero image, fonts and first-party CSS/JS, preconnect to third parties, add Link headers')
+def add_resource_hints(dist, cache):
+    pages = sorted(path.relative_to(dist).as_posix() for path in dist.rglob('*.html'))
+    sizes = content_hash(''.join(
+        f'{path.relative_to(dist).as_posix()}:{path.stat().st_size}\n'
+        for path in sorted(dist.rglob('*')) if path.suffix.lower() in IMAGE_SUFFIXES + tuple(FONT_TYPES)
+    ))
+    lines = []
+    total_hints = headers = 0
+    for page in pages:
+        path = dist / page
+        content = path.read_text(encoding='utf-8')
+        key = content_hash('\n'.join((_CODE_KEY, sizes, content_hash(content))))
+        entry = cache.get(key)
+        if entry is None:
+            hints, image_tag = plan_hints(dist, page, content)
+            output, added = apply_hints(content, hints, image_tag)
+            entry = {'content': output, 'added': added, 'links': [link for _, link in hints]}
+            cache.put(key, entry)
+        if entry['content'] != content:
+            path.write_text(entry['content'], encoding='utf-8')
+            # The rewritten page is its own fixed point, so --no-copy reruns hit the cache too
+            cache.put(content_hash('\n'.join((_CODE_KEY, sizes, content_hash(entry['content'])))),
+                      dict(entry, added=0))
+        if not entry['links']:
+            lines.append(f'ℹ️  {page}: nothing to hint')
+            continue
+        if add_headers(dist, page_path(page), [('Link', ', '.join(entry['links']))]):
+            headers += 1
+        total_hints += entry['added']
+        lines.append(f'✅ {page}: {entry["added"]} hints added, {len(entry["links"])} Link entries')
+    summary = (
+        f'{total_hints} hints on {len(pages)} pages, {headers} Link header blocks in {HEADERS_FILE}, '
+        f'{cache.hits} cached / {cache.misses} computed'
+    )
+    return lines, summary
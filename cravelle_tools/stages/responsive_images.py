@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Width-stepped AVIF/WebP/JPEG variants for raster images, wired into <img> tags as srcset/sizes
+
+scripts/optimize-images.js only recompresses files over 200 KB in place, so
+the hero backgrounds and gallery photos still ship at full resolution to
+every screen. This stage encodes each raster image under images/ that an
+<img> in index.html or services/*.html points at, once per width step and
+format, into a content-addressed directory, <source hash>/, in a process
+pool. The directories live in the stage's cache directory,
+.cravelle_cache/stage-responsive_images/, and are copied to
+assets/img/<source hash>/ in the output; a directory that already holds a
+complete variants.json is reused without decoding the source, so a build
+only encodes new or changed images (build --no-cache encodes straight into
+the output). Directories of images no page shows any more are deleted.
+Those <img> tags become a <picture> with AVIF/WebP <source>s and a JPEG
+(PNG for images with alpha) srcset fallback.
+
+`sizes` comes from the rendered width the page's CSS gives the image (see
+cravelle_tools.layout): 48px and its mobile steps for the nav logo, at most
+twice the column minimum for grid cards and gallery items. Without one it
+falls back to the width attribute, then to 100vw.
+
+Pillow is optional. Without it the stage only reports what it would do.
+AVIF is used when Pillow's own AVIF plugin or pillow-avif-plugin is present.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .. import dom
+from ..build import ASSETS_DIR, site_file, stage
+from ..layout import aligned_images, declared_sizes, sizes_attribute
+from ..pages import discover_pages
+from ..stylesheets import page_stylesheets
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is optional
+    Image = features = None
+
+IMAGES_DIR = 'images'
+VARIANTS_DIR = 'img'
+MANIFEST_NAME = 'variants.json'
+SOURCE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+
+WIDTHS = (480, 960, 1440, 1920)
+QUALITY = {'avif': 55, 'webp': 78, 'jpeg': 80}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+# Layout width the browser should assume when neither the CSS nor the <img> tells
+DEFAULT_SIZES = '100vw'
+
+
+def avif_available():
+    """True when Pillow can write AVIF, natively or through pillow-avif-plugin"""
+    if Image is None:
+        return False
+    try:
+        if features.check('avif'):
+            return True
+    except ValueError:  # Pillow versions that do not know the feature name
+        pass
+    try:
+        import pillow_avif  # noqa: F401  (registers the AVIF plugin)
+    except ImportError:
+        return False
+    return True
+
+
+def source_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+
+
+def variant_widths(width):
+    """Width steps below the source width, plus the source width capped at the largest step"""
+    largest = min(width, WIDTHS[-1])
+    return [step for step in WIDTHS if step < largest] + [largest]
+
+
+def encode_variants(task):
+    """Worker: write every width/format variant of one image; returns its manifest"""
+    source, out_dir, avif = task
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = Path(source).stem.replace(' ', '-').lower()
+    with Image.open(source) as image:
+        image.load()
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        fallback = 'png' if has_alpha else 'jpeg'
+        formats = (['avif'] if avif else []) + ['webp', fallback]
+        manifest = {
+            'width': image.width,
+            'height': image.height,
+            'source_bytes': Path(source).stat().st_size,
+            'fallback': fallback,
+            'variants': {name: [] for name in formats},
+        }
+        for width in variant_widths(image.width):
+            height = round(image.height * width / image.width)
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for name in formats:
+                extension = 'jpg' if name == 'jpeg' else name
+                filename = f'{stem}-{width}.{extension}'
+                options = {'optimize': True} if name == 'png' else {'quality': QUALITY[name]}
+                if name == 'jpeg':
+                    options.update(progressive=True, optimize=True)
+                resized.save(out_dir / filename, name.upper(), **options)
+                manifest['variants'][name].append([width, filename, (out_dir / filename).stat().st_size])
+    # Written last: its presence marks the directory as complete
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+    return manifest
+
+
+def _load_manifest(out_dir):
+    try:
+        return json.loads((out_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _srcset(base, entries):
+    return ', '.join(f'{base}/{filename} {width}w' for width, filename, _ in entries)
+
+
+def picture_markup(tag, base, manifest, sizes=None):
+    """<picture> replacing one <img> tag, keeping all its attributes; an explicit sizes attribute wins"""
+    attrs = dom.tag_attributes(tag)
+    sizes = attrs.get('sizes') or sizes or DEFAULT_SIZES
+    sources = [
+        dom.render_tag('source', {'type': MIME_TYPES[name], 'srcset': _srcset(base, entries), 'sizes': sizes})
+        for name, entries in manifest['variants'].items()
+        if name in MIME_TYPES
+    ]
+    fallback = manifest['variants'][manifest['fallback']]
+    attrs['src'] = f'{base}/{fallback[-1][1]}'
+    attrs['srcset'] = _srcset(base, fallback)
+    attrs['sizes'] = sizes
+    return '<picture>' + ''.join(sources) + dom.render_tag('img', attrs) + '</picture>'
+
+
+def referenced_images(dist, page, content):
+    """Raster files under images/ that the page's <img> tags point at"""
+    found = set()
+    for tag in aligned_images(content)[0]:
+        source = site_file(dist, page, dom.tag_attributes(tag.group()).get('src'))
+        if (
+            source is not None and source.suffix.lower() in SOURCE_SUFFIXES
+            and source.relative_to(dist).parts[0] == IMAGES_DIR
+        ):
+            found.add(source)
+    return found
+
+
+def rewrite_images(content, page, dist, manifests):
+    """Replace <img> tags pointing at processed images; returns (content, count)"""
+    tags, elements, root = aligned_images(content)
+    found = {}
+    if elements is not None:
+        ancestors = {ancestor.index: ancestor for element in elements for ancestor in element.ancestors()}
+        found = declared_sizes(page_stylesheets(dist, page, content), elements + list(ancestors.values()))
+
+    pieces = []
+    last = count = 0
+    for position, tag in enumerate(tags):
+        attrs = dom.tag_attributes(tag.group())
+        if 'srcset' in attrs:
+            continue
+        source = site_file(dist, page, attrs.get('src'))
+        if source is None or source not in manifests:
+            continue
+        digest, manifest = manifests[source]
+        sizes = None
+        if elements is not None:
+            size = (manifest['width'], manifest['height'])
+            sizes = sizes_attribute(elements[position], found, size, attrs.get('width', ''))
+        elif attrs.get('width', '').isdigit():
+            sizes = f'(max-width: {attrs["width"]}px) 100vw, {attrs["width"]}px'
+        base = f'/{ASSETS_DIR}/{VARIANTS_DIR}/{digest}'
+        pieces += [content[last:tag.start()], picture_markup(tag.group(), base, manifest, sizes)]
+        last = tag.end()
+        count += 1
+    pieces.append(content[last:])
+    return ''.join(pieces), count
+
+
+@stage('responsive_images', 'Encode width-stepped AVIF/WebP/JPEG variants and rewrite <img> tags to srcset/sizes')
+def build_image_variants(dist, cache):
+    groups = discover_pages(dist)
+    pages = groups['index'] + groups['services']
+    contents = {page: (dist / page).read_text(encoding='utf-8') for page in pages}
+    # Only what the pages show: encoding every file under images/ took minutes with AVIF
+    sources = sorted(set().union(*(referenced_images(dist, page, content) for page, content in contents.items())))
+    if Image is None:
+        total = sum(path.stat().st_size for path in sources)
+        return (
+            [f'ℹ️  Pillow is not installed (pip install Pillow); {len(sources)} images ({total:,} bytes) left as they are'],
+            'skipped: Pillow not installed',
+        )
+
+    avif = avif_available()
+    output = dist / ASSETS_DIR / VARIANTS_DIR
+    store = cache.files or output
+    manifests = {}
+    tasks = []
+    digests = {}
+    for path in sources:
+        digest = source_hash(path)
+        out_dir = store / digest
+        manifest = _load_manifest(out_dir)
+        if manifest is not None and (not avif or 'avif' in manifest['variants']):
+            manifests[path] = digest, manifest
+        else:
+            digests[path] = digest
+            tasks.append((str(path), str(out_dir), avif))
+    reused = len(manifests)
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            for (source, _, _), manifest in zip(tasks, pool.map(encode_variants, tasks)):
+                manifests[Path(source)] = digests[Path(source)], manifest
+    if store != output:
+        for digest, _ in manifests.values():
+            shutil.copytree(store / digest, output / digest, dirs_exist_ok=True)
+        cache.prune_files({digest for digest, _ in manifests.values()})
+
+    lines = []
+    source_total = variant_total = 0
+    for path in sources:
+        _, manifest = manifests[path]
+        largest = min(entries[-1][2] for entries in manifest['variants'].values())
+        source_total += manifest['source_bytes']
+        variant_total += largest
+        lines.append(
+            f'🖼️  {path.relative_to(dist).as_posix()}: {manifest["source_bytes"]:,} → {largest:,} bytes '
+            f'at {manifest["variants"][manifest["fallback"]][-1][0]}w, '
+            f'{len(manifest["variants"][manifest["fallback"]])} widths × {len(manifest["variants"])} formats'
+        )
+
+    rewritten = 0
+    for page, content in contents.items():
+        content, count = rewrite_images(content, page, dist, manifests)
+        if count:
+            (dist / page).write_text(content, encoding='utf-8')
+            lines.append(f'✅ {page}: {count} <img> tags now use srcset/sizes')
+            rewritten += count
+
+    summary = (
+        f'{len(sources)} images ({len(tasks)} encoded, {reused} reused), '
+        f'{"AVIF+" if avif else ""}WebP+JPEG, full-width best format {variant_total:,} vs {source_total:,} source bytes, '
+        f'{rewritten} <img> tags rewritten'
+    )
+    return lines, summary
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Lift the inline CSS every service page repeats into one content-hashed stylesheet
+
+Each service page ships the same :root theme, hero, feature-card,
+section-header and footer rules inline, so every navigation re-downloads
+them. This stage diffs the top-level rules of the pages' <style> blocks,
+writes the rules all pages share to assets/services.<hash>.css, and leaves
+only each page's own rules inline.
+
+The shared sheet is linked where the first <style> block was, so the lifted
+rules now come before the page's remaining inline rules. A lifted rule that
+used to follow a remaining rule of equal specificity which could hit the
+same element with the same property stays inline, which keeps the cascade
+unchanged.
+"""
+
+import gzip
+import hashlib
+import re
+import textwrap
+from collections import Counter
+
+from ..build import ASSETS_DIR, IMMUTABLE, add_headers, stage
+from ..css_index import STYLE_OPEN, StyleIndex, absolute_urls
+from ..pages import discover_pages
+
+SHEET_NAME = 'services'
+
+# Pages in a typical visit: landing on one service, then browsing two more
+VISIT_PAGES = 3
+
+_PROPERTY = re.compile(r'([-\w]+)\s*:(?!:)')
+_EMPTY_STYLE = re.compile(r'\n?[ \t]*<style\b[^>]*>\s*</style>', re.IGNORECASE)
+_PSEUDO_ELEMENT = re.compile(r'::?(before|after|first-line|first-letter|marker|placeholder|selection|backdrop)\b|::[-\w]+')
+_TYPE = re.compile(r'^[a-zA-Z][-\w]*')
+_ID = re.compile(r'#([-\w]+)')
+_ATTRIBUTE = re.compile(r'\[[^\]]*\]')
+_CLASS_LIKE = re.compile(r'\.[-\w]+|(?<!:):(?!:)(?!before\b|after\b|first-line\b|first-letter\b)[-\w]+')
+_TYPE_LIKE = re.compile(r'(?:^|(?<=[\s>+~]))[a-zA-Z][-\w]*')
+
+
+def _split_top(selector, separators):
+    """Split at separator characters outside brackets and parentheses"""
+    parts, depth, current = [], 0, ''
+    for char in selector:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if depth == 0 and char in separators:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _subject(selector):
+    """(type, id, pseudo-element) of the element a complex selector matches"""
+    compound = _split_top(selector, ' >+~')[-1] if selector.strip() else ''
+    pseudo = _PSEUDO_ELEMENT.search(compound)
+    type_match = _TYPE.match(compound)
+    id_match = _ID.search(compound)
+    return (
+        type_match.group().lower() if type_match else None,
+        id_match.group(1) if id_match else None,
+        pseudo.group().lstrip(':') if pseudo else None,
+    )
+
+
+def _specificity(selector):
+    """(ids, classes, types) of a complex selector, or None when it uses :is()/:where()/:has()"""
+    if re.search(r':(is|where|has|matches)\(', selector):
+        return None
+    attributes = len(_ATTRIBUTE.findall(selector))
+    # :not(x) counts as its argument
+    selector = re.sub(r':not\(([^()]*)\)', r' \1', _ATTRIBUTE.sub('', selector))
+    ids = len(_ID.findall(selector))
+    classes = len(_CLASS_LIKE.findall(selector)) + attributes
+    types = len(_TYPE_LIKE.findall(selector.strip())) + len(_PSEUDO_ELEMENT.findall(selector))
+    return ids, classes, types
+
+
+def _may_compete(a, b):
+    """False only when the order of two rules provably cannot matter
+
+    That is the case when they target different elements (different
+    pseudo-elements, tag names or ids) or differ in specificity.
+    """
+    if a.startswith('@') or b.startswith('@'):
+        return True
+    for x in _split_top(a, ','):
+        for y in _split_top(b, ','):
+            tx, ix, px = _subject(x)
+            ty, iy, py = _subject(y)
+            if px != py or (tx and ty and tx != ty) or (ix and iy and ix != iy):
+                continue
+            sx, sy = _specificity(x), _specificity(y)
+            if sx is not None and sy is not None and sx != sy:
+                continue
+            return True
+    return False
+
+
+def _families(body):
+    """Property names in a block, widened so shorthands meet their longhands"""
+    families = set()
+    for name in _PROPERTY.findall(body):
+        name = name.lower()
+        if name.startswith('--'):
+            families.add(name)
+            continue
+        name = re.sub(r'^-(webkit|moz|ms|o)-', '', name)
+        families.add(name.split('-')[0])
+    return families
+
+
+def _conflicts(earlier, later):
+    """True when moving `later` in front of `earlier` could change which declaration wins"""
+    return bool(_families(earlier.body) & _families(later.body)) and _may_compete(earlier.selector, later.selector)
+
+
+def _key(rule, page):
+    return rule.selector, ' '.join(absolute_urls(rule.body, page).split())
+
+
+def _first_occurrences(rules, page):
+    """{key: rule} for the first rule of each key, in document order"""
+    first = {}
+    for rule in rules:
+        first.setdefault(_key(rule, page), rule)
+    return first
+
+
+def shared_keys(indexes):
+    """Keys of the top-level rules every page carries, in an order all pages agree on"""
+    firsts = {page: _first_occurrences(index.rules, page) for page, index in indexes.items()}
+    counts = Counter(key for first in firsts.values() for key in first)
+    reference = next(iter(firsts.values()))
+    positions = {
+        page: {key: i for i, key in enumerate(first)}
+        for page, first in firsts.items()
+    }
+
+    # Keep candidates whose relative order is the same on every page
+    ordered = []
+    last = {page: -1 for page in firsts}
+    for key in reference:
+        if counts[key] < len(firsts):
+            continue
+        if all(positions[page][key] > last[page] for page in firsts):
+            ordered.append(key)
+            for page in firsts:
+                last[page] = positions[page][key]
+
+    # Drop rules that would jump ahead of a conflicting inline rule; repeat
+    # because every rule kept inline can block later ones in turn
+    lifted = set(ordered)
+    changed = True
+    while changed:
+        changed = False
+        for page, index in indexes.items():
+            first = firsts[page]
+            kept = []
+            for rule in index.rules:
+                key = _key(rule, page)
+                if key in lifted and first[key] is rule:
+                    if any(_conflicts(other, rule) for other in kept):
+                        lifted.discard(key)
+                        changed = True
+                        kept.append(rule)
+                else:
+                    kept.append(rule)
+    return [key for key in ordered if key in lifted]
+
+
+def _format_rule(rule):
+    """Re-indent a rule lifted out of a <style> block for a standalone sheet"""
+    body = textwrap.indent(textwrap.dedent(rule.body.strip('\n').rstrip()), '  ')
+    return f'{rule.prelude.strip()} {{\n{body}\n}}'
+
+
+def _gzip_size(text):
+    return len(gzip.compress(text.encode('utf-8'), 9))
+
+
+def _link_sheet(content, href):
+    """Link the sheet right where the first <style> block starts"""
+    match = STYLE_OPEN.search(content)
+    if match is None:
+        return content
+    line_start = content.rfind('\n', 0, match.start()) + 1
+    indent = content[line_start:match.start()]
+    if indent.strip():
+        indent = ''
+    link = f'<link rel="stylesheet" href="{href}">\n{indent}'
+    return content[:match.start()] + link + content[match.start():]
+
+
+@stage('shared_css', 'Move inline CSS repeated on every service page into a cached, content-hashed stylesheet')
+def extract_shared_css(dist, cache):
+    pages = discover_pages(dist)['services']
+    texts = {page: (dist / page).read_text(encoding='utf-8') for page in pages}
+    indexes = {
+        page: StyleIndex.parse(text, nested=False)
+        for page, text in texts.items()
+        if STYLE_OPEN.search(text)
+    }
+    if len(indexes) < 2:
+        return ['ℹ️  Fewer than two service pages with inline styles, nothing to share'], 'nothing shared'
+
+    keys = shared_keys(indexes)
+    if not keys:
+        return ['ℹ️  No inline rules are shared by every service page'], 'nothing shared'
+
+    reference_page, reference = next(iter(indexes.items()))
+    first = _first_occurrences(reference.rules, reference_page)
+    sheet = '\n\n'.join(
+        absolute_urls(_format_rule(first[key]), reference_page) for key in keys
+    ) + '\n'
+    digest = hashlib.sha256(sheet.encode('utf-8')).hexdigest()[:10]
+    name = f'{SHEET_NAME}.{digest}.css'
+    (dist / ASSETS_DIR).mkdir(parents=True, exist_ok=True)
+    (dist / ASSETS_DIR / name).write_text(sheet, encoding='utf-8')
+    href = f'/{ASSETS_DIR}/{name}'
+    add_headers(dist, href, [('Cache-Control', IMMUTABLE)])
+
+    wanted = set(keys)
+    lines = []
+    before_raw = after_raw = before_gz = after_gz = 0
+    for page, index in indexes.items():
+        for key, rule in _first_occurrences(index.rules, page).items():
+            if key in wanted:
+                rule.lead = ''
+                index.remove_rule(rule)
+        content = _EMPTY_STYLE.sub('', _link_sheet(index.render(), href))
+        (dist / page).write_text(content, encoding='utf-8')
+
+        old = texts[page]
+        saved = len(old.encode('utf-8')) - len(content.encode('utf-8'))
+        before_raw += len(old.encode('utf-8'))
+        after_raw += len(content.encode('utf-8'))
+        before_gz += _gzip_size(old)
+        after_gz += _gzip_size(content)
+        lines.append(f'✅ {page}: {len(old.encode("utf-8")):,} → {len(content.encode("utf-8")):,} bytes (-{saved:,})')
+
+    count = len(indexes)
+    sheet_raw = len(sheet.encode('utf-8'))
+    sheet_gz = _gzip_size(sheet)
+    visit = min(VISIT_PAGES, count)
+    visit_before = before_raw * visit / count
+    visit_after = after_raw * visit / count + sheet_raw
+    visit_before_gz = before_gz * visit / count
+    visit_after_gz = after_gz * visit / count + sheet_gz
+    lines.append(f'📦 {href}: {len(keys)} rules, {sheet_raw:,} bytes ({sheet_gz:,} gzip)')
+    lines.append(
+        f'📊 {visit}-page visit: {visit_before:,.0f} → {visit_after:,.0f} bytes '
+        f'({visit_before_gz:,.0f} → {visit_after_gz:,.0f} gzip), sheet fetched once'
+    )
+    summary = (
+        f'{len(keys)} shared rules in {name}, {count} pages, '
+        f'{before_raw - after_raw:,} HTML bytes saved ({before_gz - after_gz:,} gzip)'
+    )
+    return lines, summary
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Per-page translation subsets compiled from lang/*.json and the keys each page renders
+
+i18n.js fetches the whole lang/<lang>.json on every page, although a service
+page only renders a fifth of its keys. This stage collects the keys i18n.js
+can look up on each page: data-key and data-placeholder attributes, `title`,
+and `slogan` when the page has the #motto element. For every language other
+than English it writes the subset to lang/<lang>.<hash>.json, and adds a
+<script type="application/json" id="i18n-bundles"> map to the page. i18n.js
+fetches the page's subset from that map. Pages with identical key sets share
+one file.
+
+The report lists keys defined in the JSON files that no page uses, and
+keys a page uses that a language does not define (those stay in English).
+"""
+
+import hashlib
+import json
+
+from .. import dom
+from ..build import stage
+from ..pages import discover_pages
+
+LANG_DIR = 'lang'
+DEFAULT_LANG = 'en'
+BUNDLE_ID = 'i18n-bundles'
+
+# Keys i18n.js reads outside the data-key / data-placeholder walk
+TITLE_KEY = 'title'
+SLOGAN_KEY = 'slogan'
+SLOGAN_ELEMENT_ID = 'motto'
+
+
+def page_keys(content):
+    """Translation keys i18n.js can look up on a page"""
+    keys = {TITLE_KEY}
+    for element in dom.parse_html(content).iter():
+        for name in ('data-key', 'data-placeholder'):
+            if element.attrs.get(name):
+                keys.add(element.attrs[name])
+        if element.id == SLOGAN_ELEMENT_ID:
+            keys.add(SLOGAN_KEY)
+    return keys
+
+
+def load_languages(dist):
+    """{lang: translations} for every lang/<lang>.json in the output"""
+    languages = {}
+    for path in sorted((dist / LANG_DIR).glob('*.json')):
+        if '.' in path.stem:  # already a hashed build output
+            continue
+        languages[path.stem] = json.loads(path.read_text(encoding='utf-8'))
+    return languages
+
+
+def write_bundle(dist, lang, subset):
+    """Write one subset as lang/<lang>.<hash>.json; returns (root-absolute href, bytes)"""
+    data = json.dumps(subset, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    name = f'{lang}.{hashlib.sha256(data).hexdigest()[:10]}.json'
+    target = dist / LANG_DIR / name
+    if not target.exists():
+        target.write_bytes(data)
+    return f'/{LANG_DIR}/{name}', len(data)
+
+
+def bundle_script(bundles):
+    return (
+        f'<script type="application/json" id="{BUNDLE_ID}">'
+        f'{json.dumps(bundles, separators=(",", ":"), sort_keys=True)}</script>'
+    )
+
+
+@stage('translation_bundles', 'Write per-page translation subsets and point i18n.js at them')
+def compile_translation_bundles(dist, cache):
+    languages = load_languages(dist)
+    if not languages:
+        return [f'ℹ️  No {LANG_DIR}/*.json files'], 'skipped: no translations'
+    full_sizes = {lang: (dist / LANG_DIR / f'{lang}.json').stat().st_size for lang in languages}
+
+    groups = discover_pages(dist)
+    lines = []
+    used = set()
+    files = set()
+    full_total = bundle_total = 0
+    for page in groups['index'] + groups['services']:
+        path = dist / page
+        content = path.read_text(encoding='utf-8')
+        if f'id="{BUNDLE_ID}"' in content:
+            lines.append(f'ℹ️  {page}: translation bundles already linked')
+            continue
+        keys = page_keys(content)
+        used |= keys
+        bundles = {}
+        page_bytes = 0
+        for lang, translations in languages.items():
+            if lang == DEFAULT_LANG:
+                continue
+            subset = {key: value for key, value in translations.items() if key in keys}
+            bundles[lang], size = write_bundle(dist, lang, subset)
+            files.add(bundles[lang])
+            page_bytes += size
+            full_total += full_sizes[lang]
+            bundle_total += size
+            missing = sorted(keys - set(translations) - {TITLE_KEY})
+            if missing:
+                lines.append(f'⚠️  {page}: {len(missing)} keys missing from {lang}.json: {", ".join(missing)}')
+        head_end = content.lower().find('</head>')
+        if head_end < 0:
+            lines.append(f'❌ {page}: no </head>, bundles not linked')
+            continue
+        content = content[:head_end] + f'  {bundle_script(bundles)}\n' + content[head_end:]
+        path.write_text(content, encoding='utf-8')
+        lines.append(f'✅ {page}: {len(keys)} keys, {page_bytes:,} bytes over {len(bundles)} languages')
+
+    defined = set().union(*(set(translations) for translations in languages.values()))
+    unused = sorted(defined - used)
+    if unused:
+        lines.append(f'ℹ️  {len(unused)} keys used on no page: {", ".join(unused)}')
+    summary = (
+        f'{len(files)} bundles: {bundle_total:,} bytes over all page/language loads '
+        f'instead of {full_total:,} for the full files, {len(unused)} unused keys'
+    )
+    return lines, summary
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Serve the third-party stylesheets, scripts and fonts from the site's own origin
+
+Every page blocks rendering on stylesheets from fonts.googleapis.com, cdnjs
+and unpkg, and the fonts come from a fourth origin, fonts.gstatic.com, which
+the browser can only discover after the Google Fonts CSS arrives. Each origin
+costs a DNS lookup and a TCP/TLS handshake before its first byte. This stage:
+
+1. finds the third-party <link rel="stylesheet"> and <script src> tags of
+   index.html and services/*.html and looks up each URL in the vendor/
+   mirror (see cravelle_tools.vendor), checking it against the tag's
+   integrity attribute when there is one;
+2. copies each file to vendor/<library>-<name>.<hash>.<ext>. Stylesheet
+   url()s and @imports (webfonts, Leaflet's images) are vendored the same
+   way and rewritten to the copies; one missing from the mirror is pointed
+   back at its CDN URL;
+3. points the tags at the copies, drops preconnect / dns-prefetch hints to
+   origins the page no longer uses, and removes every origin the
+   Content-Security-Policy in _headers or in the pages' <meta> tags names
+   but nothing in the output references any more (also those an earlier
+   stage, such as icon_sprite, stopped using).
+
+URLs missing from the mirror keep their CDN tags and are reported. Run
+`python -m cravelle_tools vendor --fetch` to fill the mirror.
+"""
+
+import base64
+import hashlib
+import posixpath
+import re
+import shutil
+from urllib.parse import urlsplit
+
+from .. import dom
+from ..build import HEADERS_FILE, IMMUTABLE, add_headers, stage
+from ..pages import discover_pages
+from ..vendor import VENDOR_DIR, css_references, is_third_party, library, mirror_path, origin, page_resources
+
+KIND_SUFFIXES = {'css': '.css', 'js': '.js'}
+SRI_ALGORITHMS = ('sha256', 'sha384', 'sha512')
+
+_LINK = re.compile(r'\n?[ \t]*(<link\b[^>]*>)', re.IGNORECASE)
+_CSP_META = re.compile(
+    r'(<meta\b[^>]*http-equiv=["\']Content-Security-Policy["\'][^>]*content=(["\']))(.*?)(\2)', re.IGNORECASE | re.DOTALL
+)
+_CSP_HEADER = re.compile(r'^([ \t]*Content-Security-Policy:[ \t]*)(.*)$', re.IGNORECASE | re.MULTILINE)
+_TEXT_SUFFIXES = ('.html', '.css', '.js', '.mjs', '.json')
+
+# Origins a still-referenced origin's responses load from (the Google Fonts CSS names its font files)
+PULLED_IN = {'fonts.googleapis.com': ('fonts.gstatic.com',)}
+
+
+def integrity_matches(integrity, data):
+    """True when any hash of an SRI integrity value matches the bytes"""
+    for token in integrity.split():
+        algorithm, _, expected = token.partition('-')
+        if algorithm in SRI_ALGORITHMS:
+            actual = base64.b64encode(hashlib.new(algorithm, data).digest()).decode('ascii')
+            if actual == expected.split('?')[0]:
+                return True
+    return False
+
+
+class Vendor:
+    """Copies mirror files into the output under fingerprinted names, each file once"""
+
+    def __init__(self, dist):
+        self.dist = dist
+        self.mirror = dist / VENDOR_DIR
+        self.hrefs = {}
+        # URL -> origins its stylesheet loads from: all of them, and those its copy still does
+        self.origins = {}
+        self.fallbacks = {}
+        self.missing = set()
+        self.files = self.bytes = 0
+
+    def source(self, url):
+        path = self.mirror / mirror_path(url)
+        return path if path.is_file() else None
+
+    def copy(self, url, kind=None):
+        """Href of the fingerprinted copy of a URL, or None when the mirror lacks it"""
+        url = url.split('#')[0]
+        if url in self.hrefs:
+            return self.hrefs[url]
+        path = self.source(url)
+        if path is None:
+            self.missing.add(url)
+            self.hrefs[url] = None
+            return None
+        name = posixpath.basename(urlsplit(url).path) or 'index'
+        stem, suffix = posixpath.splitext(name)
+        suffix = suffix or KIND_SUFFIXES.get(kind, '')
+        data = path.read_bytes()
+        origins = fallbacks = set()
+        if suffix == '.css':
+            data, origins, fallbacks = self._rewrite_css(data.decode('utf-8'), url)
+            data = data.encode('utf-8')
+        prefix = library(url)
+        stem = stem if stem.startswith(prefix) else f'{prefix}-{stem}'
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        target = self.mirror / f'{stem}.{digest}{suffix}'
+        if not target.exists():
+            target.write_bytes(data)
+        self.files += 1
+        self.bytes += len(data)
+        self.hrefs[url] = f'/{VENDOR_DIR}/{target.name}'
+        self.origins[url] = origins
+        self.fallbacks[url] = fallbacks
+        return self.hrefs[url]
+
+    def _rewrite_css(self, css, url):
+        origins = set()
+        fallbacks = set()
+        pieces = []
+        last = 0
+        for match, group, reference in css_references(css, url):
+            fragment = '#' + reference.split('#', 1)[1] if '#' in reference else ''
+            kind = 'css' if match.group().lstrip().startswith('@import') else None
+            href = self.copy(reference, kind)
+            origins.add(origin(reference))
+            if href is None:
+                fallbacks.add(origin(reference))
+                href = reference
+            else:
+                origins |= self.origins[reference.split('#')[0]]
+                fallbacks |= self.fallbacks[reference.split('#')[0]]
+                href += fragment
+            pieces += [css[last:match.start(group)], href]
+            last = match.end(group)
+        pieces.append(css[last:])
+        return ''.join(pieces), origins, fallbacks
+
+
+def _drop_hints(content, origins):
+    """Page without the preconnect / dns-prefetch links to the given origins"""
+
+    def drop(match):
+        attrs = dom.tag_attributes(match.group(1))
+        rels = attrs.get('rel', '').lower().split()
+        href = attrs.get('href', '')
+        if ('preconnect' in rels or 'dns-prefetch' in rels) and is_third_party(href) and origin(href) in origins:
+            return ''
+        return match.group()
+
+    return _LINK.sub(drop, content)
+
+
+def tighten_policy(policy, origins):
+    """CSP text without the source expressions for the given origins"""
+    hosts = {urlsplit(value).netloc for value in origins}
+    directives = []
+    for directive in policy.split(';'):
+        tokens = directive.split()
+        kept = [token for token in tokens if urlsplit(token if '//' in token else '//' + token).netloc not in hosts]
+        directives.append(' '.join(kept))
+    return '; '.join(directive for directive in directives if directive)
+
+
+def policy_origins(policy):
+    """Origins (scheme://host) named as host sources in a CSP; wildcard hosts are left out"""
+    found = set()
+    for token in policy.replace(';', ' ').split():
+        if token.startswith("'") or '.' not in token or '*' in token:
+            continue
+        parts = urlsplit(token if '//' in token else '//' + token)
+        if parts.netloc:
+            found.add(f'{parts.scheme or "https"}://{parts.netloc}')
+    return found
+
+
+def _policies(dist, pages):
+    """Every CSP text of the output: the pages' <meta> tags and the _headers file"""
+    texts = [
+        match.group(3)
+        for page in pages for match in _CSP_META.finditer((dist / page).read_text(encoding='utf-8'))
+    ]
+    headers = dist / HEADERS_FILE
+    if headers.exists():
+        texts += [match.group(2) for match in _CSP_HEADER.finditer(headers.read_text(encoding='utf-8'))]
+    return texts
+
+
+def _referenced_origins(dist, origins):
+    """The origins still named anywhere in the output's pages, stylesheets and scripts, outside the CSP"""
+    hosts = {urlsplit(value).netloc: value for value in origins}
+    found = {}
+    for path in sorted(dist.rglob('*')):
+        if path.suffix.lower() not in _TEXT_SUFFIXES or not path.is_file():
+            continue
+        text = _CSP_META.sub('', path.read_text(encoding='utf-8', errors='replace'))
+        for host, value in hosts.items():
+            if value not in found and f'//{host}' in text:
+                found[value] = path.relative_to(dist).as_posix()
+    return found
+
+
+@stage('vendor_assets', 'Serve third-party CSS, JS and fonts from fingerprinted copies under vendor/')
+def vendor_assets(dist, cache):
+    groups = discover_pages(dist)
+    pages = groups['index'] + groups['services']
+    vendor = Vendor(dist)
+    lines = []
+    rewritten = connections = 0
+    removed = set()
+    contents = {}
+    for page in pages:
+        content = (dist / page).read_text(encoding='utf-8')
+        before = set()
+        after = set()
+        pieces = []
+        last = 0
+        tags = 0
+        for match, attrs, url, kind in page_resources(content):
+            before.add(origin(url))
+            source = vendor.source(url)
+            integrity = attrs.get('integrity')
+            if source is not None and integrity and not integrity_matches(integrity, source.read_bytes()):
+                lines.append(f'⚠️  {page}: {url} does not match its integrity hash; {VENDOR_DIR}/{mirror_path(url)} skipped')
+                after.add(origin(url))
+                continue
+            href = vendor.copy(url, kind)
+            if href is None:
+                after.add(origin(url))
+                continue
+            before |= vendor.origins[url]
+            after |= vendor.fallbacks[url]
+            attrs = {name: value for name, value in attrs.items() if name not in ('integrity', 'crossorigin')}
+            attrs['href' if kind == 'css' else 'src'] = href
+            tag = dom.render_tag('link' if kind == 'css' else 'script', attrs)
+            pieces += [content[last:match.start()], tag]
+            last = match.end()
+            tags += 1
+        pieces.append(content[last:])
+        content = _drop_hints(''.join(pieces), before - after)
+        contents[page] = content
+        removed |= before - after
+        rewritten += tags
+        connections += len(before - after)
+        if tags:
+            lines.append(
+                f'✅ {page}: {tags} tags vendored, {len(before)} → {len(after)} third-party origins '
+                f'({len(before - after)} DNS lookups and TLS handshakes off the critical path)'
+            )
+        elif before:
+            lines.append(f'ℹ️  {page}: nothing vendored, still loads from {", ".join(sorted(after))}')
+
+    for url in sorted(vendor.missing):
+        lines.append(f'⚠️  {url} is not in {VENDOR_DIR}/ (expected {VENDOR_DIR}/{mirror_path(url)})')
+
+    for page, content in contents.items():
+        (dist / page).write_text(content, encoding='utf-8')
+    # The mirror is laid out by host; only the fingerprinted copies are served
+    for path in list(vendor.mirror.iterdir()) if vendor.mirror.is_dir() else []:
+        if path.is_dir():
+            shutil.rmtree(path)
+    if vendor.files:
+        add_headers(dist, f'/{VENDOR_DIR}/*', [('Cache-Control', IMMUTABLE)])
+
+    # Origins nothing refers to any more can leave the CSP as well, whichever stage stopped using them
+    named = set().union(*(policy_origins(policy) for policy in _policies(dist, pages)))
+    still_used = _referenced_origins(dist, named)
+    for value in list(still_used):
+        for pulled in PULLED_IN.get(urlsplit(value).netloc, ()):
+            for candidate in named:
+                if urlsplit(candidate).netloc == pulled:
+                    still_used.setdefault(candidate, f'{still_used[value]} (through {value})')
+    dropped = sorted(named - set(still_used))
+    for value, where in sorted(still_used.items()):
+        if value in removed:
+            lines.append(f'ℹ️  {value} stays in the CSP: still referenced by {where}')
+    if dropped:
+        policies = 0
+        for page in pages:
+            content = (dist / page).read_text(encoding='utf-8')
+            content, count = _CSP_META.subn(
+                lambda m: m.group(1) + tighten_policy(m.group(3), dropped) + m.group(4), content
+            )
+            if count:
+                (dist / page).write_text(content, encoding='utf-8')
+                policies += count
+        headers = dist / HEADERS_FILE
+        if headers.exists():
+            text = headers.read_text(encoding='utf-8')
+            text, count = _CSP_HEADER.subn(lambda m: m.group(1) + tighten_policy(m.group(2), dropped), text)
+            headers.write_text(text, encoding='utf-8')
+            policies += count
+        lines.append(f'🔧 {", ".join(dropped)} removed from {policies} Content-Security-Policy entries')
+
+    summary = (
+        f'{vendor.files} files ({vendor.bytes:,} bytes) vendored, {rewritten} tags rewritten on {len(pages)} pages, '
+        f'{connections} third-party connections removed, {len(vendor.missing)} URLs missing from {VENDOR_DIR}/'
+    )
+    return lines, summary
+
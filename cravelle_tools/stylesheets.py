@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Flattened, content-hashed copies of the site's stylesheets for the build stages"""
+
+import hashlib
+import re
+
+from . import dom
+from .build import ASSETS_DIR, IMMUTABLE, add_headers, remove_headers, site_file
+from .cache import content_hash
+from .css_index import absolute_urls
+
+_HASHED = re.compile(r'\.[0-9a-f]{10}$')
+_IMPORT = re.compile(r'@import\s+(?:url\(\s*)?([\'"]?)([^\'")\s;]+)\1\s*\)?\s*([^;]*);')
+_NOSCRIPT = re.compile(r'<noscript\b.*?</noscript>', re.IGNORECASE | re.DOTALL)
+_STYLE_OR_LINK = re.compile(r'<style\b[^>]*>(.*?)</style\s*>|<link\b[^>]*>', re.IGNORECASE | re.DOTALL)
+
+
+def bundle(dist, path, inputs, seen=None):
+    """Stylesheet text with its @import chain inlined and url()s made root-absolute
+
+    Every file read is appended to inputs as (site path, content hash).
+    """
+    seen = set() if seen is None else seen
+    if path in seen:
+        return ''
+    seen.add(path)
+    site_path = path.relative_to(dist).as_posix()
+    text = path.read_text(encoding='utf-8')
+    inputs.append((site_path, content_hash(text)))
+
+    def inline(match):
+        _, href, media = match.groups()
+        target = site_file(dist, site_path, href)
+        if target is None:
+            return match.group()
+        css = bundle(dist, target, inputs, seen)
+        media = media.strip()
+        return f'@media {media} {{\n{css}\n}}' if media else css
+
+    return absolute_urls(_IMPORT.sub(inline, text), site_path)
+
+
+def write_bundle(dist, path, css):
+    """Write a flattened sheet as assets/<stem>.<hash>.css, cached as immutable; return its href"""
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+    # A sheet that is already hashed (assets/services.<hash>.css) keeps a single hash
+    name = f'{_HASHED.sub("", path.stem)}.{digest}.css'
+    (dist / ASSETS_DIR).mkdir(parents=True, exist_ok=True)
+    target = dist / ASSETS_DIR / name
+    if not target.exists():
+        target.write_text(css, encoding='utf-8')
+    href = f'/{ASSETS_DIR}/{name}'
+    add_headers(dist, href, [('Cache-Control', IMMUTABLE)])
+    return href
+
+
+def retire_bundles(dist, paths, pages):
+    """Delete hashed sheets under assets/ that a stage replaced and no page links any more
+
+    Returns the site paths removed.
+    """
+    contents = [(dist / page).read_text(encoding='utf-8') for page in pages]
+    removed = []
+    for path in sorted(set(paths)):
+        site_path = path.relative_to(dist).as_posix()
+        if (
+            path.parent != dist / ASSETS_DIR or not _HASHED.search(path.stem) or not path.exists()
+            or any(path.name in content for content in contents)
+        ):
+            continue
+        path.unlink()
+        remove_headers(dist, f'/{site_path}')
+        removed.append(site_path)
+    return removed
+
+
+def page_stylesheets(dist, page, content):
+    """CSS texts that apply to a page in cascade order: its <style> blocks and local sheets, linked or preloaded
+
+    The inlined critical set is skipped (the full sheets hold the same rules), and so
+    are <noscript> fallbacks of preloaded sheets.
+    """
+    noscript = [match.span() for match in _NOSCRIPT.finditer(content)]
+    found = []
+    for match in _STYLE_OR_LINK.finditer(content):
+        if any(start <= match.start() < end for start, end in noscript):
+            continue
+        if match.group(1) is not None:
+            if 'data-critical' not in match.group():
+                found.append(match.group(1))
+            continue
+        attrs = dom.tag_attributes(match.group())
+        rel = attrs.get('rel', '').lower().split()
+        if 'stylesheet' not in rel and not ('preload' in rel and attrs.get('as') == 'style'):
+            continue
+        source = site_file(dist, page, attrs.get('href'))
+        if source is not None and source.suffix == '.css':
+            found.append(bundle(dist, source, []))
+    return found
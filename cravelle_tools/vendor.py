@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Local mirror of the third-party CSS, JS and fonts the pages load
+
+The pages load Leaflet and AOS from unpkg, Font Awesome from cdnjs and the
+Playfair Display / Inter stylesheet from Google Fonts. vendor/ mirrors those
+URLs as files, laid out by host and path:
+
+    vendor/unpkg.com/leaflet@1.9.4/dist/leaflet.css
+    vendor/cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/webfonts/fa-solid-900.woff2
+    vendor/fonts.googleapis.com/css2@<hash of the query>
+
+A query string is hashed into the file name, so each Google Fonts URL gets its
+own file. `fetch` downloads missing URLs together with the files their CSS
+url()s point at. The build reads the mirror and never touches the network;
+with vendor/ committed it works offline.
+"""
+
+import posixpath
+import re
+import urllib.error
+import urllib.request
+from pathlib import Path
+from urllib.parse import unquote, urljoin, urlsplit
+
+from . import dom
+from .cache import content_hash
+
+VENDOR_DIR = 'vendor'
+
+# Google Fonts only serves woff2 to user agents it recognises as current browsers
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Safari/537.36'
+)
+FETCH_TIMEOUT = 30
+
+_LINK = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_SCRIPT = re.compile(r'<script\b[^>]*>', re.IGNORECASE)
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_CSS_IMPORT = re.compile(r'@import\s+([\'"])([^\'"]+)\1')
+
+
+def is_third_party(url):
+    return url.startswith(('http:', 'https:', '//'))
+
+
+def absolute(url):
+    return 'https:' + url if url.startswith('//') else url
+
+
+def origin(url):
+    parts = urlsplit(absolute(url))
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+def mirror_path(url):
+    """Path of a third-party URL inside vendor/: <host>/<path>, with the query hashed into the name"""
+    parts = urlsplit(absolute(url))
+    path = parts.netloc + unquote(parts.path)
+    if path.endswith('/'):
+        path += 'index'
+    if parts.query:
+        path += '@' + content_hash(parts.query)[:10]
+    return path
+
+
+def library(url):
+    """Short name of the package a URL belongs to: leaflet, aos, font-awesome, google-fonts"""
+    parts = urlsplit(absolute(url))
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if parts.netloc in ('fonts.googleapis.com', 'fonts.gstatic.com'):
+        return 'google-fonts'
+    if parts.netloc == 'cdnjs.cloudflare.com' and segments[:2] == ['ajax', 'libs'] and len(segments) > 2:
+        return segments[2]
+    if parts.netloc in ('unpkg.com', 'cdn.jsdelivr.net') and segments:
+        if segments[0] == 'npm':
+            segments = segments[1:]
+        # name@version, or @scope/name@version
+        package = segments[1] if segments[0].startswith('@') and len(segments) > 1 else segments[0]
+        return package.split('@')[0] or parts.netloc
+    return parts.netloc
+
+
+def page_resources(content):
+    """[(tag match, attrs, url, kind)] for the stylesheets and scripts a page loads from other origins
+
+    kind is 'css' or 'js'.
+    """
+    resources = []
+    for match in _LINK.finditer(content):
+        attrs = dom.tag_attributes(match.group())
+        rels = attrs.get('rel', '').lower().split()
+        href = attrs.get('href', '')
+        if is_third_party(href) and ('stylesheet' in rels or ('preload' in rels and attrs.get('as') == 'style')):
+            resources.append((match, attrs, href, 'css'))
+    for match in _SCRIPT.finditer(content):
+        attrs = dom.tag_attributes(match.group())
+        src = attrs.get('src', '')
+        if is_third_party(src):
+            resources.append((match, attrs, src, 'js'))
+    return sorted(resources, key=lambda resource: resource[0].start())
+
+
+def css_references(css, base_url):
+    """[(match, group, absolute url)] for the url()s and @imports of a third-party stylesheet"""
+    references = []
+    for pattern in (_CSS_URL, _CSS_IMPORT):
+        for match in pattern.finditer(css):
+            url = match.group(2).strip()
+            if not url.startswith(('data:', '#')):
+                references.append((match, 2, urljoin(absolute(base_url), url)))
+    return sorted(references, key=lambda reference: reference[0].start())
+
+
+def _download(url):
+    request = urllib.request.Request(absolute(url), headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        return response.read()
+
+
+def fetch(root, urls):
+    """Download the URLs missing from vendor/, and what their CSS points at; returns (lines, fetched, failed)"""
+    directory = Path(root) / VENDOR_DIR
+    queue = [(url, kind) for url, kind in urls]
+    seen = set()
+    lines = []
+    fetched = failed = 0
+    while queue:
+        url, kind = queue.pop(0)
+        # Fonts are requested per format; the fragment (#iefix) is not part of the file
+        url = absolute(url).split('#')[0]
+        if url in seen:
+            continue
+        seen.add(url)
+        target = directory / mirror_path(url)
+        if target.is_file():
+            data = target.read_bytes()
+        else:
+            try:
+                data = _download(url)
+            except (urllib.error.URLError, OSError) as error:
+                failed += 1
+                lines.append(f'❌ {url}: {getattr(error, "reason", error)}')
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            fetched += 1
+            lines.append(f'📦 {url} → {VENDOR_DIR}/{mirror_path(url)} ({len(data):,} bytes)')
+        if kind == 'css' or posixpath.splitext(urlsplit(url).path)[1] == '.css':
+            css = data.decode('utf-8', errors='replace')
+            queue += [(reference, 'css' if match.re is _CSS_IMPORT else None)
+                      for match, _, reference in css_references(css, url)]
+    return lines, fetched, failed
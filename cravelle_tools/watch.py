@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Long-running watch mode: reapply the rules to each page as it is saved
+
+A rerun of the fix_* chain pays interpreter startup, rule imports and regex
+compilation, then reprocesses every page. The watcher pays those costs once.
+It selects the rule sets, builds the page plan and the schedules, and runs
+one in-memory warm-up pass so the rule modules' patterns are compiled and
+cached. After that it polls services/*.html, index.html and src/css/**/*.css
+by stat. When a burst of saves has been quiet for the debounce interval, it
+runs only the rules that target each changed file, on that file alone, and
+writes the result back.
+
+Each event reports the rule time and the time from the save (the file's
+mtime) to the rewritten file on disk. The watcher's own writes and saves that
+leave the content as it last saw it trigger nothing.
+
+Rules must be idempotent, or every save would apply them on top of their
+own output and the page would grow. The warm-up pass therefore applies the
+rules a second time to what the first pass produced and records the pages
+that still change (unsettled), and each event checks the same before it
+writes: a rewrite the rules would change again is reported and not written.
+"""
+
+import time
+from pathlib import Path
+
+from . import engine
+from .pages import INDEX_PAGE, SERVICES_DIR, Page, discover_pages
+from .scheduler import MAX_PASSES, ScheduleError, apply_schedule, schedule_for
+
+WATCHED = (f'{SERVICES_DIR}/*.html', INDEX_PAGE, 'src/css/**/*.css')
+
+# Seconds between stat scans, and of quiet after the last change before rules run
+POLL_INTERVAL = 0.1
+DEBOUNCE = 0.2
+
+
+class Watcher:
+    """Warm rule state for one site root, plus the stat snapshot of the watched files"""
+
+    def __init__(self, root='.', names=None, schedule=False, fixed_point=False, max_passes=None,
+                 debounce=DEBOUNCE, interval=POLL_INTERVAL, log=print):
+        self.root = Path(root)
+        self.rule_sets = engine.select(names)
+        self.schedule = schedule or fixed_point
+        self.fixed_point = fixed_point
+        self.max_passes = max_passes or MAX_PASSES
+        self.debounce = debounce
+        self.interval = interval
+        self.log = log
+        self.plan = {}
+        # Last content seen or written per file; a save that leaves it as is is not an event
+        self.known = {}
+        self.snapshot = {}
+        # {page: bytes added} for pages the rules still change when applied to their own output
+        self.unsettled = {}
+
+    def scan(self):
+        """{site path: (size, mtime_ns)} for every watched file"""
+        snapshot = {}
+        for pattern in WATCHED:
+            for path in self.root.glob(pattern):
+                try:
+                    stat = path.stat()
+                except OSError:  # deleted between glob and stat
+                    continue
+                snapshot[path.relative_to(self.root).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def refresh_plan(self):
+        self.plan = engine.build_plan(self.rule_sets, discover_pages(self.root))
+        if self.schedule:
+            for rules in self.plan.values():
+                schedule_for(rules)
+
+    def warm_up(self):
+        """Build the plan and run every rule in memory; returns (pages, rules, seconds)
+
+        Each page's rules also run on their own output; pages that change again land in unsettled.
+        """
+        start = time.perf_counter()
+        self.refresh_plan()
+        self.snapshot = self.scan()
+        for path in self.snapshot:
+            self.known[path] = (self.root / path).read_text(encoding='utf-8')
+        applied = 0
+        self.unsettled = {}
+        for path, rules in self.plan.items():
+            if path in self.known:
+                page = Page(path, self.known[path])
+                try:
+                    self.rewrite(page, rules)
+                    growth = self.regrowth(page, rules)
+                except ScheduleError:  # a fixed-point run that does not settle
+                    growth = 0
+                if growth is not None:
+                    self.unsettled[path] = growth
+                applied += 2 * len(rules)
+        return len(self.plan), applied, time.perf_counter() - start
+
+    def rewrite(self, page, rules):
+        if self.schedule:
+            return apply_schedule(page, rules, self.fixed_point, self.max_passes)
+        engine.process_page(page, rules)
+        return 1
+
+    def regrowth(self, page, rules):
+        """Bytes the rules add when applied again to a rewritten page; None when it stays as it is"""
+        again = Page(page.path, page.content)
+        self.rewrite(again, rules)
+        return len(again.content) - len(page.content) if again.changed else None
+
+    def changed_paths(self):
+        """Paths whose stat data moved since the last scan; updates the snapshot"""
+        snapshot = self.scan()
+        changed = sorted(path for path, stat in snapshot.items() if self.snapshot.get(path) != stat)
+        removed = set(self.snapshot) - set(snapshot)
+        if (set(snapshot) - set(self.snapshot)) or removed:
+            self.refresh_plan()
+        for path in removed:
+            self.known.pop(path, None)
+        self.snapshot = snapshot
+        return changed
+
+    def apply(self, path):
+        """Rerun the rules targeting one changed file; returns a log line, or None when nothing changed"""
+        file_path = self.root / path
+        try:
+            saved = file_path.stat().st_mtime
+            content = file_path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+        if content == self.known.get(path):
+            return None
+        self.known[path] = content
+        rules = self.plan.get(path)
+        if not rules:
+            return f'ℹ️  {path}: no rules target this file'
+
+        page = Page(path, content)
+        start = time.perf_counter()
+        try:
+            passes = self.rewrite(page, rules)
+        except ScheduleError as e:
+            return f'❌ {path}: not settled - {e}'
+        rule_time = time.perf_counter() - start
+        count = len(schedule_for(rules).rules) if self.schedule else len(rules)
+        if not page.changed:
+            return f'ℹ️  {path}: {count} rules, no changes ({rule_time * 1000:.1f} ms)'
+        try:
+            growth = self.regrowth(page, rules)
+        except ScheduleError:
+            growth = 0
+        if growth is not None:
+            self.unsettled[path] = growth
+            return (
+                f'⚠️  {path}: the rules change their own output again ({growth:+,} bytes); '
+                f'not written, so repeated saves cannot pile up rewrites'
+            )
+
+        file_path.write_text(page.content, encoding='utf-8')
+        latency = time.time() - saved
+        self.known[path] = page.content
+        stat = file_path.stat()
+        self.snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        passes = f', {passes} passes' if passes > 1 else ''
+        return (
+            f'✅ {path}: {count} rules{passes} in {rule_time * 1000:.1f} ms, '
+            f'{latency * 1000:.0f} ms from save to rewritten file'
+        )
+
+    def run(self, max_events=None):
+        """Poll until interrupted (or until max_events batches were handled)"""
+        pending = set()
+        last_change = 0.0
+        events = 0
+        while max_events is None or events < max_events:
+            time.sleep(self.interval)
+            changed = self.changed_paths()
+            if changed:
+                pending.update(changed)
+                last_change = time.monotonic()
+                continue
+            if not pending or time.monotonic() - last_change < self.debounce:
+                continue
+            for path in sorted(pending, key=self._order):
+                line = self.apply(path)
+                if line:
+                    self.log(line)
+            pending.clear()
+            events += 1
+
+    def _order(self, path):
+        """Plan order, so a batch runs in the same order as a full run; other files last"""
+        paths = list(self.plan)
+        return (paths.index(path), path) if path in self.plan else (len(paths), path)
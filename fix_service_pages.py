@@ -1,70 +1,12 @@
 #!/usr/bin/env python3
-"""Fix service pages: remove background images, add glass morphism"""
+"""Fix service pages: remove background images, add glass morphism
 
-import re
-from pathlib import Path
+The rules live in cravelle_tools/rules/fix_service_pages.py; this wrapper keeps
+`python fix_service_pages.py` working. Prefer one combined pass instead:
+python -m cravelle_tools run <rule sets...>
+"""
 
-service_files = [
-    "services/academy.html",
-    "services/diplomacy.html",
-    "services/translation.html",
-    "services/trade.html",
-    "services/prive.html",
-    "services/digital.html",
-    "services/voice.html",
-    "services/connect.html",
-    "services/edu-connect.html",
-]
+from cravelle_tools.cli import main
 
-for service_file in service_files:
-    file_path = Path(service_file)
-    
-    if not file_path.exists():
-        print(f"❌ File not found: {service_file}")
-        continue
-    
-    try:
-        content = file_path.read_text(encoding='utf-8')
-        original_content = content
-        
-        # Remove background-image from .hero style
-        content = re.sub(
-            r'(\.hero\s*\{[^}]*?)background-image:[^;]+;([^}]*?\})',
-            r'\1\2',
-            content,
-            flags=re.DOTALL
-        )
-        
-        # Remove background-size from .hero style
-        content = re.sub(
-            r'(\.hero\s*\{[^}]*?)background-size:[^;]+;([^}]*?\})',
-            r'\1\2',
-            content,
-            flags=re.DOTALL
-        )
-        
-        # Remove background-position from .hero style
-        content = re.sub(
-            r'(\.hero\s*\{[^}]*?)background-position:[^;]+;([^}]*?\})',
-            r'\1\2',
-            content,
-            flags=re.DOTALL
-        )
-        
-        # Add glass morphism to features section
-        content = re.sub(
-            r'(\.features\s*\{[^}]*?padding:\s*100px\s+5%;)',
-            r'\1\n      backdrop-filter: blur(20px);\n      -webkit-backdrop-filter: blur(20px);',
-            content
-        )
-        
-        if content != original_content:
-            file_path.write_text(content, encoding='utf-8')
-            print(f"✅ Fixed: {service_file}")
-        else:
-            print(f"ℹ️  No changes needed: {service_file}")
-            
-    except Exception as e:
-        print(f"❌ Error processing {service_file}: {e}")
-
-print("\n✅ All service pages processed!")
+if __name__ == '__main__':
+    main(['run', 'fix_service_pages'])
@@ -1,6 +1,8 @@
 const I18N_KEY = 'selectedLanguage';
 const SUPPORTED_LANGS = new Set(['en', 'ar', 'pl', 'tr']);
 const DEFAULT_LANG = 'en';
+const BUNDLES_ID = 'i18n-bundles';
+const MANIFEST_ID = 'i18n-manifest';
 
 class I18nManager {
   constructor() {
@@ -9,9 +11,39 @@ class I18nManager {
     this.currentLang = this.getStoredLanguage();
     this.defaultTitle = document.title;
     this.defaultSlogan = this.getDefaultSlogan();
+    this.pageBundles = this.readJsonElement(BUNDLES_ID);
+    this.manifest = this.readJsonElement(MANIFEST_ID);
+    this.alternates = this.getAlternates();
     this.isLoading = false;
   }
 
+  // Pre-rendered builds link every language variant of the page; the URL then decides the language
+  getAlternates() {
+    const alternates = {};
+    document.querySelectorAll('link[rel="alternate"][hreflang]').forEach(link => {
+      const lang = link.getAttribute('hreflang');
+      if (SUPPORTED_LANGS.has(lang)) {
+        alternates[lang] = link.getAttribute('href');
+      }
+    });
+    return alternates;
+  }
+
+  isPrerendered() {
+    return Object.keys(this.alternates).length > 0;
+  }
+
+  getPageLanguage() {
+    const lang = document.documentElement.getAttribute('lang');
+    return SUPPORTED_LANGS.has(lang) ? lang : DEFAULT_LANG;
+  }
+
+  goToLanguage(lang) {
+    const url = new URL(this.alternates[lang], location.href);
+    url.hash = location.hash;
+    location.assign(url.pathname + url.search + url.hash);
+  }
+
   getStoredLanguage() {
     const stored = localStorage.getItem(I18N_KEY);
     return SUPPORTED_LANGS.has(stored) ? stored : DEFAULT_LANG;
@@ -22,6 +54,38 @@ class I18nManager {
     return mottoEl ? mottoEl.textContent : '';
   }
 
+  // Maps written into built pages: per-page subsets (i18n-bundles) and whole files (i18n-manifest)
+  readJsonElement(id) {
+    const el = document.getElementById(id);
+    if (!el) return {};
+    try {
+      return JSON.parse(el.textContent);
+    } catch (err) {
+      console.warn('Invalid JSON in #' + id, err);
+      return {};
+    }
+  }
+
+  async loadPageBundle(lang) {
+    const path = this.pageBundles[lang];
+    if (!path) return false;
+
+    try {
+      const response = await fetch(path, {
+        headers: { 'Accept': 'application/json' },
+        signal: AbortSignal.timeout(5000)
+      });
+      if (!response.ok) return false;
+      this.translations = await response.json();
+      console.info('Translations loaded from', path);
+      this.updatePage();
+      return true;
+    } catch (err) {
+      console.warn('Failed to load from', path, err);
+      return false;
+    }
+  }
+
   async loadTranslations(lang) {
     if (lang === DEFAULT_LANG) {
       this.translations = {};
@@ -29,19 +93,19 @@ class I18nManager {
       return;
     }
 
-    const timestamp = Date.now();
-    const possiblePaths = this.getTranslationPaths(lang, timestamp);
+    if (await this.loadPageBundle(lang)) {
+      return;
+    }
+
+    const manifestPath = this.manifest[lang];
+    const possiblePaths = this.getTranslationPaths(lang);
     
     for (const path of possiblePaths) {
       try {
         const response = await fetch(path, {
-          cache: 'no-store',
-          headers: {
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-            'Expires': '0',
-            'Accept': 'application/json'
-          },
+          // Hashed build files never change; unhashed ones are revalidated (a 304 costs no body)
+          cache: path === manifestPath ? 'default' : 'no-cache',
+          headers: { 'Accept': 'application/json' },
           signal: AbortSignal.timeout(5000)
         });
 
@@ -66,17 +130,22 @@ class I18nManager {
     this.updatePage();
   }
 
-  getTranslationPaths(lang, timestamp) {
+  getTranslationPaths(lang) {
+    // Built pages carry a manifest of content-hashed files: one known URL, no fallback chain
+    if (this.manifest[lang]) {
+      return [this.manifest[lang]];
+    }
+
     const paths = [
-      `lang/${lang}.json?v=${timestamp}`,
-      `/lang/${lang}.json?v=${timestamp}`
+      `lang/${lang}.json`,
+      `/lang/${lang}.json`
     ];
 
     if (window.location.pathname.includes('/services/')) {
-      paths.unshift(`../lang/${lang}.json?v=${timestamp}`);
+      paths.unshift(`../lang/${lang}.json`);
     }
 
-    paths.push(new URL(`lang/${lang}.json`, location.href).href + `?v=${timestamp}`);
+    paths.push(new URL(`lang/${lang}.json`, location.href).href);
 
     return paths;
   }
@@ -163,6 +232,12 @@ class I18nManager {
       return;
     }
 
+    if (this.isPrerendered() && this.alternates[lang]) {
+      localStorage.setItem(I18N_KEY, lang);
+      this.goToLanguage(lang);
+      return;
+    }
+
     this.isLoading = true;
     this.currentLang = lang;
     localStorage.setItem(I18N_KEY, lang);
@@ -231,6 +306,19 @@ class I18nManager {
   }
 
   async init() {
+    if (this.isPrerendered()) {
+      const pageLang = this.getPageLanguage();
+      // A visitor who chose another language lands on its variant; otherwise the page is already rendered
+      if (pageLang === DEFAULT_LANG && this.currentLang !== DEFAULT_LANG && this.alternates[this.currentLang]) {
+        this.goToLanguage(this.currentLang);
+        return;
+      }
+      this.currentLang = pageLang;
+      localStorage.setItem(I18N_KEY, pageLang);
+      this.updateLanguageToggle(pageLang);
+      return;
+    }
+
     await this.loadTranslations(this.currentLang);
     this.updateLanguageToggle(this.currentLang);
   }
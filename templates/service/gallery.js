@@ -0,0 +1,22 @@
+
+    function openLightbox(element) {
+      const img = element.querySelector('img');
+      const lightboxImg = document.getElementById('lightbox-img');
+      const lightbox = document.getElementById('lightbox');
+
+      lightboxImg.src = img.getAttribute('data-lightbox-src') || img.src;
+      lightbox.classList.add('active');
+      document.body.style.overflow = 'hidden';
+    }
+
+    function closeLightbox() {
+      const lightbox = document.getElementById('lightbox');
+      lightbox.classList.remove('active');
+      document.body.style.overflow = '';
+    }
+
+    document.addEventListener('keydown', function(e) {
+      if (e.key === 'Escape') {
+        closeLightbox();
+      }
+    });
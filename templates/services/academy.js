@@ -0,0 +1,6 @@
+
+    document.getElementById('lightbox').addEventListener('click', function(e) {
+      if (e.target === this || e.target.classList.contains('lightbox-close')) {
+        closeLightbox();
+      }
+    });
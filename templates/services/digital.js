@@ -0,0 +1,59 @@
+
+    // Server Status Checker
+    async function checkServerStatus() {
+      const statusElement = document.getElementById('serverStatus');
+      const statusIndicator = statusElement.querySelector('.status-indicator');
+      const statusText = statusElement.querySelector('span');
+      const iframe = document.getElementById('portfolioIframe');
+      
+      try {
+        // First, try to load the iframe
+        const controller = new AbortController();
+        const timeoutId = setTimeout(() => controller.abort(), 5000);
+        
+        const response = await fetch('https://omar-mohamed-website.github.io/CV/', {
+          method: 'HEAD',
+          signal: controller.signal,
+          mode: 'no-cors'
+        });
+        
+        clearTimeout(timeoutId);
+        
+        // If we get here, assume it's live
+        statusIndicator.className = 'status-indicator status-live';
+        statusText.textContent = 'Live';
+        statusText.style.color = '#10b981';
+        
+      } catch (error) {
+        if (error.name === 'AbortError') {
+          // Timeout - server is slow or pending
+          statusIndicator.className = 'status-indicator status-pending';
+          statusText.textContent = 'Pending';
+          statusText.style.color = '#f59e0b';
+        } else {
+          // Network error - server is down
+          statusIndicator.className = 'status-indicator status-down';
+          statusText.textContent = 'Down';
+          statusText.style.color = '#ef4444';
+        }
+      }
+      
+      // Also listen to iframe load event
+      iframe.addEventListener('load', () => {
+        statusIndicator.className = 'status-indicator status-live';
+        statusText.textContent = 'Live';
+        statusText.style.color = '#10b981';
+      });
+      
+      iframe.addEventListener('error', () => {
+        statusIndicator.className = 'status-indicator status-down';
+        statusText.textContent = 'Down';
+        statusText.style.color = '#ef4444';
+      });
+    }
+
+    // Check status on page load
+    checkServerStatus();
+    
+    // Recheck every 30 seconds
+    setInterval(checkServerStatus, 30000);
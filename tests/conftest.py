@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The tests import cravelle_tools from the repository root, however pytest is started
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
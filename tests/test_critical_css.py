@@ -0,0 +1,26 @@
+from cravelle_tools.css_index import split_declarations
+from cravelle_tools.stages.critical_css import _minify_body, prune_custom_properties
+
+
+def test_nested_functions_stay_whole():
+    body = '--nav-offset: calc(var(--nav-height) + 20px); padding-left: max(env(safe-area-inset-left), 0px)'
+    assert _minify_body(body) == '--nav-offset:calc(var(--nav-height) + 20px);padding-left:max(env(safe-area-inset-left), 0px)'
+
+
+def test_semicolons_in_strings_and_urls_do_not_split():
+    body = 'background: url(data:image/png;base64,AAAA); content: "a;b"; font-family: \'x;y\''
+    assert split_declarations(body) == [
+        'background: url(data:image/png;base64,AAAA)', ' content: "a;b"', " font-family: 'x;y'",
+    ]
+
+
+def test_deferred_properties_and_comments_dropped():
+    body = '/* hover */ color: red; transition: opacity 0.3s ease; cursor: pointer; width: min(100%, calc(50vw - 2px));'
+    assert _minify_body(body) == 'color:red;width:min(100%, calc(50vw - 2px))'
+
+
+def test_custom_properties_with_nested_functions_survive_pruning():
+    css = ':root{--nav-height:64px;--nav-offset:calc(var(--nav-height) + 20px);--unused:max(env(x), 0px)}.nav{top:var(--nav-offset)}'
+    assert prune_custom_properties(css) == (
+        ':root{--nav-height:64px;--nav-offset:calc(var(--nav-height) + 20px);}.nav{top:var(--nav-offset)}'
+    )
@@ -0,0 +1,24 @@
+import gzip
+
+from cravelle_tools.build import build
+
+
+def test_second_build_restores_the_stored_siblings(tmp_path):
+    page = '<html><body>' + '<p>Cravelle</p>' * 200 + '</body></html>'
+    (tmp_path / 'index.html').write_text(page)
+
+    first = build(tmp_path, tmp_path / 'dist', ['precompress'])[0]
+    second = build(tmp_path, tmp_path / 'dist', ['precompress'])[0]
+
+    assert '0 already compressed / 1 compressed' in first.summary
+    assert '1 already compressed / 0 compressed' in second.summary
+    assert gzip.decompress((tmp_path / 'dist' / 'index.html.gz').read_bytes()).decode() == page
+
+
+def test_stored_siblings_of_removed_files_are_pruned(tmp_path):
+    (tmp_path / 'index.html').write_text('<p>one</p>' * 300)
+    build(tmp_path, tmp_path / 'dist', ['precompress'])
+    (tmp_path / 'index.html').write_text('<p>two</p>' * 300)
+    build(tmp_path, tmp_path / 'dist', ['precompress'])
+
+    assert len(list((tmp_path / '.cravelle_cache' / 'stage-precompress').iterdir())) == 1
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from cravelle_tools import dom
+from cravelle_tools.stages.purge_css import Matcher, purge_css, runtime_names
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def matcher(html, scripts=()):
+    return Matcher([dom.parse_html(html)], runtime_names(scripts))
+
+
+def test_library_canvas_rules_survive():
+    # globe.gl appends the <canvas> to #map itself; no script of ours creates it
+    css = (ROOT / 'src/css/components/map.css').read_text(encoding='utf-8')
+    purged, _ = purge_css(css, matcher((ROOT / 'index.html').read_text(encoding='utf-8')))
+    assert purged.count('#map canvas') == css.count('#map canvas') > 0
+
+
+def test_canvas_rules_go_with_their_container():
+    purged, removed = purge_css('#map canvas{width:100%!important}.hero{color:red}', matcher('<div class="hero"></div>'))
+    assert '#map' not in purged and '.hero' in purged and removed == 1
+
+
+def test_script_created_names_are_kept():
+    html = '<nav class="nav"><div id="navLinks"></div></nav>'
+    scripts = ["document.getElementById('navLinks').classList.toggle('show');"]
+    css = '.nav .show{display:block}#navLinks.show{display:flex}.menu-open{overflow:hidden}'
+    purged, removed = purge_css(css, matcher(html, scripts))
+    assert '.nav .show' in purged and '#navLinks.show' in purged
+    assert '.menu-open' not in purged and removed == 1
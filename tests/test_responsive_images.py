@@ -0,0 +1,19 @@
+import pytest
+
+from cravelle_tools.build import build
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def test_second_build_reuses_the_variants(tmp_path):
+    (tmp_path / 'images').mkdir()
+    Image.new('RGB', (1200, 800), (180, 40, 40)).save(tmp_path / 'images' / 'photo.jpg', quality=95)
+    (tmp_path / 'index.html').write_text('<html><body><img src="/images/photo.jpg" alt=""></body></html>')
+
+    first = build(tmp_path, tmp_path / 'dist', ['responsive_images'])[0]
+    second = build(tmp_path, tmp_path / 'dist', ['responsive_images'])[0]
+
+    assert '(1 encoded, 0 reused)' in first.summary
+    assert '(0 encoded, 1 reused)' in second.summary
+    assert list((tmp_path / 'dist' / 'assets' / 'img').glob('*/photo-960.webp'))
+    assert '<picture>' in (tmp_path / 'dist' / 'index.html').read_text()
@@ -0,0 +1,47 @@
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cravelle_tools import engine
+from cravelle_tools.generate import Generator
+from cravelle_tools.includes import Partials
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def site(tmp_path):
+    """Scratch copy of the committed pages, stylesheets and templates"""
+    shutil.copy2(ROOT / 'index.html', tmp_path / 'index.html')
+    for name in ('services', 'src', 'templates'):
+        shutil.copytree(ROOT / name, tmp_path / name)
+    return tmp_path
+
+
+def test_rules_leave_the_committed_pages_unchanged(site):
+    report = engine.run(root=site)
+
+    assert report.count('changed') == 0
+    assert report.count('unsettled') == 0
+    assert report.writes == 0
+
+
+def test_pages_still_match_their_templates_after_a_run(site):
+    engine.run(root=site)
+
+    assert {status for _, status in Generator(site).generate(check=True)} == {'unchanged'}
+    assert {status for _, _, status in Partials(site).update(check=True)} == {'unchanged'}
+
+
+def test_hand_written_nav_is_replaced_by_the_shared_partial(site):
+    page = site / 'services' / 'digital.html'
+    committed = page.read_text(encoding='utf-8')
+    block = re.compile(r'<!-- @include partials/nav\.html -->.*?<!-- /@include partials/nav\.html -->', re.DOTALL)
+    page.write_text(block.sub('<nav class="navbar"><a href="/">Cravelle</a></nav>', committed), encoding='utf-8')
+
+    assert engine.run(root=site).count('changed') == 1
+    Partials(site).update()
+
+    assert page.read_text(encoding='utf-8') == committed
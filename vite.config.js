@@ -1,8 +1,15 @@
 import { defineConfig } from 'vite';
 import { createHtmlPlugin } from 'vite-plugin-html';
 import { resolve } from 'path';
+import { existsSync, readFileSync } from 'fs';
 import { viteStaticCopy } from 'vite-plugin-static-copy';
 
+// Written by `python -m cravelle_tools assets --write-excludes`: images no page references
+const unusedAssets = existsSync('unused-assets.json')
+  ? JSON.parse(readFileSync('unused-assets.json', 'utf-8'))
+  : [];
+const unusedImages = unusedAssets.filter((path) => path.startsWith('images/')).map((path) => `!${path}`);
+
 export default defineConfig({
   root: '.',
   base: '/',
@@ -59,7 +66,7 @@ export default defineConfig({
     viteStaticCopy({
       targets: [
         {
-          src: 'images/**/*',
+          src: ['images/**/*', ...unusedImages],
           dest: 'images'
         },
         {